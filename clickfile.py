@@ -7,6 +7,7 @@ import os
 import pathlib
 import re
 import shutil
+import socket
 import subprocess
 import sys
 import typing as tp
@@ -27,11 +28,14 @@ import tabulate
 
 from utils import web3client
 from utils import cloud
+from utils import precompile
+from utils.faucet import Faucet
 from utils.operator import Operator
 from utils.web3client import NeonChainWeb3Client
 from utils.prices import get_sol_price
 
 from deploy.cli import faucet as faucet_cli
+from loadtesting.proxy.common import corpus
 
 
 CMD_ERROR_LOG = "click_cmd_err.log"
@@ -122,9 +126,10 @@ def check_profitability(func: tp.Callable) -> tp.Callable:
     def wrapper(*args, **kwargs) -> None:
         def get_tokens_balances(operator: Operator) -> tp.Dict:
             """Return tokens balances"""
+            balances = operator.get_balances()
             return dict(
-                neon=operator.get_neon_balance(),
-                sol=operator.get_solana_balance() / 1_000_000_000,
+                neon=balances.neon,
+                sol=balances.sol / 1_000_000_000,
             )
 
         def float_2_str(d):
@@ -176,12 +181,13 @@ def run_openzeppelin_tests(network, jobs=8, amount=20000, users=8):
             "git submodule init && git submodule update", shell=True, cwd=cwd
         )
     (cwd.parent / "results").mkdir(parents=True, exist_ok=True)
-    keys_env = [
-        faucet_cli.prepare_wallets_with_balance(
-            network_manager.networks[network], count=users, airdrop_amount=amount
+    with Pool(jobs) as pool:
+        keys_env = pool.map(
+            lambda _: faucet_cli.prepare_wallets_with_balance(
+                network_manager.networks[network], count=users, airdrop_amount=amount
+            ),
+            range(jobs),
         )
-        for i in range(jobs)
-    ]
 
     tests = (
         subprocess.check_output("find \"test\" -name '*.test.js'", shell=True, cwd=cwd)
@@ -229,10 +235,11 @@ def run_openzeppelin_tests(network, jobs=8, amount=20000, users=8):
     settings = network_manager.networks[network]
     web3_client = web3client.NeonChainWeb3Client(
         settings["proxy_url"])
+    versions = web3_client.get_evm_info()
     opts = {
-        "Proxy.Version": web3_client.get_proxy_version()["result"],
-        "EVM.Version": web3_client.get_evm_version()["result"],
-        "CLI.Version": web3_client.get_cli_version()["result"],
+        "Proxy.Version": versions["proxy"]["result"],
+        "EVM.Version": versions["evm"]["result"],
+        "CLI.Version": versions["cli"]["result"],
     }
     create_allure_environment_opts(opts)
     # Add epic name for allure result files
@@ -484,6 +491,9 @@ def update_contracts(branch):
     type=click.Choice(["faucet", "neonpass", "all"]),
     help="Which UI test run",
 )
+@click.option(
+    "--precompile", is_flag=True, default=False, help="Compile used contracts in parallel before tests"
+)
 @click.argument(
     "name",
     required=True,
@@ -492,7 +502,7 @@ def update_contracts(branch):
     ),
 )
 @catch_traceback
-def run(name, jobs, numprocesses, ui_item, amount, users, network):
+def run(name, jobs, numprocesses, ui_item, amount, users, network, precompile):
     if not network and name == "ui":
         network = "devnet"
     if DST_ALLURE_CATEGORIES.parent.exists():
@@ -534,6 +544,8 @@ def run(name, jobs, numprocesses, ui_item, amount, users, network):
         raise click.ClickException("Unknown test name")
 
     command += f" -s --network={network} --make-report"
+    if precompile:
+        command += " --precompile"
     cmd = subprocess.run(command, shell=True)
     if name != "ui":
         shutil.copyfile(SRC_ALLURE_CATEGORIES, DST_ALLURE_CATEGORIES)
@@ -542,6 +554,19 @@ def run(name, jobs, numprocesses, ui_item, amount, users, network):
         sys.exit(cmd.returncode)
 
 
+@cli.command(name="precompile", help="Compile contracts used by tests in parallel to fill the solc cache")
+@click.option("-w", "--workers", type=int, default=None, help="Number of compilation processes")
+@click.argument("paths", nargs=-1, type=click.Path(exists=True))
+def precompile_contracts(workers, paths):
+    usages, versions = precompile.find_contracts(paths or precompile.DEFAULT_PATHS)
+    versions |= {usage.version for usage in usages}
+    click.echo(f"Found {len(usages)} contracts, solc versions: {', '.join(sorted(versions))}")
+    errors = precompile.precompile(usages, versions, processes=workers)
+    for (contract, version), error in errors.items():
+        click.echo(yellow(f"{contract} ({version}): {error}"))
+    click.echo(green(f"Compiled {len(usages) - len(errors)} contracts, {len(errors)} failed"))
+
+
 @cli.command(help="Summarize openzeppelin tests results")
 def ozreport():
     test_report, skipped_files = parse_openzeppelin_results()
@@ -659,7 +684,7 @@ def locust(ctx):
 @click.option(
     "-f",
     "--locustfile",
-    type=click.Choice(["proxy", "synthetic", "tracerapi"]),
+    type=click.Choice(["proxy", "synthetic", "tracerapi", "tracerapi/debug_trace"]),
     default="proxy",
     help="Load test type. It's sub-folder name to import.",
     show_default=True,
@@ -670,8 +695,48 @@ def locust(ctx):
     help="NEON RPC entry point.",
     show_default=True,
 )
+@click.option(
+    "--workers",
+    default=0,
+    type=int,
+    help="Run a master and this number of local worker processes, users and accounts are split between them",
+    show_default=True,
+)
+@click.option(
+    "--worker-host",
+    type=str,
+    multiple=True,
+    help="Also start a worker on this host by ssh, the repository must be at --remote-dir there. "
+    "Environment variables aren't passed to remote workers",
+)
+@click.option(
+    "--master-host",
+    type=str,
+    default=socket.getfqdn(),
+    help="Address of the master which remote workers connect to",
+    show_default=True,
+)
+@click.option(
+    "--remote-dir",
+    type=str,
+    default="neon-tests",
+    help="Repository path on worker hosts",
+    show_default=True,
+)
 def run(
-    credentials, host, users, spawn_rate, run_time, tag, web_ui, locustfile, neon_rpc
+    credentials,
+    host,
+    users,
+    spawn_rate,
+    run_time,
+    tag,
+    web_ui,
+    locustfile,
+    neon_rpc,
+    workers,
+    worker_host,
+    master_host,
+    remote_dir,
 ):
     """Run `Neon` pipeline performance test
 
@@ -681,28 +746,86 @@ def run(
     path = base_path / f"loadtesting/{locustfile}/locustfile.py"
     if not (path.exists() and path.is_file()):
         raise FileNotFoundError(f"path doe's not exists. {path.resolve()}")
-    command = f"locust -f {path.as_posix()} --host={host} --users={users} --spawn-rate={spawn_rate}"
+    # options which the master and workers share
+    options = f" --host={host} --users={users}"
     if credentials:
-        command += f" --credentials={credentials}"
-    elif locustfile == "tracerapi":
-        command += (
-            f" --credentials={base_path.absolute()}/loadtesting/tracerapi/envs.json"
-        )
+        options += f" --credentials={credentials}"
+    elif locustfile.startswith("tracerapi"):
+        options += f" --credentials={base_path.absolute()}/loadtesting/tracerapi/envs.json"
+    if neon_rpc and locustfile.startswith("tracerapi"):
+        options += f" --neon-rpc={neon_rpc}"
+    if tag:
+        options += f" --tags {' '.join(tag)}"
+    expect_workers = workers + len(worker_host)
+    if expect_workers:
+        options += f" --expect-workers={expect_workers}"
+
+    command = f"locust -f {path.as_posix()}{options} --spawn-rate={spawn_rate}"
     if run_time:
         command += f" --run-time={run_time}"
-    if neon_rpc and locustfile == "tracerapi":
-        command += f" --neon-rpc={neon_rpc}"
-    if tag:
-        command += f" --tags {' '.join(tag)}"
     if not web_ui:
         command += f" --headless"
+    if expect_workers:
+        command += " --master"
 
-    cmd = subprocess.run(command, shell=True)
+    worker_processes = []
+    for _ in range(workers):
+        worker_processes.append(
+            subprocess.Popen(f"locust -f {path.as_posix()}{options} --worker", shell=True)
+        )
+    for remote_host in worker_host:
+        remote_options = options.replace(f"{base_path.absolute()}/", "")
+        remote_command = (
+            f"cd {remote_dir} && locust -f loadtesting/{locustfile}/locustfile.py{remote_options} "
+            f"--worker --master-host={master_host}"
+        )
+        worker_processes.append(subprocess.Popen(["ssh", remote_host, remote_command]))
+
+    try:
+        cmd = subprocess.run(command, shell=True)
+    finally:
+        for process in worker_processes:
+            process.terminate()
+        for process in worker_processes:
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
 
     if cmd.returncode != 0:
         sys.exit(cmd.returncode)
 
 
+@locust.command("prepare-corpus", help="Sign transactions for the replay load test (loadtesting/proxy/tests/replay.py)")
+@locust_host
+@click.option("-o", "--output", default="transactions.corpus", type=str, help="Corpus file", show_default=True)
+@click.option("-s", "--senders", default=100, type=int, help="Number of sender accounts", show_default=True)
+@click.option(
+    "-n", "--transactions", default=10000, type=int, help="Number of transactions per sender", show_default=True
+)
+@click.option(
+    "-k",
+    "--kind",
+    type=click.Choice(["neon", "counter", "erc20"]),
+    multiple=True,
+    help="Kinds of transactions, every sender sends them in turn [default: all]",
+)
+@click.option("-w", "--workers", type=int, help="Number of signing processes [default: number of CPUs]")
+def prepare_corpus(host, output, senders, transactions, kind, workers):
+    network = network_manager.networks[host]
+    web3_client = NeonChainWeb3Client(network["proxy_url"])
+    corpus.prepare_corpus(
+        web3_client,
+        Faucet(network["faucet_url"], web3_client),
+        output,
+        senders,
+        transactions,
+        kinds=list(kind) or corpus.TX_KINDS,
+        processes=workers,
+    )
+    print(f"{senders * transactions} transactions are saved to {output}")
+
+
 @locust.command(
     "prepare", help="Run preparation stage for `tracer api` performance test"
 )
@@ -853,8 +976,8 @@ def get_operator_balances(network: str):
         net["spl_neon_mint"],
         net["operator_keys"],
     )
-    neon_balance = operator.get_neon_balance()
-    sol_balance = operator.get_solana_balance()
+    balances = operator.get_balances()
+    neon_balance, sol_balance = balances.neon, balances.sol
     print(
         f'Operator balances ({len(net["operator_keys"])}):\n'
         f"NEON: {neon_balance}\n"
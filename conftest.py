@@ -12,7 +12,7 @@ from _pytest.runner import runtestprotocol
 from clickfile import create_allure_environment_opts
 from utils.web3client import NeonChainWeb3Client, SolChainWeb3Client
 
-pytest_plugins = ["ui.plugins.browser"]
+pytest_plugins = ["ui.plugins.browser", "integration.plugins.precompile"]
 
 
 @dataclass
@@ -108,11 +108,12 @@ def pytest_configure(config: Config):
 def allure_environment(pytestconfig: Config, web3_client: NeonChainWeb3Client):
     opts = {}
     if pytestconfig.getoption("--network") != "geth":
+        versions = web3_client.get_evm_info()
         opts = {
             "Network": pytestconfig.environment.proxy_url,
-            "Proxy.Version": web3_client.get_proxy_version()["result"],
-            "EVM.Version": web3_client.get_evm_version()["result"],
-            "CLI.Version": web3_client.get_cli_version()["result"],
+            "Proxy.Version": versions["proxy"]["result"],
+            "EVM.Version": versions["evm"]["result"],
+            "CLI.Version": versions["cli"]["result"],
         }
 
     yield opts
@@ -146,6 +147,7 @@ def web3_client(pytestconfig: Config) -> NeonChainWeb3Client:
     client = NeonChainWeb3Client(
         pytestconfig.environment.proxy_url,
         tracer_url=pytestconfig.environment.tracer_url,
+        ws_url=pytestconfig.environment.ws_subscriber_url or None,
     )
     return client
 
@@ -1,19 +1,18 @@
 from utils import web3client
 from utils import faucet
+from utils.provisioning import AccountProvisioner
 
 
 def prepare_wallets_with_balance(settings, count=8, airdrop_amount=20000):
     print(f"Preparing {count} wallets with balances")
     web3_client = web3client.NeonChainWeb3Client(settings["proxy_url"])
     faucet_client = faucet.Faucet(settings["faucet_url"], web3_client)
-    private_keys = []
+    provisioner = AccountProvisioner(web3_client, faucet=faucet_client)
 
-    for i in range(count):
-        acc = web3_client.eth.account.create()
-        faucet_client.request_neon(acc.address, airdrop_amount)
-        if i == 0:
-            for _ in range(2):
-                faucet_client.request_neon(acc.address, airdrop_amount)
-        private_keys.append(acc.key.hex())
+    accounts = [web3_client.eth.account.create() for _ in range(count)]
+    # the first account gets three airdrops
+    addresses = [acc.address for acc in accounts] + [accounts[0].address] * 2 if accounts else []
+    provisioner.fund(addresses, airdrop_amount)
+    private_keys = [acc.key.hex() for acc in accounts]
     print("All private keys: ", ",".join(private_keys))
-    return private_keys
\ No newline at end of file
+    return private_keys
@@ -0,0 +1,57 @@
+import pathlib
+import typing as tp
+
+import pytest
+from _pytest.config import Config
+from _pytest.main import Session
+
+from utils import precompile
+
+
+def pytest_addoption(parser: tp.Any) -> None:
+    group = parser.getgroup("precompile", "Contracts precompilation")
+    group.addoption(
+        "--precompile",
+        action="store_true",
+        default=False,
+        help="Compile all contracts used by selected tests in parallel before the session starts",
+    )
+    group.addoption(
+        "--precompile-workers",
+        action="store",
+        type=int,
+        default=None,
+        help="Number of compilation processes (CPU count by default)",
+    )
+
+
+def _test_files(config: Config) -> tp.Set[pathlib.Path]:
+    """Selected test paths and all conftest.py files above them"""
+    rootdir = pathlib.Path(config.rootpath).absolute()
+    files = set()
+    for arg in config.args:
+        path = pathlib.Path(arg.split("::")[0]).absolute()
+        files.add(path)
+        for parent in path.parents:
+            if (parent / "conftest.py").exists():
+                files.add(parent / "conftest.py")
+            if parent == rootdir:
+                break
+    return files
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_sessionstart(session: Session) -> None:
+    config = session.config
+    # with pytest-xdist only the controller compiles, workers read the cache
+    if not config.getoption("--precompile") or hasattr(config, "workerinput"):
+        return
+    usages, versions = precompile.find_contracts(_test_files(config) | {pathlib.Path("utils")})
+    try:
+        errors = precompile.precompile(usages, versions, processes=config.getoption("--precompile-workers"))
+    except Exception as e:
+        # it's only a warm up, tests compile missed contracts by themselves
+        errors = {("*", "*"): str(e)}
+    reporter = config.pluginmanager.get_plugin("terminalreporter")
+    if reporter is not None:
+        reporter.write_line(f"Precompiled {len(usages)} contracts, {len(errors)} failed")
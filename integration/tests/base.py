@@ -37,7 +37,7 @@ class BaseTests:
             nonce = self.web3_client.eth.get_transaction_count(sender)
         transaction = {
             "from": sender,
-            "chainId": self.web3_client.eth.chain_id,
+            "chainId": self.web3_client.chain_id,
             "gasPrice": gas_price,
             "nonce": nonce,
         }
@@ -7,26 +7,38 @@ INIT_SYMBOL = "ST"
 INIT_DECIMALS = 18
 INIT_SUPPLY = 1000
 
+VYPER_VERSIONS = vyperx.get_three_last_versions()
+VYPER_CONTRACTS = ["Erc20", "Forwarder", "Simple"]
+
+
+@pytest.fixture(scope="module")
+def compile_vyper_contracts():
+    """Compile contracts for all versions at once, every version compiles in its own process"""
+    for version in VYPER_VERSIONS:
+        vyperx.install(version)
+    vyperx.compile_files([(contract, version) for version in VYPER_VERSIONS for contract in VYPER_CONTRACTS])
+
 
 class TestVyperCompatibility(Erc20CommonChecks):
 
-    @pytest.fixture(scope="class", autouse=True, params=vyperx.get_three_last_versions())
-    def install_vyper(self, request):
-        vyperx.install(request.param)
+    @pytest.fixture(scope="class", autouse=True, params=VYPER_VERSIONS)
+    def vyper_version(self, request, compile_vyper_contracts):
         print(f"{request.param} vyper version installed")
+        return request.param
 
     @pytest.fixture
-    def erc20_vyper(self, web3_client, class_account):
+    def erc20_vyper(self, web3_client, class_account, vyper_version):
         return web3_client.compile_by_vyper_and_deploy(class_account, "Erc20",
-                                                       [INIT_NAME, INIT_SYMBOL, INIT_DECIMALS, INIT_SUPPLY])
+                                                       [INIT_NAME, INIT_SYMBOL, INIT_DECIMALS, INIT_SUPPLY],
+                                                       version=vyper_version)
 
     @pytest.fixture
-    def forwarder(self, web3_client, class_account):
-        return web3_client.compile_by_vyper_and_deploy(class_account, "Forwarder")
+    def forwarder(self, web3_client, class_account, vyper_version):
+        return web3_client.compile_by_vyper_and_deploy(class_account, "Forwarder", version=vyper_version)
 
     @pytest.fixture
-    def simple(self, web3_client, class_account):
-        return web3_client.compile_by_vyper_and_deploy(class_account, "Simple")
+    def simple(self, web3_client, class_account, vyper_version):
+        return web3_client.compile_by_vyper_and_deploy(class_account, "Simple", version=vyper_version)
 
     def test_name(self, erc20_vyper):
         assert erc20_vyper.functions.name().call() == INIT_NAME
@@ -43,4 +55,3 @@ class TestVyperCompatibility(Erc20CommonChecks):
         instr = forwarder.functions.deploy(simple.address, class_account.address).build_transaction(tx)
         resp = self.web3_client.send_transaction(class_account, instr)
         assert resp["status"] == 1
-
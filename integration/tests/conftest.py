@@ -12,12 +12,14 @@ from solana.publickey import PublicKey
 from solana.rpc import commitment
 from solana.rpc.types import TxOpts
 
+from utils import account_pool
 from utils.apiclient import JsonRPCSession
-from utils.consts import LAMPORT_PER_SOL
+from utils.consts import InputTestConstants, LAMPORT_PER_SOL
 from utils.erc20 import ERC20
 from utils.erc20wrapper import ERC20Wrapper
 from utils.faucet import Faucet
 from utils.operator import Operator
+from utils.provisioning import AccountProvisioner
 from utils.solana_client import SolanaClient
 from utils.web3client import NeonChainWeb3Client
 
@@ -86,20 +88,21 @@ def operator(pytestconfig: Config, web3_client: NeonChainWeb3Client) -> Operator
 @pytest.fixture(scope="class")
 def prepare_account(operator, faucet, web3_client: NeonChainWeb3Client):
     """Create new account for tests and save operator pre and post balances"""
+    # not leased from the accounts pool, its background top-ups go through the operator
     with allure.step("Create account for tests"):
         acc = web3_client.eth.account.create()
     with allure.step(f"Request {NEON_AIRDROP_AMOUNT} NEON from faucet for {acc.address}"):
         faucet.request_neon(acc.address, NEON_AIRDROP_AMOUNT)
         assert web3_client.get_balance(acc) == NEON_AIRDROP_AMOUNT
-    start_neon_balance = operator.get_neon_balance()
-    start_sol_balance = operator.get_solana_balance()
+    start_balances = operator.get_balances()
+    start_neon_balance, start_sol_balance = start_balances.neon, start_balances.sol
     with allure.step(
         f"Operator initial balance: {start_neon_balance / LAMPORT_PER_SOL} NEON {start_sol_balance / LAMPORT_PER_SOL} SOL"
     ):
         pass
     yield acc
-    end_neon_balance = operator.get_neon_balance()
-    end_sol_balance = operator.get_solana_balance()
+    end_balances = operator.get_balances()
+    end_neon_balance, end_sol_balance = end_balances.neon, end_balances.sol
     with allure.step(
         f"Operator end balance: {end_neon_balance / LAMPORT_PER_SOL} NEON {end_sol_balance / LAMPORT_PER_SOL} SOL"
     ):
@@ -199,14 +202,42 @@ def erc20_spl_mintable(web3_client: NeonChainWeb3Client, faucet, sol_client, sol
     yield erc20
 
 
+@pytest.fixture(scope="session")
+def accounts_pool(pytestconfig: Config, web3_client, faucet, eth_bank_account):
+    """Funded accounts kept between runs, enabled by ACCOUNT_POOL_PASSWORD
+
+    Balances of pooled accounts aren't exact, so it isn't for tests which check absolute balances
+    """
+    if not account_pool.is_enabled():
+        yield None
+        return
+    pool = account_pool.AccountPool(
+        pytestconfig.getoption("--network"),
+        AccountProvisioner(web3_client, faucet=faucet, bank_account=eth_bank_account),
+        web3_client,
+        top_up_amount=InputTestConstants.FAUCET_1ST_REQUEST_AMOUNT.value,
+    )
+    yield pool
+    pool.close()
+
+
+def _account_with_balance(web3_client, faucet, eth_bank_account, accounts_pool):
+    if accounts_pool is None:
+        yield web3_client.create_account_with_balance(faucet, bank_account=eth_bank_account)
+        return
+    account = accounts_pool.lease()[0]
+    yield account
+    accounts_pool.release([account])
+
+
 @pytest.fixture(scope="function")
-def new_account(web3_client, faucet, eth_bank_account):
-    yield web3_client.create_account_with_balance(faucet, bank_account=eth_bank_account)
+def new_account(web3_client, faucet, eth_bank_account, accounts_pool):
+    yield from _account_with_balance(web3_client, faucet, eth_bank_account, accounts_pool)
 
 
 @pytest.fixture(scope="class")
-def class_account(web3_client, faucet, eth_bank_account):
-    yield web3_client.create_account_with_balance(faucet, bank_account=eth_bank_account)
+def class_account(web3_client, faucet, eth_bank_account, accounts_pool):
+    yield from _account_with_balance(web3_client, faucet, eth_bank_account, accounts_pool)
 
 
 @pytest.fixture(scope="function")
@@ -148,26 +148,26 @@ class TestEconomics(BaseTests):
     @pytest.mark.only_stands
     def test_account_creation(self):
         """Verify account creation spend SOL"""
-        sol_balance_before = self.operator.get_solana_balance()
-        neon_balance_before = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_before, neon_balance_before = operator_balances.sol, operator_balances.neon
         acc = self.web3_client.eth.account.create()
         assert self.web3_client.eth.get_balance(acc.address) == Decimal(0)
-        sol_balance_after = self.operator.get_solana_balance()
-        neon_balance_after = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after, neon_balance_after = operator_balances.sol, operator_balances.neon
         assert neon_balance_after == neon_balance_before
         assert sol_balance_after == sol_balance_before
 
     def test_send_neon_to_unexist_account(self):
         """Verify how many cost neon send to new user"""
-        sol_balance_before = self.operator.get_solana_balance()
-        neon_balance_before = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_before, neon_balance_before = operator_balances.sol, operator_balances.neon
         acc2 = self.web3_client.create_account()
         receipt = self.web3_client.send_neon(self.acc, acc2, 5)
 
         assert self.web3_client.get_balance(acc2) == 5
 
-        sol_balance_after = self.operator.get_solana_balance()
-        neon_balance_after = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after, neon_balance_after = operator_balances.sol, operator_balances.neon
         sol_diff = sol_balance_before - sol_balance_after
 
         assert sol_balance_before > sol_balance_after, "Operator SOL balance incorrect"
@@ -181,14 +181,14 @@ class TestEconomics(BaseTests):
 
         assert self.web3_client.get_balance(acc2) == 1
 
-        sol_balance_before = self.operator.get_solana_balance()
-        neon_balance_before = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_before, neon_balance_before = operator_balances.sol, operator_balances.neon
         receipt = self.web3_client.send_neon(self.acc, acc2, 5)
 
         assert self.web3_client.get_balance(acc2) == 6
 
-        sol_balance_after = self.operator.get_solana_balance()
-        neon_balance_after = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after, neon_balance_after = operator_balances.sol, operator_balances.neon
         sol_diff = sol_balance_before - sol_balance_after
         self.get_gas_used_percent(receipt)
 
@@ -204,23 +204,23 @@ class TestEconomics(BaseTests):
 
         self.web3_client.send_neon(self.acc, acc2, 1)
 
-        sol_balance_before = self.operator.get_solana_balance()
-        neon_balance_before = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_before, neon_balance_before = operator_balances.sol, operator_balances.neon
 
         acc3 = self.web3_client.create_account()
 
         with pytest.raises(ValueError, match=INSUFFICIENT_FUNDS_ERROR) as e:
             self.web3_client.send_neon(acc2, acc3, 1)
 
-        sol_balance_after = self.operator.get_solana_balance()
-        neon_balance_after = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after, neon_balance_after = operator_balances.sol, operator_balances.neon
 
         assert sol_balance_before == sol_balance_after
         assert neon_balance_before == neon_balance_after
 
     def test_erc20wrapper_transfer(self, erc20_spl_mintable):
-        sol_balance_before = self.operator.get_solana_balance()
-        neon_balance_before = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_before, neon_balance_before = operator_balances.sol, operator_balances.neon
 
         assert (
             erc20_spl_mintable.contract.functions.balanceOf(self.acc.address).call()
@@ -233,8 +233,8 @@ class TestEconomics(BaseTests):
             == 25
         )
 
-        sol_balance_after = self.operator.get_solana_balance()
-        neon_balance_after = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after, neon_balance_after = operator_balances.sol, operator_balances.neon
         sol_diff = sol_balance_before - sol_balance_after
 
         assert sol_balance_before > sol_balance_after
@@ -247,8 +247,8 @@ class TestEconomics(BaseTests):
         sol_user = SolanaAccount()
         self.sol_client.request_airdrop(sol_user.public_key, 5 * LAMPORT_PER_SOL)
 
-        sol_balance_before = self.operator.get_solana_balance()
-        neon_balance_before = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_before, neon_balance_before = operator_balances.sol, operator_balances.neon
 
         user_neon_balance_before = self.web3_client.get_balance(self.acc)
         move_amount = self.web3_client._web3.to_wei(5, "ether")
@@ -277,8 +277,8 @@ class TestEconomics(BaseTests):
         )
         assert int(balance.value.lamports) == int(move_amount / 1_000_000_000)
 
-        sol_balance_after = self.operator.get_solana_balance()
-        neon_balance_after = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after, neon_balance_after = operator_balances.sol, operator_balances.neon
 
         assert sol_balance_before > sol_balance_after
         assert neon_balance_after > neon_balance_before
@@ -308,8 +308,8 @@ class TestEconomics(BaseTests):
 
         dest_token_acc = get_associated_token_address(sol_user.public_key, neon_mint)
 
-        sol_balance_before = self.operator.get_solana_balance()
-        neon_balance_before = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_before, neon_balance_before = operator_balances.sol, operator_balances.neon
 
         user_neon_balance_before = self.web3_client.get_balance(self.acc)
         move_amount = self.web3_client._web3.to_wei(5, "ether")
@@ -342,8 +342,8 @@ class TestEconomics(BaseTests):
             move_amount / 1_000_000_000
         )
 
-        sol_balance_after = self.operator.get_solana_balance()
-        neon_balance_after = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after, neon_balance_after = operator_balances.sol, operator_balances.neon
 
         assert sol_balance_before > sol_balance_after
         assert neon_balance_after > neon_balance_before
@@ -356,8 +356,8 @@ class TestEconomics(BaseTests):
 
     def test_erc20_contract(self):
         """Verify ERC20 token send"""
-        sol_balance_before = self.operator.get_solana_balance()
-        neon_balance_before = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_before, neon_balance_before = operator_balances.sol, operator_balances.neon
 
         contract, contract_deploy_tx = self.web3_client.deploy_and_get_contract(
             "EIPs/ERC20/ERC20.sol",
@@ -367,8 +367,8 @@ class TestEconomics(BaseTests):
         )
         assert contract.functions.balanceOf(self.acc.address).call() == 1000
 
-        sol_balance_after = self.operator.get_solana_balance()
-        neon_balance_after = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after, neon_balance_after = operator_balances.sol, operator_balances.neon
         sol_diff = sol_balance_before - sol_balance_after
 
         assert sol_balance_before > sol_balance_after
@@ -381,15 +381,15 @@ class TestEconomics(BaseTests):
 
         contract = ERC20(self.web3_client, self.faucet, owner=self.acc)
 
-        sol_balance_before = self.operator.get_solana_balance()
-        neon_balance_before = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_before, neon_balance_before = operator_balances.sol, operator_balances.neon
 
         acc2 = self.web3_client.create_account()
 
         transfer_tx = contract.transfer( self.acc, acc2, 25)
 
-        sol_balance_after = self.operator.get_solana_balance()
-        neon_balance_after = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after, neon_balance_after = operator_balances.sol, operator_balances.neon
         sol_diff = sol_balance_before - sol_balance_after
 
         assert sol_balance_before > sol_balance_after
@@ -400,15 +400,15 @@ class TestEconomics(BaseTests):
 
     def test_deploy_small_contract_less_100tx(self, sol_price):
         """Verify we are bill minimum for 100 instruction"""
-        sol_balance_before = self.operator.get_solana_balance()
-        neon_balance_before = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_before, neon_balance_before = operator_balances.sol, operator_balances.neon
 
         contract, contract_deploy_tx = self.web3_client.deploy_and_get_contract(
             "common/Counter", "0.8.10", account=self.acc
         )
 
-        sol_balance_after_deploy = self.operator.get_solana_balance()
-        neon_balance_after_deploy = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after_deploy, neon_balance_after_deploy = operator_balances.sol, operator_balances.neon
 
         inc_tx = contract.functions.inc().build_transaction(
             {
@@ -422,8 +422,8 @@ class TestEconomics(BaseTests):
         receipt = self.web3_client.send_transaction(self.acc, inc_tx)
         assert contract.functions.get().call() == 1
 
-        sol_balance_after = self.operator.get_solana_balance()
-        neon_balance_after = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after, neon_balance_after = operator_balances.sol, operator_balances.neon
 
         assert sol_balance_before > sol_balance_after_deploy > sol_balance_after
         assert neon_balance_after > neon_balance_after_deploy > neon_balance_before
@@ -434,16 +434,16 @@ class TestEconomics(BaseTests):
         self.get_gas_used_percent(receipt)
 
     def test_deploy_small_contract_less_gas(self):
-        sol_balance_before = self.operator.get_solana_balance()
-        neon_balance_before = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_before, neon_balance_before = operator_balances.sol, operator_balances.neon
 
         with pytest.raises(ValueError, match=GAS_LIMIT_ERROR):
             self.web3_client.deploy_and_get_contract(
                 "common/Counter", "0.8.10", gas=1000, account=self.acc
             )
 
-        sol_balance_after = self.operator.get_solana_balance()
-        neon_balance_after = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after, neon_balance_after = operator_balances.sol, operator_balances.neon
 
         assert sol_balance_before == sol_balance_after
         assert neon_balance_after == neon_balance_before
@@ -452,21 +452,21 @@ class TestEconomics(BaseTests):
         acc2 = self.web3_client.create_account()
         self.web3_client.send_neon(self.acc, acc2, 0.001)
 
-        sol_balance_before = self.operator.get_solana_balance()
-        neon_balance_before = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_before, neon_balance_before = operator_balances.sol, operator_balances.neon
 
         with pytest.raises(ValueError, match=INSUFFICIENT_FUNDS_ERROR):
             self.web3_client.deploy_and_get_contract("common/Counter", "0.8.10", account=acc2)
 
-        sol_balance_after_deploy = self.operator.get_solana_balance()
-        neon_balance_after_deploy = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after_deploy, neon_balance_after_deploy = operator_balances.sol, operator_balances.neon
 
         assert sol_balance_before == sol_balance_after_deploy
         assert neon_balance_before == neon_balance_after_deploy
 
     def test_deploy_to_losted_contract_account(self):
-        sol_balance_before = self.operator.get_solana_balance()
-        neon_balance_before = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_before, neon_balance_before = operator_balances.sol, operator_balances.neon
 
         acc2 = self.web3_client.create_account()
         self.web3_client.send_neon(self.acc, acc2, 0.001)
@@ -479,8 +479,8 @@ class TestEconomics(BaseTests):
             "common/Counter", "0.8.10", account=acc2
         )
 
-        sol_balance_after = self.operator.get_solana_balance()
-        neon_balance_after = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after, neon_balance_after = operator_balances.sol, operator_balances.neon
 
         assert sol_balance_before > sol_balance_after
         assert neon_balance_after > neon_balance_before
@@ -497,31 +497,31 @@ class TestEconomics(BaseTests):
             "common/Counter", "0.8.10", account=self.acc
         )
 
-        sol_balance_after_deploy = self.operator.get_solana_balance()
-        neon_balance_after_deploy = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after_deploy, neon_balance_after_deploy = operator_balances.sol, operator_balances.neon
 
         user_balance_before = self.web3_client.get_balance(self.acc)
         assert contract.functions.get().call() == 0
 
         assert self.web3_client.get_balance(self.acc) == user_balance_before
 
-        sol_balance_after = self.operator.get_solana_balance()
-        neon_balance_after = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after, neon_balance_after = operator_balances.sol, operator_balances.neon
         assert sol_balance_after_deploy == sol_balance_after
         assert neon_balance_after_deploy == neon_balance_after
 
     @pytest.mark.xfail(reason="https://neonlabs.atlassian.net/browse/NDEV-699")
     def test_cost_resize_account(self):
         """Verify how much cost account resize"""
-        sol_balance_before = self.operator.get_solana_balance()
-        neon_balance_before = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_before, neon_balance_before = operator_balances.sol, operator_balances.neon
 
         contract, contract_deploy_tx = self.web3_client.deploy_and_get_contract(
             "common/IncreaseStorage", "0.8.10", account=self.acc
         )
 
-        sol_balance_before_increase = self.operator.get_solana_balance()
-        neon_balance_before_increase = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_before_increase, neon_balance_before_increase = operator_balances.sol, operator_balances.neon
 
         inc_tx = contract.functions.inc().build_transaction(
             {
@@ -533,8 +533,8 @@ class TestEconomics(BaseTests):
 
         instruction_receipt = self.web3_client.send_transaction(self.acc, inc_tx)
 
-        sol_balance_after = self.operator.get_solana_balance()
-        neon_balance_after = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after, neon_balance_after = operator_balances.sol, operator_balances.neon
 
         assert (
             sol_balance_before > sol_balance_before_increase > sol_balance_after
@@ -557,8 +557,8 @@ class TestEconomics(BaseTests):
         acc2 = self.web3_client.create_account()
         self.web3_client.send_neon(self.acc, acc2, 0.001)
 
-        sol_balance_before_increase = self.operator.get_solana_balance()
-        neon_balance_before_increase = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_before_increase, neon_balance_before_increase = operator_balances.sol, operator_balances.neon
 
         inc_tx = contract.functions.inc().build_transaction(
             {
@@ -571,8 +571,8 @@ class TestEconomics(BaseTests):
         with pytest.raises(ValueError, match=INSUFFICIENT_FUNDS_ERROR):
             self.web3_client.send_transaction(acc2, inc_tx)
 
-        sol_balance_after = self.operator.get_solana_balance()
-        neon_balance_after = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after, neon_balance_after = operator_balances.sol, operator_balances.neon
 
         assert (
             sol_balance_before_increase == sol_balance_after
@@ -583,8 +583,8 @@ class TestEconomics(BaseTests):
 
     def test_failed_tx_when_less_gas(self):
         """Don't get money from user if tx failed"""
-        sol_balance_before = self.operator.get_solana_balance()
-        neon_balance_before = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_before, neon_balance_before = operator_balances.sol, operator_balances.neon
 
         acc2 = self.web3_client.create_account()
 
@@ -594,8 +594,8 @@ class TestEconomics(BaseTests):
 
         assert user_balance_before == self.web3_client.get_balance(self.acc)
 
-        sol_balance_after = self.operator.get_solana_balance()
-        neon_balance_after = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after, neon_balance_after = operator_balances.sol, operator_balances.neon
 
         assert sol_balance_before == sol_balance_after
         assert neon_balance_after == neon_balance_before
@@ -603,15 +603,15 @@ class TestEconomics(BaseTests):
 
     def test_contract_interact_more_500_steps(self):
         """Deploy a contract with more 500 instructions"""
-        sol_balance_before = self.operator.get_solana_balance()
-        neon_balance_before = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_before, neon_balance_before = operator_balances.sol, operator_balances.neon
 
         contract, contract_deploy_tx = self.web3_client.deploy_and_get_contract(
             "common/Counter", "0.8.10", account=self.acc
         )
 
-        sol_balance_before_instruction = self.operator.get_solana_balance()
-        neon_balance_before_instruction = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_before_instruction, neon_balance_before_instruction = operator_balances.sol, operator_balances.neon
 
         instruction_tx = contract.functions.moreInstruction(
             0, 100
@@ -626,8 +626,8 @@ class TestEconomics(BaseTests):
             self.acc, instruction_tx
         )
 
-        sol_balance_after = self.operator.get_solana_balance()
-        neon_balance_after = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after, neon_balance_after = operator_balances.sol, operator_balances.neon
 
         assert (
             sol_balance_before > sol_balance_before_instruction > sol_balance_after
@@ -647,8 +647,8 @@ class TestEconomics(BaseTests):
             "common/Counter", "0.8.10", account=self.acc
         )
 
-        sol_balance_before_instruction = self.operator.get_solana_balance()
-        neon_balance_before_instruction = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_before_instruction, neon_balance_before_instruction = operator_balances.sol, operator_balances.neon
 
         instruction_tx = contract.functions.moreInstruction(0, 1500).build_transaction(
             {
@@ -662,8 +662,8 @@ class TestEconomics(BaseTests):
             self.acc, instruction_tx
         )
 
-        sol_balance_after = self.operator.get_solana_balance()
-        neon_balance_after = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after, neon_balance_after = operator_balances.sol, operator_balances.neon
 
         assert (
             sol_balance_before_instruction > sol_balance_after
@@ -684,8 +684,8 @@ class TestEconomics(BaseTests):
             "common/Counter", "0.8.10", account=self.acc
         )
 
-        sol_balance_before_instruction = self.operator.get_solana_balance()
-        neon_balance_before_instruction = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_before_instruction, neon_balance_before_instruction = operator_balances.sol, operator_balances.neon
 
         instruction_tx = contract.functions.moreInstruction(0, 1500).build_transaction(
             {
@@ -698,8 +698,8 @@ class TestEconomics(BaseTests):
         with pytest.raises(ValueError, match=GAS_LIMIT_ERROR):
             self.web3_client.send_transaction(self.acc, instruction_tx)
 
-        sol_balance_after = self.operator.get_solana_balance()
-        neon_balance_after = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after, neon_balance_after = operator_balances.sol, operator_balances.neon
 
         assert (
             sol_balance_after == sol_balance_before_instruction
@@ -717,8 +717,8 @@ class TestEconomics(BaseTests):
         acc2 = self.web3_client.create_account()
         self.web3_client.send_neon(self.acc, acc2, 0.001)
 
-        sol_balance_before_instruction = self.operator.get_solana_balance()
-        neon_balance_before_instruction = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_before_instruction, neon_balance_before_instruction = operator_balances.sol, operator_balances.neon
 
         instruction_tx = contract.functions.moreInstruction(0, 1500).build_transaction(
             {
@@ -730,8 +730,8 @@ class TestEconomics(BaseTests):
         with pytest.raises(ValueError, match=INSUFFICIENT_FUNDS_ERROR):
             self.web3_client.send_transaction(acc2, instruction_tx)
 
-        sol_balance_after = self.operator.get_solana_balance()
-        neon_balance_after = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after, neon_balance_after = operator_balances.sol, operator_balances.neon
 
         assert (
             sol_balance_before_instruction == sol_balance_after
@@ -743,15 +743,15 @@ class TestEconomics(BaseTests):
     # @pytest.mark.xfail(reason="Unprofitable transaction, because we create account not in evm (will be fixed)")
     def test_tx_interact_more_1kb(self):
         """Send to contract a big text (tx more than 1 kb)"""
-        sol_balance_before = self.operator.get_solana_balance()
-        neon_balance_before = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_before, neon_balance_before = operator_balances.sol, operator_balances.neon
 
         contract, contract_deploy_tx = self.web3_client.deploy_and_get_contract(
             "common/Counter", "0.8.10", account=self.acc
         )
 
-        sol_balance_before_instruction = self.operator.get_solana_balance()
-        neon_balance_before_instruction = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_before_instruction, neon_balance_before_instruction = operator_balances.sol, operator_balances.neon
 
         instruction_tx = contract.functions.bigString(BIG_STRING).build_transaction(
             {
@@ -765,8 +765,8 @@ class TestEconomics(BaseTests):
             self.acc, instruction_tx
         )
 
-        sol_balance_after = self.operator.get_solana_balance()
-        neon_balance_after = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after, neon_balance_after = operator_balances.sol, operator_balances.neon
 
         assert (
             sol_balance_before > sol_balance_before_instruction > sol_balance_after
@@ -790,8 +790,8 @@ class TestEconomics(BaseTests):
         acc2 = self.web3_client.create_account()
         self.web3_client.send_neon(self.acc, acc2, 0.001)
 
-        sol_balance_before_instruction = self.operator.get_solana_balance()
-        neon_balance_before_instruction = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_before_instruction, neon_balance_before_instruction = operator_balances.sol, operator_balances.neon
 
         instruction_tx = contract.functions.bigString(BIG_STRING).build_transaction(
             {
@@ -805,8 +805,8 @@ class TestEconomics(BaseTests):
                 acc2, instruction_tx
             )
 
-        sol_balance_after = self.operator.get_solana_balance()
-        neon_balance_after = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after, neon_balance_after = operator_balances.sol, operator_balances.neon
 
         assert (
             sol_balance_before_instruction == sol_balance_after
@@ -821,8 +821,8 @@ class TestEconomics(BaseTests):
             "common/Counter", "0.8.10", account=self.acc
         )
 
-        sol_balance_before = self.operator.get_solana_balance()
-        neon_balance_before = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_before, neon_balance_before = operator_balances.sol, operator_balances.neon
 
         instruction_tx = contract.functions.bigString(BIG_STRING).build_transaction(
             {
@@ -835,22 +835,22 @@ class TestEconomics(BaseTests):
         with pytest.raises(ValueError, match=GAS_LIMIT_ERROR):
             receipt = self.web3_client.send_transaction(self.acc, instruction_tx)
 
-        sol_balance_after = self.operator.get_solana_balance()
-        neon_balance_after = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after, neon_balance_after = operator_balances.sol, operator_balances.neon
 
         assert sol_balance_before == sol_balance_after, "SOL Balance changed"
         assert neon_balance_after == neon_balance_before, "NEON Balance incorrect"
 
     def test_deploy_contract_more_1kb(self):
-        sol_balance_before = self.operator.get_solana_balance()
-        neon_balance_before = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_before, neon_balance_before = operator_balances.sol, operator_balances.neon
 
         contract, contract_deploy_tx = self.web3_client.deploy_and_get_contract(
             "common/Fat", "0.8.10", account=self.acc
         )
 
-        sol_balance_after = self.operator.get_solana_balance()
-        neon_balance_after = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after, neon_balance_after = operator_balances.sol, operator_balances.neon
 
         assert sol_balance_before > sol_balance_after
         assert neon_balance_after > neon_balance_before
@@ -865,31 +865,31 @@ class TestEconomics(BaseTests):
         acc2 = self.web3_client.create_account()
         self.web3_client.send_neon(self.acc, acc2, 0.001)
 
-        sol_balance_before = self.operator.get_solana_balance()
-        neon_balance_before = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_before, neon_balance_before = operator_balances.sol, operator_balances.neon
 
         with pytest.raises(ValueError, match=INSUFFICIENT_FUNDS_ERROR):
             _, _ = self.web3_client.deploy_and_get_contract(
                 "common/Fat", "0.8.10", account=acc2
             )
 
-        sol_balance_after = self.operator.get_solana_balance()
-        neon_balance_after = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after, neon_balance_after = operator_balances.sol, operator_balances.neon
 
         assert sol_balance_before == sol_balance_after
         assert neon_balance_after == neon_balance_before
 
     def test_deploy_contract_more_1kb_less_gas(self):
-        sol_balance_before = self.operator.get_solana_balance()
-        neon_balance_before = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_before, neon_balance_before = operator_balances.sol, operator_balances.neon
 
         with pytest.raises(ValueError, match=GAS_LIMIT_ERROR):
             self.web3_client.deploy_and_get_contract(
                 "common/Fat", "0.8.10", account=self.acc, gas=1000
             )
 
-        sol_balance_after = self.operator.get_solana_balance()
-        neon_balance_after = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after, neon_balance_after = operator_balances.sol, operator_balances.neon
 
         assert sol_balance_before == sol_balance_after
         assert neon_balance_after == neon_balance_before
@@ -907,15 +907,15 @@ class TestEconomics(BaseTests):
             acc2, self.web3_client.to_checksum_address(contract_address.hex()), 0.5
         )
 
-        sol_balance_before = self.operator.get_solana_balance()
-        neon_balance_before = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_before, neon_balance_before = operator_balances.sol, operator_balances.neon
 
         contract, contract_deploy_tx = self.web3_client.deploy_and_get_contract(
             "common/Counter", "0.8.10", account=self.acc
         )
 
-        sol_balance_after = self.operator.get_solana_balance()
-        neon_balance_after = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after, neon_balance_after = operator_balances.sol, operator_balances.neon
 
         assert sol_balance_before > sol_balance_after, "SOL Balance not changed"
         assert neon_balance_after > neon_balance_before, "NEON Balance incorrect"
@@ -929,8 +929,8 @@ class TestEconomics(BaseTests):
         acc2 = self.web3_client.create_account()
         self.web3_client.send_neon(self.acc, acc2, 50)
 
-        sol_balance_before = self.operator.get_solana_balance()
-        neon_balance_before = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_before, neon_balance_before = operator_balances.sol, operator_balances.neon
 
         nonce = self.web3_client.eth.get_transaction_count(acc2.address)
         contract_address = self.web3_client.to_checksum_address(
@@ -945,8 +945,8 @@ class TestEconomics(BaseTests):
             "common/Counter", "0.8.10", account=acc2
         )
 
-        sol_balance_after_deploy = self.operator.get_solana_balance()
-        neon_balance_after_deploy = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after_deploy, neon_balance_after_deploy = operator_balances.sol, operator_balances.neon
 
         assert sol_balance_before > sol_balance_after_deploy
         assert neon_balance_after_deploy > neon_balance_before
@@ -960,15 +960,15 @@ class TestEconomics(BaseTests):
         acc2 = self.web3_client.create_account()
         self.faucet.request_neon(acc2.address, 10)
 
-        sol_balance_before = self.operator.get_solana_balance()
-        neon_balance_before = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_before, neon_balance_before = operator_balances.sol, operator_balances.neon
 
         contract, contract_deploy_tx = self.web3_client.deploy_and_get_contract(
             "common/Counter", "0.8.10", account=self.acc
         )
 
-        sol_balance_after_deploy = self.operator.get_solana_balance()
-        neon_balance_after_deploy = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after_deploy, neon_balance_after_deploy = operator_balances.sol, operator_balances.neon
 
         inc_tx = contract.functions.inc().build_transaction(
             {
@@ -982,8 +982,8 @@ class TestEconomics(BaseTests):
 
         assert contract.functions.get().call() == 1
 
-        sol_balance_after = self.operator.get_solana_balance()
-        neon_balance_after = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after, neon_balance_after = operator_balances.sol, operator_balances.neon
 
         assert sol_balance_before > sol_balance_after_deploy > sol_balance_after
         assert neon_balance_after > neon_balance_after_deploy > neon_balance_before
@@ -996,8 +996,8 @@ class TestEconomics(BaseTests):
     def test_deploy_contract_alt_on(self, sol_client):
         """Trigger transaction than requires more than 30 accounts"""
         accounts_quantity = random.randint(31, 45)
-        sol_balance_before = self.operator.get_solana_balance()
-        neon_balance_before = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_before, neon_balance_before = operator_balances.sol, operator_balances.neon
 
         contract, _ = self.web3_client.deploy_and_get_contract(
             "common/ALT", "0.8.10", account=self.acc, constructor_args=[8]
@@ -1044,8 +1044,8 @@ class TestEconomics(BaseTests):
             lambda: self.operator.get_solana_balance() != sol_balance_before,
             timeout_sec=120,
         )
-        sol_balance_after = self.operator.get_solana_balance()
-        neon_balance_after = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after, neon_balance_after = operator_balances.sol, operator_balances.neon
 
         assert sol_balance_before > sol_balance_after
         assert neon_balance_after > neon_balance_before
@@ -1069,15 +1069,15 @@ class TestEconomics(BaseTests):
     @pytest.mark.parametrize("accounts_quantity", [10])
     def test_deploy_contract_alt_off(self, sol_client, accounts_quantity):
         """Trigger transaction than requires less than 30 accounts"""
-        sol_balance_before = self.operator.get_solana_balance()
-        neon_balance_before = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_before, neon_balance_before = operator_balances.sol, operator_balances.neon
 
         contract, _ = self.web3_client.deploy_and_get_contract(
             "common/ALT", "0.8.10", account=self.acc, constructor_args=[8]
         )
 
-        sol_balance_after_deploy = self.operator.get_solana_balance()
-        neon_balance_after_deploy = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after_deploy, neon_balance_after_deploy = operator_balances.sol, operator_balances.neon
 
         tx = contract.functions.fill(accounts_quantity).build_transaction(
             {
@@ -1092,8 +1092,8 @@ class TestEconomics(BaseTests):
         response = wait_for_block(sol_client, block)
         self.check_alt_off(response)
 
-        sol_balance_after = self.operator.get_solana_balance()
-        neon_balance_after = self.operator.get_neon_balance()
+        operator_balances = self.operator.get_balances()
+        sol_balance_after, neon_balance_after = operator_balances.sol, operator_balances.neon
 
         assert sol_balance_before > sol_balance_after_deploy > sol_balance_after
         assert neon_balance_after > neon_balance_after_deploy > neon_balance_before
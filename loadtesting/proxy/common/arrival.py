@@ -0,0 +1,145 @@
+import csv
+import logging
+import threading
+import time
+import typing as tp
+
+import tabulate
+from locust import events
+
+LOG = logging.getLogger(__name__)
+
+RateSchedule = tp.Callable[[float], float]
+"""Target transactions per second by seconds since the test start"""
+
+
+def constant(rate: float) -> RateSchedule:
+    return lambda t: rate
+
+
+def ramp(start_rate: float, end_rate: float, duration: float) -> RateSchedule:
+    """Linear change from start_rate to end_rate, then end_rate"""
+    return lambda t: end_rate if t >= duration else start_rate + (end_rate - start_rate) * t / duration
+
+
+def step(step_duration: float, rates: tp.Sequence[float]) -> RateSchedule:
+    """Every rate lasts step_duration seconds, the last one lasts till the end"""
+    return lambda t: rates[min(int(t // step_duration), len(rates) - 1)]
+
+
+def spike(base_rate: float, peak_rate: float, start: float, duration: float) -> RateSchedule:
+    """base_rate with peak_rate from start during duration seconds"""
+    return lambda t: peak_rate if start <= t < start + duration else base_rate
+
+
+def parse_schedule(spec: str) -> RateSchedule:
+    """Parse schedule like `constant:100`, `ramp:10:500:600`, `step:60:50,100,200` or `spike:50:500:120:30`"""
+    kind, _, args = spec.partition(":")
+    try:
+        if kind == "step":
+            step_duration, rates = args.split(":")
+            return step(float(step_duration), [float(rate) for rate in rates.split(",")])
+        values = [float(value) for value in args.split(":")]
+        return {"constant": constant, "ramp": ramp, "spike": spike}[kind](*values)
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"Wrong arrival rate schedule `{spec}`, see --arrival-rate help")
+
+
+class ArrivalStats:
+    """Counters of open loop users of the process and their per second series
+
+    Submitted and dropped (no free sender account) transactions are counted per second, in-flight depth
+    (sent, but not included yet) is sampled every second. The sampler thread is a greenlet under Locust.
+    """
+
+    def __init__(self, schedule: RateSchedule, interval: float = 1) -> None:
+        self.schedule = schedule
+        self.submitted = 0
+        self.dropped = 0
+        self.in_flight = 0
+        self.rows: tp.List[tp.Dict[str, tp.Any]] = []
+        self._interval = interval
+        self._start = time.monotonic()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        submitted, dropped = 0, 0
+        while not self._stop.wait(self._interval):
+            elapsed = time.monotonic() - self._start
+            self.rows.append(
+                dict(
+                    elapsed=round(elapsed, 3),
+                    target_rate=round(self.schedule(elapsed), 3),
+                    submitted=self.submitted - submitted,
+                    dropped=self.dropped - dropped,
+                    in_flight=self.in_flight,
+                )
+            )
+            submitted, dropped = self.submitted, self.dropped
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def summary(self) -> str:
+        depths = [row["in_flight"] for row in self.rows] or [self.in_flight]
+        return tabulate.tabulate(
+            [
+                ["Submitted", self.submitted],
+                ["Dropped (no free sender)", self.dropped],
+                ["In flight, max", max(depths)],
+                ["In flight, average", sum(depths) / len(depths)],
+            ],
+            tablefmt="fancy_outline",
+            numalign="right",
+            floatfmt=".2f",
+        )
+
+    def export(self, path: str) -> None:
+        if not self.rows:
+            return
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(self.rows[0]))
+            writer.writeheader()
+            writer.writerows(self.rows)
+
+
+@events.init_command_line_parser.add_listener
+def parse_arrival_rate_arguments(parser):
+    parser.add_argument(
+        "--arrival-rate",
+        type=str,
+        env_var="NEON_ARRIVAL_RATE",
+        default="constant:10",
+        include_in_web_ui=False,
+        help="Target transactions per second of open loop users (split between them): constant:RATE, "
+        "ramp:FROM:TO:SECONDS, step:SECONDS:RATE1,RATE2,... or spike:BASE:PEAK:START:SECONDS",
+    )
+    parser.add_argument(
+        "--arrival-senders",
+        type=int,
+        default=100,
+        include_in_web_ui=False,
+        help="Funded accounts which every open loop user sends transactions from",
+    )
+    parser.add_argument(
+        "--arrival-output",
+        type=str,
+        default="",
+        include_in_web_ui=False,
+        help="Save per second target rate, submitted and in-flight transactions of open loop users to this csv file",
+    )
+
+
+@events.test_stop.add_listener
+def report_arrival_stats(environment, **kwargs):
+    arrival_stats = getattr(environment.shared, "arrival_stats", None)
+    if arrival_stats is None:
+        return
+    arrival_stats.stop()
+    LOG.info(f"\n{10 * '_'} Open loop load {10 * '_'}\n{arrival_stats.summary()}\n")
+    if environment.parsed_options.arrival_output:
+        arrival_stats.export(environment.parsed_options.arrival_output)
+    environment.shared.arrival_stats = None
@@ -1,54 +1,131 @@
+import functools
 import os
 import json
 import logging
-import time
 import random
+import threading
 import typing as tp
-from functools import lru_cache
 
+import web3
 import web3.types
 import requests
 import gevent
 from gevent.pool import Pool
 from locust import TaskSet, events
+from locust.runners import MasterRunner, WorkerRunner
 
-from utils import helpers
+from utils import account_pool, helpers
 from utils.faucet import Faucet
+from utils.provisioning import AccountProvisioner
+from utils.receipt_collector import PendingTransaction
 from utils.web3client import NeonChainWeb3Client
 
-from .events import statistics_collector, save_transaction
+from . import env, stats
+from .events import inclusion_statistics, statistics_collector, save_transaction
 
 LOG = logging.getLogger(__name__)
 
+FUNDING_AMOUNT = 1000
+"""NEONs requested for an account when its balance is low"""
+
+GAS_PRICE_TTL = 5
+"""Seconds the gas price is cached by load test clients, tasks don't request it for every transaction"""
+
 saved_transactions = []
 
 
+def _save_transactions(environment: "locust.env.Environment") -> None:
+    web3_client = NeonWeb3ClientExt(
+        environment.credentials["proxy_url"])
+
+    def get_solana_trx(tr):
+        return tr, web3_client.get_solana_trx_by_neon(tr)
+
+    trx = {}
+    print("Start save transactions list")
+    pool = Pool(10)
+    tasks = [pool.spawn(get_solana_trx, t) for t in saved_transactions]
+    gevent.joinall(tasks)
+
+    for res in tasks:
+        if res.value is None:
+            continue
+        tr, resp = res.value
+        if "result" not in resp:
+            print(f"Can't get solana trx from tx {tr}: {resp}")
+            continue
+        trx[tr] = resp["result"]
+    with (open(f"transactions-{random.randint(0, 1000)}.json", "w+")) as f:
+        json.dump(trx, f)
+    saved_transactions.clear()
+    print("Results saved")
+
+
+@events.init.add_listener
+def collect_saved_transactions(environment: "locust.env.Environment", **kwargs):
+    """In a distributed run workers send saved transactions to the master, which saves them all"""
+    if isinstance(environment.runner, MasterRunner):
+
+        def on_saved_transactions(msg, **kwargs):
+            saved_transactions.extend(msg.data)
+
+        environment.runner.register_message("saved_transactions", on_saved_transactions)
+
+
 @events.test_stop.add_listener
 def save_transactions_list(environment: "locust.env.Environment", **kwargs):
     if "SAVE_TRANSACTIONS" in os.environ:
-        web3_client = NeonWeb3ClientExt(
-            environment.credentials["proxy_url"])
-
-        def get_solana_trx(tr):
-            return tr, web3_client.get_solana_trx_by_neon(tr)
-
-        trx = {}
-        print("Start save transactions list")
-        pool = Pool(10)
-        tasks = [pool.spawn(get_solana_trx, t) for t in saved_transactions]
-        gevent.joinall(tasks)
-
-        for res in tasks:
-            if res.value is None:
-                continue
-            tr, resp = res.value
-            if "result" not in resp:
-                print(f"Can't get solana trx from tx {tr}: {resp}")
-                continue
-            trx[tr] = resp["result"]
-        with (open(f"transactions-{random.randint(0, 1000)}.json", "w+")) as f:
-            json.dump(trx, f)
-        print("Results saved")
+        if isinstance(environment.runner, WorkerRunner):
+            environment.runner.send_message("saved_transactions", list(saved_transactions))
+            saved_transactions.clear()
+        elif isinstance(environment.runner, MasterRunner) and not saved_transactions:
+            # workers stopped by quit (--run-time limit) send transactions after the master test stop
+            return
+        else:
+            _save_transactions(environment)
+
+
+@events.quitting.add_listener
+def save_workers_transactions_list(environment: "locust.env.Environment", **kwargs):
+    if "SAVE_TRANSACTIONS" in os.environ and isinstance(environment.runner, MasterRunner) and saved_transactions:
+        _save_transactions(environment)
+
+
+@events.test_start.add_listener
+def prefund_accounts(environment: "locust.env.Environment", **kwargs):
+    """Create funded accounts for all users at once, users take them in setup"""
+    if isinstance(environment.runner, MasterRunner):
+        return
+    count = environment.parsed_options.prefund_accounts
+    if count < 0:
+        count = environment.parsed_options.num_users or 0
+    # workers of a distributed run prefund accounts for their own users
+    count = env.worker_share(environment, count)
+    if count == 0:
+        return
+    web3_client = NeonChainWeb3Client(environment.credentials["proxy_url"], gas_price_ttl=GAS_PRICE_TTL)
+    provisioner = AccountProvisioner(
+        web3_client, faucet=Faucet(environment.credentials["faucet_url"], web3_client), concurrency=50
+    )
+    if account_pool.is_enabled():
+        # accounts of previous runs are reused and topped up in background while the test runs
+        pool = account_pool.AccountPool(
+            environment.parsed_options.host or environment.host, provisioner, web3_client, top_up_amount=FUNDING_AMOUNT
+        )
+        LOG.info(f"Lease {count} accounts from the pool")
+        environment.shared.funded_accounts.extend(pool.lease(count))
+        environment.shared.accounts_pool = pool
+        return
+    LOG.info(f"Create {count} funded accounts")
+    environment.shared.funded_accounts.extend(provisioner.create_accounts(count, FUNDING_AMOUNT))
+
+
+@events.test_stop.add_listener
+def release_pool_accounts(environment: "locust.env.Environment", **kwargs):
+    pool = getattr(environment.shared, "accounts_pool", None)
+    if pool is not None:
+        pool.close()
+        environment.shared.accounts_pool = None
 
 
 def init_session(size: int = 1000) -> requests.Session:
@@ -58,23 +135,127 @@ def init_session(size: int = 1000) -> requests.Session:
     session = requests.Session()
     session.mount("http://", adapter)
     session.mount("https://", adapter)
-    return session
+    return stats.track_response_size(session)
 
 
-class NeonWeb3ClientExt(NeonChainWeb3Client):
-    """Extends Neon Web3 client adds statistics metrics"""
+OPERATION_METHODS = [
+    "call_function_at_address",
+    "compile_by_vyper_and_deploy",
+    "create_account_with_balance",
+    "create_accounts_with_balance",
+    "deploy_and_get_contract",
+    "deploy_contract",
+    "gas_price",
+    "get_balance",
+    "get_balances",
+    "get_block_number",
+    "get_block_number_by_id",
+    "get_evm_info",
+    "get_neon_emulate",
+    "get_nonce",
+    "get_solana_trx_by_neon",
+    "get_transaction_by_hash",
+    "send_batch",
+    "send_neon",
+    "send_raw_transaction",
+    "send_transaction",
+]
+"""Client methods reported as Locust requests with "operation" statistics granularity"""
+
+TRANSACTION_METHODS = [
+    "deploy_and_get_contract",
+    "deploy_contract",
+    "send_neon",
+    "send_raw_transaction",
+    "send_transaction",
+]
+"""Client methods which results are saved with SAVE_TRANSACTIONS"""
+
+_instrumented_call = threading.local()
+
 
-    def __getattribute__(self, item):
-        ignore_list = ["create_account", "_send_transaction"]
+@events.init_command_line_parser.add_listener
+def parse_stats_granularity_argument(parser):
+    parser.add_argument(
+        "--stats-granularity",
+        choices=["operation", "rpc"],
+        env_var="NEON_STATS_GRANULARITY",
+        default="operation",
+        include_in_web_ui=False,
+        help="Report client operations (send neon, deploy contract) or every JSON-RPC request as Locust requests",
+    )
+
+
+@events.test_start.add_listener
+def set_stats_granularity(environment: "locust.env.Environment", **kwargs):
+    NeonWeb3ClientExt.stats_granularity = environment.parsed_options.stats_granularity
+
+
+def _instrument_operation(func: tp.Callable) -> tp.Callable:
+    """Report the method call, calls of other instrumented methods inside it aren't reported"""
+    report = statistics_collector()(func)
+
+    @functools.wraps(func)
+    def wrap(self, *args, **kwargs) -> tp.Any:
+        if NeonWeb3ClientExt.stats_granularity != "operation" or getattr(_instrumented_call, "active", False):
+            return func(self, *args, **kwargs)
+        _instrumented_call.active = True
         try:
-            attr = object.__getattribute__(self, item)
-        except AttributeError:
-            attr = super(NeonWeb3ClientExt, self).__getattr__(item)
-        if callable(attr) and item not in ignore_list:
-            attr = statistics_collector()(attr)
-            if "SAVE_TRANSACTIONS" in os.environ:
-                attr = save_transaction(saved_transactions)(attr)
-        return attr
+            return report(self, *args, **kwargs)
+        finally:
+            _instrumented_call.active = False
+
+    return wrap
+
+
+class InstrumentedHTTPProvider(web3.HTTPProvider):
+    """Reports every JSON-RPC request as a Locust request with "rpc" statistics granularity"""
+
+    def make_request(self, method: "web3.types.RPCEndpoint", params: tp.Any) -> "web3.types.RPCResponse":
+        if NeonWeb3ClientExt.stats_granularity != "rpc":
+            return super().make_request(method, params)
+        with stats.RequestTimer(method) as timer:
+            timer.response = super().make_request(method, params)
+            if "error" in timer.response:
+                timer.exception = web3.exceptions.Web3Exception(timer.response["error"])
+        return timer.response
+
+
+class NeonWeb3ClientExt(NeonChainWeb3Client):
+    """Extends Neon Web3 client adds statistics metrics
+
+    Methods are instrumented once when the class is created, see OPERATION_METHODS and InstrumentedHTTPProvider.
+    """
+
+    provider_class = InstrumentedHTTPProvider
+    stats_granularity = "operation"
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("gas_price_ttl", GAS_PRICE_TTL)
+        super().__init__(*args, **kwargs)
+        stats.track_response_size(self._session)
+
+    def _send_rpc(self, method: str, params: tp.Optional[tp.Any] = None, req_id: int = 0) -> tp.Dict:
+        if self.stats_granularity != "rpc":
+            return super()._send_rpc(method, params, req_id)
+        with stats.RequestTimer(method) as timer:
+            timer.response = super()._send_rpc(method, params, req_id)
+        return timer.response
+
+    def send_batch(self, calls: tp.Sequence[tp.Tuple[str, tp.Optional[tp.Any]]]) -> tp.List[tp.Dict]:
+        if self.stats_granularity != "rpc":
+            return super().send_batch(calls)
+        with stats.RequestTimer("batch", ",".join(sorted({method for method, _ in calls}))) as timer:
+            timer.response = super().send_batch(calls)
+        return timer.response
+
+
+for _name in OPERATION_METHODS:
+    _method = _instrument_operation(getattr(NeonWeb3ClientExt, _name))
+    if "SAVE_TRANSACTIONS" in os.environ and _name in TRANSACTION_METHODS:
+        _method = save_transaction(saved_transactions)(_method)
+    setattr(NeonWeb3ClientExt, _name, _method)
+del _name, _method
 
 
 class NeonProxyTasksSet(TaskSet):
@@ -83,18 +264,25 @@ class NeonProxyTasksSet(TaskSet):
     faucet: tp.Optional[Faucet] = None
     account: tp.Optional["eth_account.signers.local.LocalAccount"] = None
     web3_client: tp.Optional[NeonWeb3ClientExt] = None
+    max_in_flight: int = 20
+    """Max number of sent but not included transactions per user in pipelined tasks"""
+    receipt_timeout: float = 180
+    """Seconds to wait for the receipt of the oldest in-flight transaction, receipts expire after 120 seconds"""
 
     def setup(self) -> None:
         """Prepare data requirements"""
         # create new shared account for each simulating user
-        self.account = self.web3_client.create_account()
-        self.check_balance()
+        self.prepare_account()
         self.user.environment.shared.accounts.append(self.account)
-        LOG.info(f"New account {self.account.address} created")
 
     def prepare_account(self) -> None:
         """Prepare data requirements"""
-        # create new account for each simulating user
+        # take a prefunded account or create new one for each simulating user
+        funded_accounts = self.user.environment.shared.funded_accounts
+        if funded_accounts:
+            self.account = funded_accounts.pop()
+            LOG.info(f"Prefunded account {self.account.address} taken")
+            return
         self.account = self.web3_client.create_account()
         self.check_balance()
         LOG.info(f"New account {self.account.address} created")
@@ -112,26 +300,30 @@ class NeonProxyTasksSet(TaskSet):
         )
         self.faucet = Faucet(
             self.credentials["faucet_url"], self.web3_client, session=session)
+        self.in_flight: tp.List[PendingTransaction] = []
 
     def task_block_number(self) -> None:
         """Check the number of the most recent block"""
         self.web3_client.get_block_number()
 
+    def submit(self, pending: PendingTransaction) -> None:
+        """Keep transaction in flight, waits for the oldest one when the user has too many"""
+        self.in_flight = [p for p in self.in_flight if not p.done()]
+        if len(self.in_flight) >= self.max_in_flight:
+            try:
+                self.in_flight.pop(0).receipt(self.receipt_timeout)
+            except Exception as e:
+                LOG.error(f"Transaction failed: {e}")
+        self.in_flight.append(inclusion_statistics(pending))
+
     def check_balance(self, account: tp.Optional["eth_account.signers.local.LocalAccount"] = None) -> None:
         """Keeps account balance not empty"""
         account = account or self.account
-        balance_before = self.web3_client.get_balance(account.address)
-        if balance_before < 100:
+        if self.web3_client.get_balance(account.address) < 100:
             # add credits to account
-            self.faucet.request_neon(account.address, 1000)
-            for _ in range(5):
-                if self.web3_client.get_balance(account.address) <= balance_before:
-                    time.sleep(3)
-                    continue
-                break
-            else:
-                raise AssertionError(
-                    f"Account {account.address} balance didn't change after 15 seconds")
+            AccountProvisioner(self.web3_client, faucet=self.faucet, timeout=15).fund(
+                [account.address], FUNDING_AMOUNT
+            )
 
     def deploy_contract(
         self,
@@ -163,7 +355,6 @@ class NeonProxyTasksSet(TaskSet):
 
         return contract, contract_deploy_tx
 
-    @lru_cache(maxsize=32)
     def _compile_contract_interface(self, name, version, contract_name: tp.Optional[str] = None) -> tp.Any:
         """Compile contract inteface form file"""
         return helpers.get_contract_interface(name, version, contract_name=contract_name)
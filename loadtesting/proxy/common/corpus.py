@@ -0,0 +1,162 @@
+import logging
+import mmap
+import multiprocessing
+import pathlib
+import struct
+import typing as tp
+
+import eth_account
+import eth_account.signers.local
+
+from utils import helpers
+from utils.faucet import Faucet
+from utils.provisioning import AccountProvisioner
+from utils.web3client import NeonChainWeb3Client
+
+LOG = logging.getLogger(__name__)
+
+MAGIC = b"NEONTXC1"
+HEADER = struct.Struct("<8sQI")
+"""magic, chain id, number of senders"""
+SENDER = struct.Struct("<20sIQ")
+"""sender address, number of transactions, offset of the first transaction"""
+LENGTH = struct.Struct("<I")
+"""every transaction is its length and raw signed bytes"""
+
+TX_KINDS = ["neon", "counter", "erc20"]
+
+COUNTER_CONTRACT = ("common/Counter.sol", "0.8.10")
+ERC20_CONTRACT = ("EIPs/ERC20/ERC20", "0.8.8")
+ERC20_SUPPLY = 10**18
+
+
+def _sign_sender_transactions(job: tp.Tuple[str, int, int, tp.List[tp.Dict]]) -> bytes:
+    """Sign count transactions of one sender, templates are used in turn"""
+    key, nonce, count, templates = job
+    data = bytearray()
+    for i in range(count):
+        transaction = dict(templates[i % len(templates)], nonce=nonce + i)
+        raw = eth_account.Account.sign_transaction(transaction, key).rawTransaction
+        data += LENGTH.pack(len(raw))
+        data += raw
+    return bytes(data)
+
+
+def write_corpus(
+    path: tp.Union[str, pathlib.Path],
+    chain_id: int,
+    senders: tp.Sequence[tp.Tuple[eth_account.signers.local.LocalAccount, int, tp.List[tp.Dict]]],
+    transactions_per_sender: int,
+    processes: tp.Optional[int] = None,
+) -> None:
+    """Sign transactions of (account, first nonce, transaction templates) senders in a process pool"""
+    header_size = HEADER.size + SENDER.size * len(senders)
+    jobs = [(account.key.hex(), nonce, transactions_per_sender, templates) for account, nonce, templates in senders]
+    entries = []
+    with open(path, "wb") as f:
+        f.seek(header_size)
+        with multiprocessing.Pool(processes) as pool:
+            # imap keeps order and only a few senders' transactions in memory
+            for (account, _, _), data in zip(senders, pool.imap(_sign_sender_transactions, jobs)):
+                entries.append(SENDER.pack(bytes.fromhex(account.address[2:]), transactions_per_sender, f.tell()))
+                f.write(data)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, chain_id, len(senders)))
+        f.write(b"".join(entries))
+
+
+class Corpus:
+    """Memory mapped file of pre-signed transactions grouped by sender in nonce order"""
+
+    def __init__(self, path: tp.Union[str, pathlib.Path]):
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.chain_id, count = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} isn't a transactions corpus")
+        self.senders = [SENDER.unpack_from(self._mmap, HEADER.size + SENDER.size * i) for i in range(count)]
+
+    def __len__(self) -> int:
+        return sum(count for _, count, _ in self.senders)
+
+    def transactions(self, sender_index: int) -> tp.Iterator[bytes]:
+        """Raw transactions of the sender, they must be sent in this order"""
+        _, count, offset = self.senders[sender_index]
+        for _ in range(count):
+            (length,) = LENGTH.unpack_from(self._mmap, offset)
+            offset += LENGTH.size
+            yield self._mmap[offset : offset + length]
+            offset += length
+
+    def close(self) -> None:
+        self._mmap.close()
+        self._file.close()
+
+
+def prepare_corpus(
+    web3_client: NeonChainWeb3Client,
+    faucet: Faucet,
+    path: tp.Union[str, pathlib.Path],
+    senders_count: int,
+    transactions_per_sender: int,
+    kinds: tp.Sequence[str] = TX_KINDS,
+    amount: int = 1000,
+    gas_price_multiplier: float = 1.5,
+    processes: tp.Optional[int] = None,
+) -> None:
+    """Create and fund senders, deploy contracts they call and write their signed transactions
+
+    Gas price is fixed at signing time, so it is taken with a margin. Every transaction of a kind has
+    the same gas limit which is estimated once.
+    """
+    senders = AccountProvisioner(web3_client, faucet=faucet, concurrency=50).create_accounts(senders_count, amount)
+    gas_price = int(web3_client.gas_price() * gas_price_multiplier)
+    base = {"chainId": web3_client.chain_id, "gasPrice": gas_price, "value": 0}
+
+    def deploy(account, contract, constructor_args=None):
+        interface = helpers.get_contract_interface(*contract)
+        pending = web3_client.deploy_contract(
+            account, interface["abi"], interface["bin"], constructor_args=constructor_args, wait=False
+        )
+        return interface, pending
+
+    counter = None
+    if "counter" in kinds:
+        interface, pending = deploy(senders[0], COUNTER_CONTRACT)
+        counter = web3_client.eth.contract(address=pending.receipt()["contractAddress"], abi=interface["abi"])
+    tokens = {}
+    if "erc20" in kinds:
+        # every sender transfers its own tokens, so transfers never run out of balance
+        deployed = [(account, *deploy(account, ERC20_CONTRACT, ["Corpus", "CRP", ERC20_SUPPLY])) for account in senders]
+        for account, interface, pending in deployed:
+            tokens[account.address] = web3_client.eth.contract(
+                address=pending.receipt()["contractAddress"], abi=interface["abi"]
+            )
+
+    recipients = [account.address for account in senders[1:] + senders[:1]]
+    templates_by_kind: tp.Dict[str, tp.Callable[[eth_account.signers.local.LocalAccount, str], tp.Dict]] = {
+        "neon": lambda account, recipient: dict(base, to=recipient, value=1),
+        "counter": lambda account, recipient: dict(base, to=counter.address, data=counter.encodeABI(fn_name="inc")),
+        "erc20": lambda account, recipient: dict(
+            base,
+            to=tokens[account.address].address,
+            data=tokens[account.address].encodeABI(fn_name="transfer", args=[recipient, 1]),
+        ),
+    }
+    gas = {}
+    for kind in kinds:
+        sample = dict(templates_by_kind[kind](senders[0], recipients[0]), **{"from": senders[0].address})
+        gas[kind] = int(web3_client.eth.estimate_gas(sample) * 1.2)
+
+    nonces = [
+        int(response["result"], 16)
+        for response in web3_client.send_batch(
+            [("eth_getTransactionCount", [account.address, "pending"]) for account in senders]
+        )
+    ]
+    jobs = [
+        (account, nonce, [dict(templates_by_kind[kind](account, recipient), gas=gas[kind]) for kind in kinds])
+        for account, nonce, recipient in zip(senders, nonces, recipients)
+    ]
+    LOG.info(f"Sign {senders_count * transactions_per_sender} transactions")
+    write_corpus(path, web3_client.chain_id, jobs, transactions_per_sender, processes)
@@ -1,23 +1,91 @@
 import json
 import logging
 import pathlib
+import time
+import typing as tp
 from dataclasses import dataclass
 
+import gevent
 from locust import events
+from locust.runners import MasterRunner, WorkerRunner
 
 
 LOG = logging.getLogger(__name__)
 
+WORKER_INDEX_TIMEOUT = 30
+"""Seconds a worker waits for its index from the master"""
+
 
 @dataclass
 class NeonGlobalEnv:
     accounts = []
+    funded_accounts = []
+    accounts_pool = None
+    arrival_stats = None
     counter_contracts = []
     erc20_contracts = {}
     erc20_wrapper_contracts = {}
     increase_storage_contracts = []
 
 
+def worker_count(environment: "locust.env.Environment") -> int:
+    """Number of processes which run users, 1 for a local run"""
+    if not isinstance(environment.runner, WorkerRunner):
+        return 1
+    return max(1, environment.parsed_options.expect_workers or 1)
+
+
+def worker_share(environment: "locust.env.Environment", total: int) -> int:
+    """Part of total (users, accounts) for this process, workers of a distributed run split it evenly"""
+    workers = worker_count(environment)
+    if workers == 1:
+        return total
+    return total // workers + int(worker_index(environment) % workers < total % workers)
+
+
+def worker_shard(environment: "locust.env.Environment", items: tp.Sequence) -> tp.Sequence:
+    """Items for this process, every worker of a distributed run gets its own part"""
+    workers = worker_count(environment)
+    if workers == 1:
+        return items
+    return items[worker_index(environment) % workers :: workers]
+
+
+def worker_index(environment: "locust.env.Environment") -> int:
+    """Index of the worker given by the master in the order workers connect, 0 for a local run"""
+    if not isinstance(environment.runner, WorkerRunner):
+        return 0
+    deadline = time.monotonic() + WORKER_INDEX_TIMEOUT
+    while getattr(environment, "neon_worker_index", None) is None:
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"The master didn't give the worker index in {WORKER_INDEX_TIMEOUT} seconds")
+        gevent.sleep(0.1)
+    return environment.neon_worker_index
+
+
+@events.init.add_listener
+def assign_worker_indexes(environment, **kwargs):
+    """Workers ask the master for their indexes, the runner of locust 2.8 doesn't number workers"""
+    runner = environment.runner
+    if isinstance(runner, MasterRunner):
+        indexes: tp.Dict[str, int] = {}
+
+        def give_index(environment, msg, **kwargs):
+            # a reconnected worker keeps its index
+            index = indexes.setdefault(msg.node_id, len(indexes))
+            runner.send_message("neon_worker_index", index, client_id=msg.node_id)
+
+        runner.register_message("neon_worker_index_request", give_index)
+    elif isinstance(runner, WorkerRunner):
+
+        def set_index(environment, msg, **kwargs):
+            environment.neon_worker_index = msg.data
+            LOG.info(f"Worker index {msg.data}")
+
+        runner.register_message("neon_worker_index", set_index)
+        runner.send_message("neon_worker_index_request")
+
+
 @events.init_command_line_parser.add_listener
 def arg_parser(parser):
     """Add custom command line arguments to Locust"""
@@ -28,6 +96,13 @@ def arg_parser(parser):
         default="envs.json",
         help="Relative path to environment credentials file.",
     )
+    parser.add_argument(
+        "--prefund-accounts",
+        type=int,
+        env_var="NEON_PREFUND_ACCOUNTS",
+        default=-1,
+        help="How many funded accounts create at once before users start (number of users by default, 0 disables).",
+    )
 
 
 @events.test_start.add_listener
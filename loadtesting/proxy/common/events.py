@@ -1,13 +1,14 @@
+import csv
 import functools
 import json
 import logging
 import os
 import re
 import pathlib
-import sys
+import threading
 import time
 import typing as tp
-import uuid
+from concurrent.futures import Future
 from dataclasses import dataclass
 
 import requests
@@ -19,16 +20,29 @@ from locust import events
 from locust.runners import WorkerRunner
 
 from utils import operator
+from utils.receipt_collector import PendingTransaction
 from utils.web3client import NeonChainWeb3Client
 
-from . import env
+from . import env, stats
 
 LOG = logging.getLogger(__name__)
 
+TRANSACTION_REQUEST_TYPES = {
+    "Send Neon",
+    "Send Transaction",
+    "Send Raw Transaction",
+    "Deploy Contract",
+    "Deploy And Get Contract",
+    "eth_sendTransaction",
+    "eth_sendRawTransaction",
+}
+"""Request types which send transactions, by operation and by rpc statistics granularity"""
+
 
 def get_token_balance(op: operator.Operator) -> tp.Dict:
     """Return tokens balance"""
-    return dict(neon=op.get_neon_balance(), sol=op.get_solana_balance())
+    balances = op.get_balances()
+    return dict(neon=balances.neon, sol=balances.sol)
 
 
 def execute_before(*attrs) -> tp.Callable:
@@ -47,6 +61,100 @@ def execute_before(*attrs) -> tp.Callable:
     return ext_runner
 
 
+class OperatorBalanceSampler:
+    """Records operator balances and successful requests of every type at a fixed interval
+
+    Requests are read from Locust stats, so on the master they include requests of all workers.
+    Cost per transaction counts TRANSACTION_REQUEST_TYPES only, other requests are informational columns.
+    The thread is a greenlet under Locust.
+    """
+
+    def __init__(self, op: operator.Operator, stats: "locust.stats.RequestStats", interval: float) -> None:
+        self._op = op
+        self._stats = stats
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread: tp.Optional[threading.Thread] = None
+        self.samples: tp.List[tp.Dict[str, tp.Any]] = []
+
+    def sample(self) -> tp.Dict[str, tp.Any]:
+        balances = self._op.get_balances()
+        requests_by_type: tp.Dict[str, int] = {}
+        for entry in list(self._stats.entries.values()):
+            requests_by_type[entry.method] = requests_by_type.get(entry.method, 0) + entry.num_requests - entry.num_failures
+        sample = dict(timestamp=time.time(), slot=balances.slot, sol=balances.sol, neon=balances.neon, requests=requests_by_type)
+        self.samples.append(sample)
+        return sample
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            try:
+                self.sample()
+            except Exception as e:
+                LOG.warning(f"Failed to get operator balances: {e}")
+
+    def rows(self) -> tp.List[tp.Dict[str, tp.Any]]:
+        """Samples with cumulative cost per transaction and SOL burn rate since the previous sample"""
+        if not self.samples:
+            return []
+        first = self.samples[0]
+        request_types = sorted({name for sample in self.samples for name in sample["requests"]})
+        rows = []
+        previous = first
+        for sample in self.samples:
+            transactions = sum(
+                sample["requests"].get(name, 0) - first["requests"].get(name, 0) for name in TRANSACTION_REQUEST_TYPES
+            )
+            sol_spent = first["sol"] - sample["sol"]
+            elapsed = sample["timestamp"] - previous["timestamp"]
+            row = dict(
+                timestamp=round(sample["timestamp"], 3),
+                elapsed=round(sample["timestamp"] - first["timestamp"], 3),
+                slot=sample["slot"],
+                sol=sample["sol"],
+                neon=sample["neon"],
+                transactions=transactions,
+                sol_spent=sol_spent,
+                neon_earned=sample["neon"] - first["neon"],
+                sol_per_transaction=sol_spent / transactions if transactions else None,
+                sol_burn_rate=(previous["sol"] - sample["sol"]) / elapsed if elapsed else None,
+            )
+            row.update({name: sample["requests"].get(name, 0) for name in request_types})
+            rows.append(row)
+            previous = sample
+        return rows
+
+    def export(self, path: tp.Union[str, pathlib.Path]) -> None:
+        """Save rows to csv or parquet file (by the file extension, parquet needs pyarrow)"""
+        rows = self.rows()
+        if not rows:
+            return
+        path = pathlib.Path(path)
+        if path.suffix == ".parquet":
+            try:
+                import pyarrow
+                import pyarrow.parquet
+            except ImportError:
+                raise RuntimeError("Install pyarrow to save operator balances to parquet")
+            # NEON balances of reward addresses are Decimal
+            columns = {key: [float(row[key]) if row[key] is not None else None for row in rows] for key in rows[0]}
+            pyarrow.parquet.write_table(pyarrow.table(columns), path)
+            return
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+
 @events.init_command_line_parser.add_listener
 def parse_argument_for_operator_balance(parser):
     parser.add_argument(
@@ -56,6 +164,20 @@ def parse_argument_for_operator_balance(parser):
         include_in_web_ui=False,
         help="Get operator balances before and after test",
     )
+    parser.add_argument(
+        "--operator-balance-interval",
+        type=float,
+        default=0,
+        include_in_web_ui=False,
+        help="Record operator balances every N seconds during the test (0 disables), needs --operator-balance",
+    )
+    parser.add_argument(
+        "--operator-balance-output",
+        type=str,
+        default="operator_balance.csv",
+        include_in_web_ui=False,
+        help="File for recorded operator balances, .csv or .parquet",
+    )
 
 
 @events.test_start.add_listener
@@ -74,7 +196,13 @@ def operator_economy_pre_balance(environment, **kwargs):
         web3_client=NeonChainWeb3Client(environment.credentials["proxy_url"]),
     )
     environment.op = op
-    environment.pre_balance = get_token_balance(op)
+    environment.balance_sampler = OperatorBalanceSampler(
+        op, environment.stats, environment.parsed_options.operator_balance_interval
+    )
+    sample = environment.balance_sampler.sample()
+    environment.pre_balance = dict(neon=sample["neon"], sol=sample["sol"])
+    if environment.parsed_options.operator_balance_interval > 0:
+        environment.balance_sampler.start()
 
 
 @events.test_stop.add_listener
@@ -84,7 +212,9 @@ def operator_economy_balance(environment, **kwargs):
     if isinstance(environment.runner, WorkerRunner):
         return
     LOG.info("Get operator balances")
-    balance = get_token_balance(environment.op)
+    sampler = environment.balance_sampler
+    sampler.stop()
+    balance = sampler.sample()
     operator_balance = tabulate.tabulate(
         [
             ["NEON", environment.pre_balance["neon"], balance["neon"]],
@@ -96,93 +226,55 @@ def operator_economy_balance(environment, **kwargs):
         floatfmt=".2f",
     )
     LOG.info(f"\n{10 * '_'} Operator balance {10 * '_'}\n{operator_balance}\n")
-
-
-class LocustEventHandler:
-    """Implements custom Locust events handler"""
-
-    def __init__(self, request_event: "EventHook") -> None:
-        self.buffer: tp.Dict[str, tp.Any] = dict()
-        self._request_event = request_event
-
-    def init_event(
-        self,
-        task_id: str,
-        request_type: str,
-        task_name: tp.Optional[str] = "",
-        start_time: tp.Optional[float] = None,
-    ) -> None:
-        """Added data to buffer"""
-        params = dict(
-            name=task_name,
-            start_time=start_time or time.time(),
-            request_type=request_type,
-            start_perf_counter=time.perf_counter(),
-        )
-        self.buffer[task_id] = params
-        LOG.debug("- buffer - %s" % self.buffer)
-
-    def fire_event(self, task_id: str, **kwargs) -> None:
-        """Sends event to locust ."""
-        event = self.buffer.pop(task_id)
-        total_time = (time.perf_counter() - event["start_perf_counter"]) * 1000
-        request_meta = dict(
-            name=event["name"],
-            request_type=event["request_type"],
-            response=event.get("response"),
-            response_time=total_time,
-            response_length=event.get("response_length", 0),
-            exception=event.get("exception"),
-            context={},
-        )
-        self._request_event.fire(**request_meta)
-        LOG.debug(
-            "- %s : %s - %sms"
-            % (event["request_type"], event["event_type"], total_time)
-        )
-
-
-locust_events_handler = LocustEventHandler(events.request)
+    if environment.parsed_options.operator_balance_interval > 0:
+        sampler.export(environment.parsed_options.operator_balance_output)
+        LOG.info(f"Operator balances are saved to {environment.parsed_options.operator_balance_output}")
 
 
 def statistics_collector(name: tp.Optional[str] = None) -> tp.Callable:
-    """Handle locust events."""
+    """Report every call of the function to Locust as a request"""
 
     def decor(func: tp.Callable) -> tp.Callable:
+        request_type = name or func.__name__.replace("_", " ").title()
+
         @functools.wraps(func)
         def wrap(*args, **kwargs) -> tp.Any:
-            task_id = str(uuid.uuid4())
-            if name:
-                request_type = name
-            else:
-                request_type = f"{func.__name__.replace('_', ' ').title()}"
-            event = dict(task_id=task_id, request_type=request_type)
-            locust_events_handler.init_event(**event)
-            response = None
             try:
-                response = func(*args, **kwargs)
-                event = dict(
-                    response=response,
-                    response_length=sys.getsizeof(response),
-                    event_type="success",
-                )
+                with stats.RequestTimer(request_type) as timer:
+                    timer.response = func(*args, **kwargs)
             except Exception as err:
-                event = dict(event_type="failure", exception=err)
-                locust_events_handler.buffer[task_id].update(event)
-                locust_events_handler.fire_event(task_id)
                 LOG.error(
                     f"Web3 RPC call {request_type} is failed: {err} passed args: `{args}`, passed kwargs: `{kwargs}`"
                 )
                 raise
-            locust_events_handler.buffer[task_id].update(event)
-            locust_events_handler.fire_event(task_id)
-            return response
+            return timer.response
 
         return wrap
 
     return decor
 
 
+def inclusion_statistics(
+    pending: PendingTransaction, request_type: str = "Transaction inclusion"
+) -> PendingTransaction:
+    """Report time from sending a transaction to getting its receipt"""
+
+    def fire(future: Future) -> None:
+        exception = future.exception()
+        events.request.fire(
+            name="",
+            request_type=request_type,
+            response=None if exception else future.result(),
+            response_time=(time.time() - pending.sent_at) * 1000,
+            response_length=0,
+            exception=exception,
+            context={},
+        )
+
+    pending.future.add_done_callback(fire)
+    return pending
+
+
 def save_transaction(transactions: tp.List[str]) -> tp.Callable:
     def decor(func: tp.Callable) -> tp.Callable:
         @functools.wraps(func)
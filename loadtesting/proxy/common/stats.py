@@ -0,0 +1,227 @@
+import bisect
+import http.server
+import json
+import logging
+import threading
+import time
+import typing as tp
+
+import requests
+from locust import events
+from locust.runners import MasterRunner, WorkerRunner
+
+from . import env
+
+LOG = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+"""Upper bounds of latency histogram buckets in milliseconds"""
+
+_received = threading.local()
+"""Bytes received by the current greenlet, a counter which only grows"""
+
+
+def _count_response_bytes(response: requests.Response, *args, **kwargs) -> None:
+    _received.bytes = getattr(_received, "bytes", 0) + len(response.content)
+
+
+def track_response_size(session: requests.Session) -> requests.Session:
+    """Count bytes of all responses of the session, RequestTimer reports them as response length"""
+    if _count_response_bytes not in session.hooks["response"]:
+        session.hooks["response"].append(_count_response_bytes)
+    return session
+
+
+class RequestTimer:
+    """Context manager which reports the time of its block to Locust as one request
+
+    Response length is the number of bytes received by tracked sessions inside the block, nested
+    timers don't affect each other. An exception raised in the block is reported and re-raised.
+    """
+
+    __slots__ = ("request_type", "name", "response", "exception", "_start", "_bytes")
+
+    def __init__(self, request_type: str, name: str = "") -> None:
+        self.request_type = request_type
+        self.name = name
+        self.response = None
+        self.exception: tp.Optional[Exception] = None
+
+    def __enter__(self) -> "RequestTimer":
+        self._bytes = getattr(_received, "bytes", 0)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc_type is not None and not issubclass(exc_type, Exception):
+            # killed greenlet (user stopped) or interrupted run, not a failed request
+            return False
+        events.request.fire(
+            request_type=self.request_type,
+            name=self.name,
+            response=self.response,
+            response_time=(time.perf_counter() - self._start) * 1000,
+            response_length=getattr(_received, "bytes", 0) - self._bytes,
+            exception=exc or self.exception,
+            context={},
+        )
+        return False
+
+
+class LatencyHistograms:
+    """Latency histograms of requests by (request_type, name)"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._histograms: tp.Dict[tp.Tuple[str, str], tp.Dict[str, tp.Any]] = {}
+
+    def add(self, request_type: str, name: str, response_time: float, failed: bool) -> None:
+        with self._lock:
+            histogram = self._histograms.get((request_type, name))
+            if histogram is None:
+                histogram = dict(buckets=[0] * (len(LATENCY_BUCKETS) + 1), count=0, sum=0.0, failures=0)
+                self._histograms[(request_type, name)] = histogram
+            histogram["buckets"][bisect.bisect_left(LATENCY_BUCKETS, response_time)] += 1
+            histogram["count"] += 1
+            histogram["sum"] += response_time
+            histogram["failures"] += int(failed)
+
+    def snapshot(self) -> tp.Dict[tp.Tuple[str, str], tp.Dict[str, tp.Any]]:
+        with self._lock:
+            return {
+                key: dict(histogram, buckets=list(histogram["buckets"])) for key, histogram in self._histograms.items()
+            }
+
+    def to_prometheus(self) -> str:
+        lines = ["# TYPE locust_request_latency_ms histogram"]
+        failures = ["# TYPE locust_request_failures_total counter"]
+        for (request_type, name), histogram in sorted(self.snapshot().items()):
+            labels = f'request_type={json.dumps(request_type)},name={json.dumps(name)}'
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + ["+Inf"], histogram["buckets"]):
+                cumulative += count
+                lines.append(f'locust_request_latency_ms_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"locust_request_latency_ms_sum{{{labels}}} {histogram['sum']}")
+            lines.append(f"locust_request_latency_ms_count{{{labels}}} {histogram['count']}")
+            failures.append(f"locust_request_failures_total{{{labels}}} {histogram['failures']}")
+        return "\n".join(lines + failures) + "\n"
+
+
+class StatsExporter:
+    """Streams latency histograms to a JSON lines file and/or serves them for Prometheus
+
+    Every line of the file is a snapshot of one request type histogram since the test start.
+    """
+
+    def __init__(
+        self,
+        jsonl_path: tp.Optional[str] = None,
+        prometheus_port: tp.Optional[int] = None,
+        interval: float = 10,
+    ) -> None:
+        self.histograms = LatencyHistograms()
+        self._jsonl_path = jsonl_path
+        self._prometheus_port = prometheus_port
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread: tp.Optional[threading.Thread] = None
+        self._server: tp.Optional[http.server.ThreadingHTTPServer] = None
+
+    def on_request(self, request_type, name, response_time, exception=None, **kwargs) -> None:
+        self.histograms.add(request_type, name, response_time, exception is not None)
+
+    def start(self) -> None:
+        events.request.add_listener(self.on_request)
+        if self._jsonl_path:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        if self._prometheus_port:
+            histograms = self.histograms
+
+            class MetricsHandler(http.server.BaseHTTPRequestHandler):
+                def do_GET(self):
+                    body = histograms.to_prometheus().encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, *args):
+                    pass
+
+            self._server = http.server.ThreadingHTTPServer(("", self._prometheus_port), MetricsHandler)
+            threading.Thread(target=self._server.serve_forever, daemon=True).start()
+            LOG.info(f"Prometheus metrics are served on port {self._prometheus_port}")
+
+    def stop(self) -> None:
+        events.request.remove_listener(self.on_request)
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def write_snapshot(self) -> None:
+        timestamp = time.time()
+        with open(self._jsonl_path, "a") as f:
+            for (request_type, name), histogram in self.histograms.snapshot().items():
+                record = dict(timestamp=timestamp, request_type=request_type, name=name, **histogram)
+                f.write(json.dumps(record) + "\n")
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            self.write_snapshot()
+        self.write_snapshot()
+
+
+@events.init_command_line_parser.add_listener
+def parse_stats_export_arguments(parser):
+    parser.add_argument(
+        "--stats-jsonl",
+        type=str,
+        default="",
+        include_in_web_ui=False,
+        help="Append latency histograms by request type to this JSON lines file every --stats-interval seconds",
+    )
+    parser.add_argument(
+        "--stats-prometheus-port",
+        type=int,
+        default=0,
+        include_in_web_ui=False,
+        help="Serve latency histograms by request type for Prometheus on this port",
+    )
+    parser.add_argument(
+        "--stats-interval",
+        type=float,
+        default=10,
+        include_in_web_ui=False,
+        help="Interval of --stats-jsonl snapshots",
+    )
+
+
+@events.test_start.add_listener
+def start_stats_exporter(environment, **kwargs):
+    options = environment.parsed_options
+    if not (options.stats_jsonl or options.stats_prometheus_port):
+        return
+    if isinstance(environment.runner, MasterRunner):
+        # requests are made and reported by workers only
+        return
+    jsonl_path, port = options.stats_jsonl or None, options.stats_prometheus_port or None
+    if isinstance(environment.runner, WorkerRunner):
+        # every worker exports its own requests
+        index = env.worker_index(environment)
+        jsonl_path = jsonl_path and f"{jsonl_path}.{index}"
+        port = port and port + index
+    environment.stats_exporter = StatsExporter(jsonl_path, port, options.stats_interval)
+    environment.stats_exporter.start()
+
+
+@events.test_stop.add_listener
+def stop_stats_exporter(environment, **kwargs):
+    exporter = getattr(environment, "stats_exporter", None)
+    if exporter is not None:
+        exporter.stop()
+        environment.stats_exporter = None
@@ -29,7 +29,6 @@ class NeonIterativeTasksSet(NeonProxyTasksSet):
         ).build_transaction(
             {
                 "from": self.account.address,
-                "nonce": self.web3_client.get_nonce(self.account.address),
                 "gasPrice": self.web3_client.gas_price(),
             }
         )
@@ -92,7 +92,6 @@ class MoraswapTaskSet(NeonProxyTasksSet):
             ).build_transaction(
                 {
                     "from": self.account.address,
-                    "nonce": self.web3_client.get_nonce(self.account.address),
                     "gasPrice": self.web3_client.gas_price(),
                 }
             )
@@ -113,7 +112,6 @@ class MoraswapTaskSet(NeonProxyTasksSet):
         ).build_transaction(
             {
                 "from": self.account.address,
-                "nonce": self.web3_client.get_nonce(self.account.address),
                 "gasPrice": self.web3_client.gas_price(),
                 "value": web3.Web3.to_wei(1, "ether"),
             }
@@ -0,0 +1,101 @@
+import collections
+import logging
+import time
+
+import gevent
+from locust import User, events, tag, task
+
+from loadtesting.proxy.common import arrival, env
+from loadtesting.proxy.common.base import FUNDING_AMOUNT, NeonProxyTasksSet
+from loadtesting.proxy.common.events import inclusion_statistics
+from utils.provisioning import AccountProvisioner
+
+LOG = logging.getLogger(__name__)
+
+TRANSFER_AMOUNT = 0.001
+
+
+@tag("open_loop")
+class OpenLoopTasksSet(NeonProxyTasksSet):
+    """Sends neons at the --arrival-rate schedule regardless of how fast transactions are included
+
+    Every transaction is sent by its own greenlet from a free sender account, so the rate doesn't depend
+    on proxy latency. Time to inclusion is reported as `Transaction inclusion` requests.
+    """
+
+    tick_interval: float = 0.05
+
+    def on_start(self) -> None:
+        super().on_start()
+        environment = self.user.environment
+        schedule = arrival.parse_schedule(environment.parsed_options.arrival_rate)
+        if environment.shared.arrival_stats is None:
+            environment.shared.arrival_stats = arrival.ArrivalStats(schedule)
+        self.arrival_stats = environment.shared.arrival_stats
+        self.schedule = schedule
+        senders = self._prepare_senders(environment.parsed_options.arrival_senders)
+        self.recipients = [sender.address for sender in senders]
+        self.free_senders = collections.deque(senders)
+
+    def _prepare_senders(self, count: int):
+        funded_accounts = self.user.environment.shared.funded_accounts
+        senders = [funded_accounts.pop() for _ in range(min(count, len(funded_accounts)))]
+        if len(senders) < count:
+            LOG.info(f"Create {count - len(senders)} sender accounts")
+            provisioner = AccountProvisioner(self.web3_client, faucet=self.faucet, concurrency=50)
+            senders.extend(provisioner.create_accounts(count - len(senders), FUNDING_AMOUNT))
+        return senders
+
+    def _on_included(self, future) -> None:
+        self.arrival_stats.in_flight -= 1
+
+    def _send(self, sender) -> None:
+        try:
+            pending = self.web3_client.send_neon(
+                sender, self.recipients[self.arrival_stats.submitted % len(self.recipients)], TRANSFER_AMOUNT, wait=False
+            )
+        except Exception:
+            # the failure is reported by the client
+            self.arrival_stats.in_flight -= 1
+            return
+        finally:
+            self.free_senders.append(sender)
+        inclusion_statistics(pending).future.add_done_callback(self._on_included)
+
+    def _drop(self) -> None:
+        self.arrival_stats.dropped += 1
+        events.request.fire(
+            request_type="Open loop drop",
+            name="",
+            response=None,
+            response_time=0,
+            response_length=0,
+            exception=RuntimeError("No free sender account, increase --arrival-senders"),
+            context={},
+        )
+
+    @task
+    def task_open_loop(self) -> None:
+        """Submits transactions due by the schedule every tick until the test stops"""
+        # the rate is split between all users of all workers
+        environment = self.user.environment
+        users = max(1, environment.runner.target_user_count or 1) * env.worker_count(environment)
+        start = last = time.monotonic()
+        due = 0.0
+        while True:
+            now = time.monotonic()
+            due += self.schedule(now - start) / users * (now - last)
+            last = now
+            while due >= 1:
+                due -= 1
+                if not self.free_senders:
+                    self._drop()
+                    continue
+                self.arrival_stats.submitted += 1
+                self.arrival_stats.in_flight += 1
+                gevent.spawn(self._send, self.free_senders.popleft())
+            gevent.sleep(self.tick_interval)
+
+
+class OpenLoopUser(User):
+    tasks = {OpenLoopTasksSet: 1}
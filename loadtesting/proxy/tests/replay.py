@@ -0,0 +1,74 @@
+import logging
+import typing as tp
+
+import gevent
+from locust import User, events, tag, task
+from locust.exception import StopUser
+
+from loadtesting.proxy.common import env
+from loadtesting.proxy.common.base import NeonProxyTasksSet
+from loadtesting.proxy.common.corpus import Corpus
+
+LOG = logging.getLogger(__name__)
+
+
+@events.init_command_line_parser.add_listener
+def parse_corpus_argument(parser):
+    parser.add_argument(
+        "--corpus",
+        type=str,
+        env_var="NEON_TX_CORPUS",
+        default="transactions.corpus",
+        include_in_web_ui=False,
+        help="File of pre-signed transactions made by `clickfile.py locust prepare-corpus`",
+    )
+
+
+@tag("replay")
+class ReplayTasksSet(NeonProxyTasksSet):
+    """Sends pre-signed transactions from the corpus by eth_sendRawTransaction
+
+    Senders of the corpus are split between workers of a distributed run and then between users,
+    every user sends transactions of its senders in turn and in nonce order. The user stops when its transactions are over.
+    """
+
+    max_in_flight: int = 100
+
+    _setup_class_locker = gevent.threading.Lock()
+    _corpus: tp.Optional[Corpus] = None
+    _last_user_index: int = 0
+
+    def on_start(self) -> None:
+        super().on_start()
+        with self._setup_class_locker:
+            if ReplayTasksSet._corpus is None:
+                ReplayTasksSet._corpus = Corpus(self.user.environment.parsed_options.corpus)
+                LOG.info(f"Corpus of {len(ReplayTasksSet._corpus)} transactions is loaded")
+            user_index = ReplayTasksSet._last_user_index
+            ReplayTasksSet._last_user_index += 1
+        users = max(1, self.user.environment.runner.target_user_count or 1)
+        worker_senders = env.worker_shard(self.user.environment, range(len(self._corpus.senders)))
+        senders = worker_senders[user_index % users :: users]
+        self.transactions = [self._corpus.transactions(sender) for sender in senders]
+        if not self.transactions:
+            LOG.warning(f"Corpus has less senders than users, user {user_index} has nothing to send")
+        self.next_sender = 0
+
+    @task
+    def task_send_raw_transaction(self) -> None:
+        """Send the next transaction of the next sender"""
+        while self.transactions:
+            self.next_sender %= len(self.transactions)
+            raw_transaction = next(self.transactions[self.next_sender], None)
+            if raw_transaction is None:
+                del self.transactions[self.next_sender]
+                continue
+            self.next_sender += 1
+            self.submit(self.web3_client.send_raw_transaction(raw_transaction, wait=False))
+            return
+        LOG.info("All transactions of the user are sent")
+        raise StopUser()
+
+
+class ReplayUser(User):
+    tasks = {ReplayTasksSet: 1}
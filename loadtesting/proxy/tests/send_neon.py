@@ -12,7 +12,6 @@ LOG = logging.getLogger(__name__)
 @tag("send_neon")
 class NeonTasksSet(NeonProxyTasksSet):
     """Implements Neons transfer base pipeline tasks"""
-    nonce: int
     recipient: str
 
     def on_start(self) -> None:
@@ -20,7 +19,6 @@ class NeonTasksSet(NeonProxyTasksSet):
         super().setup()
         self.log = logging.getLogger(
             "neon-consumer[%s]" % self.account.address[-8:])
-        self.nonce = self.web3_client.get_nonce(self.account)
         self.recipient = self.get_account()
     
     def get_balances(self):
@@ -40,19 +38,39 @@ class NeonTasksSet(NeonProxyTasksSet):
     @execute_before("task_block_number")
     def task_send_neon(self):
         """Transferring funds to a random account"""
-        # add credits to account
-        self.nonce = self.web3_client.get_nonce(self.account)
         self.recipient = self.get_account()
         self.log.info(
-            f"Send `neon` from {str(self.account.address)[-8:]} to {str(self.recipient.address)[-8:]}. nonce {self.nonce}"
+            f"Send `neon` from {str(self.account.address)[-8:]} to {str(self.recipient.address)[-8:]}."
         )
 
-        tx = self.web3_client.send_neon(
-            self.account, self.recipient, amount=1, nonce=self.nonce
-        )
+        tx = self.web3_client.send_neon(self.account, self.recipient, amount=1)
 
         return tx, self.web3_client.get_nonce(self.account)
 
 
+@tag("send_neon_pipeline")
+class NeonPipelineTasksSet(NeonProxyTasksSet):
+    """Sends neons without waiting for receipts, so one user keeps many transactions in flight"""
+
+    def on_start(self) -> None:
+        super().on_start()
+        super().setup()
+        self.log = logging.getLogger(
+            "neon-consumer[%s]" % self.account.address[-8:])
+
+    @task
+    def task_send_neon_pipeline(self):
+        """Transferring funds to a random account, receipt is collected in background"""
+        recipient = random.choice(self.user.environment.shared.accounts)
+        self.log.info(
+            f"Send `neon` from {str(self.account.address)[-8:]} to {str(recipient.address)[-8:]} without waiting."
+        )
+        self.submit(self.web3_client.send_neon(self.account, recipient, amount=1, wait=False))
+
+
 class NeonUser(User):
     tasks = {NeonTasksSet: 1}
+
+
+class NeonPipelineUser(User):
+    tasks = {NeonPipelineTasksSet: 1}
@@ -1,3 +1,23 @@
+import logging
+import os
+import pathlib
+import random
+import shutil
+import subprocess
+
+import locust
+import web3
+from locust import tag, task, events
+
+from utils import helpers
+from utils.web3client import NeonChainWeb3Client
+from utils.faucet import Faucet
+
+from loadtesting.proxy.common.base import NeonProxyTasksSet
+from loadtesting.proxy.common.events import statistics_collector
+
+LOG = logging.getLogger(__name__)
+
 UNISWAP_REPO_URL = "https://github.com/gigimon/Uniswap-V2-NEON.git"
 UNISWAP_TMP_DIR = "/tmp/uniswap-neon"
 MAX_UINT_256 = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF
@@ -31,6 +51,16 @@ def deploy_uniswap(environment: "locust.env.Environment", **kwargs):
     eth_account = neon_client.create_account()
     faucet.request_neon(eth_account.address, 10000)
 
+    # one solc run for all 0.5.16 contracts, the deploys below take them from the compilation cache
+    LOG.info("Compile Uniswap contracts")
+    _, _, pair_contract_interface = helpers.get_contract_interfaces(
+        [
+            (str(uniswap_path / "contracts/v2-core/test/ERC20.sol"), "0.5.16", None),
+            (str(uniswap_path / "contracts/v2-core/UniswapV2Factory.sol"), "0.5.16", None),
+            (str(uniswap_path / "contracts/v2-core/UniswapV2Pair.sol"), "0.5.16", None),
+        ]
+    )
+
     erc20_contracts = {"tokenA": "", "tokenB": "", "tokenC": "", "weth": ""}
     LOG.info("Deploy ERC20 tokens for Uniswap")
     for token in erc20_contracts:
@@ -62,7 +92,6 @@ def deploy_uniswap(environment: "locust.env.Environment", **kwargs):
     ).build_transaction(
         {
             "from": eth_account.address,
-            "nonce": neon_client.eth.get_transaction_count(eth_account.address),
             "gasPrice": neon_client.gas_price(),
         }
     )
@@ -73,7 +102,6 @@ def deploy_uniswap(environment: "locust.env.Environment", **kwargs):
     ).build_transaction(
         {
             "from": eth_account.address,
-            "nonce": neon_client.eth.get_transaction_count(eth_account.address),
             "gasPrice": neon_client.gas_price(),
         }
     )
@@ -86,10 +114,6 @@ def deploy_uniswap(environment: "locust.env.Environment", **kwargs):
         erc20_contracts["tokenB"].address, erc20_contracts["tokenC"].address
     ).call()
 
-    pair_contract_interface = helpers.get_contract_interface(
-        str(uniswap_path / "contracts/v2-core/UniswapV2Pair.sol"), version="0.5.16"
-    )
-
     pair1_contract = neon_client.eth.contract(address=pair1_address, abi=pair_contract_interface["abi"])
     pair2_contract = neon_client.eth.contract(address=pair2_address, abi=pair_contract_interface["abi"])
 
@@ -98,7 +122,6 @@ def deploy_uniswap(environment: "locust.env.Environment", **kwargs):
         tr = c.functions.approve(uniswap2_router.address, MAX_UINT_256).build_transaction(
             {
                 "from": eth_account.address,
-                "nonce": neon_client.eth.get_transaction_count(eth_account.address),
                 "gasPrice": neon_client.gas_price(),
             }
         )
@@ -117,7 +140,6 @@ def deploy_uniswap(environment: "locust.env.Environment", **kwargs):
     ).build_transaction(
         {
             "from": eth_account.address,
-            "nonce": neon_client.eth.get_transaction_count(eth_account.address),
             "gasPrice": neon_client.gas_price(),
         }
     )
@@ -134,7 +156,6 @@ def deploy_uniswap(environment: "locust.env.Environment", **kwargs):
     ).build_transaction(
         {
             "from": eth_account.address,
-            "nonce": neon_client.eth.get_transaction_count(eth_account.address),
             "gasPrice": neon_client.gas_price(),
         }
     )
@@ -165,7 +186,6 @@ class UniswapTransaction(NeonProxyTasksSet):
             trx = token.functions.transfer(self.account.address, web3.Web3.to_wei(1000, "ether")).build_transaction(
                 {
                     "from": signer.address,
-                    "nonce": self.web3_client.eth.get_transaction_count(signer.address),
                     "gasPrice": self.web3_client.gas_price(),
                 }
             )
@@ -177,7 +197,6 @@ class UniswapTransaction(NeonProxyTasksSet):
             ).build_transaction(
                 {
                     "from": self.account.address,
-                    "nonce": self.web3_client.get_nonce(self.account.address),
                     "gasPrice": self.web3_client.gas_price(),
                 }
             )
@@ -209,7 +228,6 @@ class UniswapTransaction(NeonProxyTasksSet):
         ).build_transaction(
             {
                 "from": self.account.address,
-                "nonce": self.web3_client.get_nonce(self.account.address),
                 "gasPrice": self.web3_client.gas_price(),
             }
         )
@@ -231,7 +249,6 @@ class UniswapTransaction(NeonProxyTasksSet):
         ).build_transaction(
             {
                 "from": self.account.address,
-                "nonce": self.web3_client.get_nonce(self.account.address),
                 "gasPrice": self.web3_client.gas_price(),
             }
         )
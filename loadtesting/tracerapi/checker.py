@@ -0,0 +1,65 @@
+import logging
+import random
+import typing as tp
+
+from gevent.pool import Pool
+from locust import events
+
+from loadtesting.proxy.common import stats
+
+LOG = logging.getLogger(__name__)
+
+
+class ResponseChecker:
+    """Verifies a random sample of responses in its own greenlet pool, out of measured requests
+
+    Checks are reported to Locust as `check` requests named by the checked method, so failed checks
+    are visible next to request statistics. When all checkers are busy the response isn't checked,
+    the measured loop never waits for them.
+    """
+
+    def __init__(self, sample_rate: float = 0.01, concurrency: int = 10) -> None:
+        self.sample_rate = sample_rate
+        self.skipped = 0
+        self._pool = Pool(concurrency)
+
+    def submit(self, name: str, check: tp.Callable[..., None], response: tp.Optional[tp.Dict], *args) -> None:
+        """Check a sample of successful responses by check(response, *args), which raises on a wrong one"""
+        if response is None or "result" not in response or random.random() >= self.sample_rate:
+            return
+        if self._pool.full():
+            self.skipped += 1
+            return
+        self._pool.spawn(self._run, name, check, response, *args)
+
+    @staticmethod
+    def _run(name: str, check: tp.Callable[..., None], response: tp.Dict, *args) -> None:
+        try:
+            with stats.RequestTimer("check", name):
+                check(response, *args)
+        except Exception as err:
+            LOG.error(f"Check of {name} response failed: {err}, response: {response}")
+
+    def stop(self) -> None:
+        self._pool.kill()
+        if self.skipped:
+            LOG.info(f"{self.skipped} sampled responses weren't checked, all checkers were busy")
+
+
+@events.init_command_line_parser.add_listener
+def parse_check_arguments(parser):
+    parser.add_argument(
+        "--check-rate",
+        type=float,
+        env_var="NEON_CHECK_RATE",
+        default=0.01,
+        include_in_web_ui=False,
+        help="Part of responses which are verified, checks run outside of measured requests",
+    )
+    parser.add_argument(
+        "--check-concurrency",
+        type=int,
+        default=10,
+        include_in_web_ui=False,
+        help="Greenlets which verify sampled responses",
+    )
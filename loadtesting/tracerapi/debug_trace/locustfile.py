@@ -0,0 +1,146 @@
+import logging
+import random
+import typing as tp
+
+import web3
+from locust import User, events, tag, task
+
+from loadtesting.proxy.common import stats
+from loadtesting.tracerapi.history import ZERO_HASH, HistoryRecord
+from loadtesting.tracerapi.locustfile import BaseEthRPCATasksSet
+
+LOG = logging.getLogger("neon_client")
+
+TRACERS = ["struct", "callTracer", "prestateTracer"]
+"""Tracers of debug_trace* methods, struct is the default struct logger"""
+
+TRACE_GROUPS = ["transfer", "store", "logs", "deploy"]
+"""History groups which traced transactions are taken from, deploy are nested BigDeploy deployments"""
+
+TRACE_SAMPLE_ATTEMPTS = 10
+"""Records without transaction hash (dumped by older preparation stage) are sampled again this many times"""
+
+
+@events.init_command_line_parser.add_listener
+def parse_trace_arguments(parser):
+    parser.add_argument(
+        "--trace-tracers",
+        type=str,
+        default=",".join(TRACERS),
+        include_in_web_ui=False,
+        help=f"Tracers of debug_traceTransaction and debug_traceCall, every request takes one of them: "
+        f"{', '.join(TRACERS)}",
+    )
+    parser.add_argument(
+        "--trace-groups",
+        type=str,
+        default=",".join(TRACE_GROUPS),
+        include_in_web_ui=False,
+        help="History groups which traced transactions are taken from, every request takes one of them",
+    )
+
+
+@tag("debug")
+class DebugTraceTasksSet(BaseEthRPCATasksSet):
+    """task set measures debug_traceTransaction and debug_traceCall methods by tracer
+
+    Transactions of the history are traced again, requests are reported by tracer and history group,
+    e.g. `[callTracer] deploy`, so latency and response size of every tracer are seen separately.
+    """
+
+    tracers: tp.List[str] = []
+    groups: tp.List[str] = []
+
+    def on_start(self) -> None:
+        """on_start is called when a Locust start before any task is scheduled"""
+        super(DebugTraceTasksSet, self).on_start()
+        options = self.user.environment.parsed_options
+        self.tracers = options.trace_tracers.split(",")
+        unknown = set(self.tracers) - set(TRACERS)
+        if unknown:
+            raise ValueError(f"Unknown tracers {unknown}, use {TRACERS}")
+        self.groups = [name for name in options.trace_groups.split(",") if self._has_hashes(name)]
+        if not self.groups:
+            self.log.warning("No transactions with hashes in the history, debug_trace* methods aren't requested")
+            self.interrupt(reschedule=False)
+
+    def _has_hashes(self, name: str) -> bool:
+        """The newest record has no hash when the group was dumped by older preparation stage"""
+        group = self._transaction_history.groups.get(name)
+        return bool(group) and group.record(len(group) - 1).transaction_hash != ZERO_HASH
+
+    def _get_traced_transaction(self) -> tp.Tuple[tp.Optional[HistoryRecord], str]:
+        """Random transaction of a random traced group and the group"""
+        group = random.choice(self.groups)
+        for _ in range(TRACE_SAMPLE_ATTEMPTS):
+            transaction, _ = self._age_sampler.sample(self._transaction_history.groups[group])
+            if transaction.transaction_hash != ZERO_HASH:
+                return transaction, group
+        return None, group
+
+    @staticmethod
+    def tracer_params(tracer: str) -> tp.List[tp.Dict]:
+        """The default struct logger is requested without tracer config"""
+        return [] if tracer == "struct" else [{"tracer": tracer}]
+
+    @staticmethod
+    def call_object(transaction: HistoryRecord) -> tp.Dict:
+        """Call object which repeats the transaction"""
+        call = {"from": transaction.sender, "data": transaction.input, "value": hex(transaction.value)}
+        if transaction.type != "deploy":
+            # a deployment has no recipient, the history keeps the deployed contract instead
+            call["to"] = transaction.to
+        return call
+
+    @staticmethod
+    def check_trace(response: tp.Dict, tracer: str) -> None:
+        result = response["result"]
+        if tracer == "struct":
+            assert not result["failed"] and "structLogs" in result, f"Wrong struct logger trace: {result}"
+        elif tracer == "callTracer":
+            assert result["type"] in ("CALL", "CREATE") and "error" not in result, f"Wrong call trace: {result}"
+        else:
+            assert isinstance(result, dict) and result, f"Empty prestate trace: {result}"
+
+    def _trace(self, method: str, params: tp.List, tracer: str, group: str) -> tp.Optional[tp.Dict]:
+        response = None
+        try:
+            with stats.RequestTimer(f"`{method.rsplit('_')[1]}`", f"[{tracer}] {group}") as timer:
+                response = timer.response = self._rpc_client.send_rpc_unmeasured(method, params=params)
+                if "error" in response:
+                    raise web3.exceptions.ValidationError(response["error"])
+        except Exception as err:
+            LOG.error(f"Web3 RPC call {method} is failed: {err}, params: {params}")
+        self.log.debug("Call %s with %s tracer: %s", method, tracer, params)
+        self._checker.submit(method, self.check_trace, response, tracer)
+        return response
+
+    @tag("traceTransaction")
+    @task
+    def task_debug_trace_transaction(self) -> tp.Optional[tp.Dict]:
+        """the debug_traceTransaction method by a random tracer"""
+        transaction, group = self._get_traced_transaction()
+        if transaction is None:
+            return None
+        tracer = random.choice(self.tracers)
+        params = [transaction.transaction_hash] + self.tracer_params(tracer)
+        return self._trace("debug_traceTransaction", params, tracer, group)
+
+    @tag("traceCall")
+    @task
+    def task_debug_trace_call(self) -> tp.Optional[tp.Dict]:
+        """the debug_traceCall method by a random tracer, the call repeats a transaction on its parent block"""
+        transaction, group = self._get_traced_transaction()
+        if transaction is None:
+            return None
+        tracer = random.choice(self.tracers)
+        params = [self.call_object(transaction), hex(max(transaction.block_number - 1, 0))]
+        return self._trace("debug_traceCall", params + self.tracer_params(tracer), tracer, group)
+
+
+class DebugTraceUsers(User):
+    """class represents debug_trace* calls by one user, they run apart from EIP-1898 methods"""
+
+    tasks = {
+        DebugTraceTasksSet: 1,
+    }
@@ -0,0 +1,455 @@
+import array
+import bisect
+import json
+import math
+import mmap
+import operator
+import os
+import pathlib
+import random
+import struct
+import tempfile
+import threading
+import time
+import typing as tp
+
+MAGIC = b"NEONTRH1"
+HEADER_LENGTH = struct.Struct("<I")
+"""magic and the length of the JSON header follow each other, columns follow the header"""
+
+ALIGNMENT = 8
+
+NUMERIC_COLUMNS = {
+    "block_number": "Q",
+    "sender_nonce": "Q",
+    "recipient_balance_after": "d",
+    "type": "B",
+    "contract": "i",
+    "input_offset": "Q",
+    "input_length": "I",
+}
+"""Column name and its array typecode"""
+
+BINARY_COLUMNS = {
+    "transaction_hash": 32,
+    "block_hash": 32,
+    "sender": 20,
+    "to": 20,
+    "value": 32,
+}
+"""Column name and the width of its values in bytes"""
+
+VARIABLE_COLUMNS = ["input"]
+"""Columns of values of any width, a value is sliced by `<name>_offset` and `<name>_length` columns"""
+
+ZERO_HASH = "0x" + "00" * 32
+"""Transaction hash of records dumped before hashes were recorded"""
+
+
+def _aligned(size: int) -> int:
+    return -(-size // ALIGNMENT) * ALIGNMENT
+
+
+def _from_hex(value: str) -> bytes:
+    return bytes.fromhex(value[2:] if value.startswith("0x") else value)
+
+
+class HistoryRecord(tp.NamedTuple):
+    """One transaction of the history, values are built on access and never shared"""
+
+    block_number: int
+    block_hash: str
+    sender: str
+    to: str
+    sender_nonce: int
+    recipient_balance_after: float
+    type: str
+    contract: tp.Optional[tp.Dict]
+    transaction_hash: str = ZERO_HASH
+    value: int = 0
+    input: str = "0x"
+
+    def block(self, req_type: str) -> str:
+        """Block identifier by request type: blockNumber or blockHash"""
+        return self.block_hash if req_type == "blockHash" else hex(self.block_number)
+
+
+def _is_sorted(column: tp.Sequence[int], start: int, end: int) -> bool:
+    """Block numbers do not decrease within [start, end), the column isn't copied"""
+    with memoryview(column) as view:
+        return all(map(operator.le, view[start : end - 1], view[start + 1 : end]))
+
+
+class BlockIndex:
+    """Record indexes of a group ordered by block number, the oldest first
+
+    Records are dumped in block order, so usually the block number column itself is the index and order is None.
+    The order and sorted block numbers are built only when some records are out of order.
+    """
+
+    def __init__(self, block_numbers: tp.Sequence[int], sorted_count: int = 0) -> None:
+        self._count = len(block_numbers)
+        self.order: tp.Optional[array.array] = None
+        self.block_numbers = block_numbers
+        if not _is_sorted(block_numbers, max(sorted_count - 1, 0), self._count):
+            order = sorted(range(self._count), key=block_numbers.__getitem__)
+            self.order = array.array("Q", order)
+            self.block_numbers = array.array("Q", (block_numbers[i] for i in order))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def record_index(self, position: int) -> int:
+        """Index of the record at the position in block order"""
+        return position if self.order is None else self.order[position]
+
+    def newest(self) -> int:
+        return self.block_numbers[self._count - 1]
+
+    def positions(self, min_block: int, max_block: int) -> tp.Tuple[int, int]:
+        """[start, end) positions of records with min_block <= block number <= max_block"""
+        # the column of an in-memory history grows, records added after the index was built aren't in it
+        return (
+            bisect.bisect_left(self.block_numbers, min_block, 0, self._count),
+            bisect.bisect_right(self.block_numbers, max_block, 0, self._count),
+        )
+
+
+class HistoryGroup:
+    """Transactions of one RPC type, every field is a column with O(1) access by index
+
+    Columns are memory views of the history file or growing arrays for a history which is built in memory.
+    """
+
+    def __init__(self, history: "TransactionHistory", columns: tp.Optional[tp.Dict[str, tp.Any]] = None) -> None:
+        self._history = history
+        if columns is None:
+            columns = {name: array.array(typecode) for name, typecode in NUMERIC_COLUMNS.items()}
+            columns.update({name: bytearray() for name in BINARY_COLUMNS})
+            columns.update({name: bytearray() for name in VARIABLE_COLUMNS})
+        self.columns = columns
+        self._block_index: tp.Optional[BlockIndex] = None
+        self._newest_block: tp.Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self.columns["block_number"])
+
+    def block_index(self) -> BlockIndex:
+        """Built on the first use and again when records are added"""
+        index = self._block_index
+        if index is None or len(index) != len(self):
+            # records appended after an ordered index are checked from where it ends
+            sorted_count = len(index) if index is not None and index.order is None else 0
+            self._block_index = BlockIndex(self.columns["block_number"], sorted_count)
+        return self._block_index
+
+    def newest_block(self) -> int:
+        """Found once in a memory mapped group and kept by append, 0 for an empty group"""
+        if self._newest_block is None:
+            self._newest_block = max(self.columns["block_number"], default=0)
+        return self._newest_block
+
+    def _binary(self, name: str, index: int) -> str:
+        width = BINARY_COLUMNS[name]
+        return "0x" + self.columns[name][index * width : (index + 1) * width].hex()
+
+    def _variable(self, name: str, index: int) -> str:
+        offset, length = self.columns[f"{name}_offset"][index], self.columns[f"{name}_length"][index]
+        return "0x" + self.columns[name][offset : offset + length].hex()
+
+    def record(self, index: int) -> HistoryRecord:
+        contract = self.columns["contract"][index]
+        return HistoryRecord(
+            block_number=self.columns["block_number"][index],
+            block_hash=self._binary("block_hash", index),
+            sender=self._binary("sender", index),
+            to=self._binary("to", index),
+            sender_nonce=self.columns["sender_nonce"][index],
+            recipient_balance_after=self.columns["recipient_balance_after"][index],
+            type=self._history.types[self.columns["type"][index]],
+            contract=self._history.contracts[contract] if contract >= 0 else None,
+            transaction_hash=self._binary("transaction_hash", index),
+            value=int.from_bytes(self.columns["value"][index * 32 : (index + 1) * 32], "big"),
+            input=self._variable("input", index),
+        )
+
+    def append(
+        self,
+        block_number: int,
+        block_hash: str,
+        sender: str,
+        to: str,
+        sender_nonce: int = 0,
+        recipient_balance_after: float = math.nan,
+        type: str = "",
+        contract: tp.Optional[tp.Dict] = None,
+        transaction_hash: str = ZERO_HASH,
+        value: int = 0,
+        input: str = "0x",
+    ) -> None:
+        columns = self.columns
+        data = _from_hex(input)
+        columns["input_offset"].append(len(columns["input"]))
+        columns["input_length"].append(len(data))
+        columns["input"] += data
+        columns["value"] += value.to_bytes(BINARY_COLUMNS["value"], "big")
+        self._newest_block = max(self.newest_block(), block_number)
+        columns["block_number"].append(block_number)
+        columns["sender_nonce"].append(sender_nonce)
+        columns["recipient_balance_after"].append(recipient_balance_after)
+        columns["type"].append(self._history.type_index(type))
+        columns["contract"].append(self._history.contract_index(contract))
+        for name, value in (
+            ("transaction_hash", transaction_hash), ("block_hash", block_hash), ("sender", sender), ("to", to)
+        ):
+            columns[name] += _from_hex(value).rjust(BINARY_COLUMNS[name], b"\0")
+
+
+def parse_age_buckets(spec: str) -> tp.List[int]:
+    """Parse bucket boundaries (block ages) like `1000,100000,1000000`"""
+    return sorted(int(boundary) for boundary in spec.split(",") if boundary.strip())
+
+
+class AgeSampler:
+    """Samples records by the age of their blocks, head block number minus the record block number
+
+    Distributions:
+        uniform - every record has the same chance
+        recent:BLOCKS - uniformly among records not older than BLOCKS
+        zipf:S - a record of rank k from the newest one with probability ~ 1/k^S
+        buckets - every age bucket has the same chance, uniformly within the bucket
+    Every sample is labeled by its age bucket, so latency can be reported by age.
+    """
+
+    def __init__(
+        self, distribution: str = "uniform", age_buckets: tp.Sequence[int] = (), head_block: tp.Optional[int] = None
+    ) -> None:
+        kind, _, arg = distribution.partition(":")
+        try:
+            self._kind, self._arg = kind, {"uniform": None, "buckets": None, "recent": int, "zipf": float}[kind]
+            if self._arg is not None:
+                self._arg = self._arg(arg)
+        except (KeyError, ValueError):
+            raise ValueError(f"Wrong block age distribution `{distribution}`, use uniform, recent:BLOCKS, zipf:S or buckets")
+        self.age_buckets = sorted(age_buckets)
+        self.labels = [f"age<{self.age_buckets[0]}"] if self.age_buckets else [""]
+        self.labels += [f"age {low}-{high}" for low, high in zip(self.age_buckets, self.age_buckets[1:])]
+        self.labels += [f"age>={self.age_buckets[-1]}"] if self.age_buckets else []
+        self.head_block = head_block
+
+    def bucket(self, age: int) -> str:
+        return self.labels[bisect.bisect_right(self.age_buckets, age)]
+
+    def _zipf_rank(self, count: int) -> int:
+        """Inverse of the continuous approximation of Zipf CDF, O(1) for any count"""
+        u, s = random.random(), self._arg
+        rank = count**u if s == 1 else ((count ** (1 - s) - 1) * u + 1) ** (1 / (1 - s))
+        return min(int(rank) - 1, count - 1)
+
+    def _position(self, index: BlockIndex, head: int) -> int:
+        count = len(index)
+        if self._kind == "zipf":
+            return count - 1 - self._zipf_rank(count)
+        if self._kind == "recent":
+            start, end = index.positions(head - self._arg, head)
+            return random.randrange(start, end) if start < end else count - 1
+        # records newer than head (added while the test runs) are in the first bucket
+        bounds = [max(head, index.newest())] + [head - age for age in self.age_buckets] + [-1]
+        ranges = [index.positions(oldest + 1, newest) for newest, oldest in zip(bounds, bounds[1:])]
+        start, end = random.choice([r for r in ranges if r[0] < r[1]] or [(0, count)])
+        return random.randrange(start, end)
+
+    def sample(self, group: HistoryGroup) -> tp.Tuple[HistoryRecord, str]:
+        """Random record and its age bucket label, ages are counted from the newest record without head_block"""
+        head = self.head_block if self.head_block is not None else group.newest_block()
+        if self._kind == "uniform":
+            record = group.record(random.randrange(len(group)))
+        else:
+            index = group.block_index()
+            record = group.record(index.record_index(self._position(index, head)))
+        return record, self.bucket(max(head - record.block_number, 0))
+
+
+class TransactionHistory:
+    """Transaction history of the tracer API preparation stage stored by columns
+
+    The history file is memory mapped, so millions of records take neither worker RAM nor load time,
+    and a random record is read in O(1). Records are immutable, every sample is a new HistoryRecord.
+    """
+
+    def __init__(self) -> None:
+        self.groups: tp.Dict[str, HistoryGroup] = {}
+        self.types: tp.List[str] = [""]
+        self.contracts: tp.List[tp.Dict] = []
+        self._contract_indexes: tp.Dict[str, int] = {}
+        self._mmap: tp.Optional[mmap.mmap] = None
+
+    def __len__(self) -> int:
+        return sum(len(group) for group in self.groups.values())
+
+    def group(self, name: str) -> HistoryGroup:
+        if name not in self.groups:
+            self.groups[name] = HistoryGroup(self)
+        return self.groups[name]
+
+    def type_index(self, type: str) -> int:
+        if type not in self.types:
+            self.types.append(type)
+        return self.types.index(type)
+
+    def contract_index(self, contract: tp.Optional[tp.Dict]) -> int:
+        """Contracts are kept once, records refer to them by index"""
+        if not contract:
+            return -1
+        address = contract["address"]
+        if address not in self._contract_indexes:
+            self._contract_indexes[address] = len(self.contracts)
+            self.contracts.append(contract)
+        return self._contract_indexes[address]
+
+    def add(self, group: str, sender: str, entry: tp.Dict) -> None:
+        """Add an entry of the JSON dump made by the preparation stage"""
+        info = entry.get("additional_info") or {}
+        self.group(group).append(
+            block_number=int(entry["blockNumber"], 16),
+            block_hash=entry["blockHash"],
+            sender=sender,
+            to=entry["to"],
+            sender_nonce=int(info.get("sender_nonce", 0)),
+            recipient_balance_after=float(info.get("recipient_balance_after", math.nan)),
+            type=info.get("type", ""),
+            contract=entry.get("contract"),
+            transaction_hash=entry.get("transactionHash") or ZERO_HASH,
+            value=int(entry.get("value") or "0x0", 16),
+            input=entry.get("input") or "0x",
+        )
+
+    @classmethod
+    def from_json(cls, path: tp.Union[str, pathlib.Path]) -> "TransactionHistory":
+        """Convert the JSON dump {group: {sender: [entry, ...]}}"""
+        history = cls()
+        with open(path, "r") as fp:
+            data = json.load(fp)
+        for group, senders in data.items():
+            for sender, entries in senders.items():
+                for entry in entries:
+                    history.add(group, sender, entry)
+        return history
+
+    def read_jsonl(self, path: tp.Union[str, pathlib.Path], offset: int = 0) -> int:
+        """Add records written after offset by HistoryWriter, return the offset to continue from
+
+        The last line is skipped until it's complete, so the file can be read while it's written.
+        """
+        with open(path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                offset += len(line)
+                entry = json.loads(line)
+                self.add(entry.pop("group"), entry.pop("from"), entry)
+        return offset
+
+    @classmethod
+    def from_jsonl(cls, path: tp.Union[str, pathlib.Path]) -> "TransactionHistory":
+        history = cls()
+        history.read_jsonl(path)
+        return history
+
+    def save(self, path: tp.Union[str, pathlib.Path]) -> None:
+        header = {"types": self.types, "contracts": self.contracts, "groups": {}}
+        offset = 0
+        for name, group in self.groups.items():
+            columns = header["groups"][name] = {"count": len(group), "columns": {}, "sizes": {}}
+            for column, values in group.columns.items():
+                columns["columns"][column] = offset
+                if column in VARIABLE_COLUMNS:
+                    columns["sizes"][column] = memoryview(values).nbytes
+                offset += _aligned(memoryview(values).nbytes)
+        header_bytes = json.dumps(header).encode()
+        data_start = _aligned(len(MAGIC) + HEADER_LENGTH.size + len(header_bytes))
+        # written aside and renamed, so processes which have mapped the old file keep reading it
+        path = pathlib.Path(path)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(MAGIC)
+                f.write(HEADER_LENGTH.pack(len(header_bytes)))
+                f.write(header_bytes)
+                for name, group in self.groups.items():
+                    for column, values in group.columns.items():
+                        f.seek(data_start + header["groups"][name]["columns"][column])
+                        f.write(memoryview(values).cast("B"))
+                f.truncate(data_start + offset)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @classmethod
+    def open(cls, path: tp.Union[str, pathlib.Path]) -> "TransactionHistory":
+        history = cls()
+        with open(path, "rb") as f:
+            history._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if history._mmap[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} isn't a transaction history")
+        (length,) = HEADER_LENGTH.unpack_from(history._mmap, len(MAGIC))
+        header_start = len(MAGIC) + HEADER_LENGTH.size
+        header = json.loads(history._mmap[header_start : header_start + length])
+        data_start = _aligned(header_start + length)
+        history.types = header["types"]
+        for contract in header["contracts"]:
+            history.contract_index(contract)
+        view = memoryview(history._mmap)
+        for name, group in header["groups"].items():
+            count, columns = group["count"], {}
+            for column, offset in group["columns"].items():
+                start = data_start + offset
+                if column in NUMERIC_COLUMNS:
+                    typecode = NUMERIC_COLUMNS[column]
+                    size = count * array.array(typecode).itemsize
+                    columns[column] = view[start : start + size].cast(typecode)
+                elif column in VARIABLE_COLUMNS:
+                    columns[column] = view[start : start + group["sizes"][column]]
+                else:
+                    columns[column] = view[start : start + count * BINARY_COLUMNS[column]]
+            # files saved before columns were added
+            for column, typecode in NUMERIC_COLUMNS.items():
+                if column not in columns:
+                    columns[column] = memoryview(bytes(count * array.array(typecode).itemsize)).cast(typecode)
+            for column, width in BINARY_COLUMNS.items():
+                columns.setdefault(column, bytes(count * width))
+            for column in VARIABLE_COLUMNS:
+                columns.setdefault(column, b"")
+            history.groups[name] = HistoryGroup(history, columns)
+        return history
+
+
+class HistoryWriter:
+    """Append-only JSON lines file of history records, one line per transaction
+
+    Every record is flushed at once and the file is synced to disk every fsync_interval seconds, so a crash
+    loses almost nothing. Records of previous runs are kept, remove the file to start a new history.
+    """
+
+    def __init__(self, path: tp.Union[str, pathlib.Path], fsync_interval: float = 5.0) -> None:
+        self._file = open(path, "a")
+        self._fsync_interval = fsync_interval
+        self._last_fsync = time.monotonic()
+        self._lock = threading.Lock()
+
+    def write(self, group: str, sender: str, entry: tp.Dict) -> None:
+        line = json.dumps(dict(entry, group=group, **{"from": sender})) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            if time.monotonic() - self._last_fsync >= self._fsync_interval:
+                os.fsync(self._file.fileno())
+                self._last_fsync = time.monotonic()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
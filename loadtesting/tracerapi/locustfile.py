@@ -1,34 +1,52 @@
 import enum
 import functools
-import json
 import logging
 import math
 import os
 import pathlib
 import random
 import sys
-import time
 import typing as tp
-import uuid
 from dataclasses import dataclass
 
 import gevent
 import requests
 import web3
 from locust import User, TaskSet, task, events, tag
-
-from loadtesting.proxy.common import env
+from locust.exception import RescheduleTask
+
+from loadtesting.proxy.common import env, stats
+from loadtesting.tracerapi.checker import ResponseChecker
+from loadtesting.tracerapi.history import (
+    AgeSampler,
+    HistoryGroup,
+    HistoryRecord,
+    TransactionHistory,
+    parse_age_buckets,
+)
 from utils import apiclient
 from utils.web3client import NeonChainWeb3Client
 
 LOG = logging.getLogger("neon_client")
 
 # where save dumped data
-DUMPED_DATA = "dumped_data/transaction.json"
+DUMPED_DATA = "dumped_data/transaction.jsonl"
+
+# dump of older preparation stage
+LEGACY_DUMPED_DATA = "dumped_data/transaction.json"
+
+# dumped data converted to columns, it's made on the first run
+HISTORY_DATA = "dumped_data/transaction.history"
 
 # url for history endpoint proxy
 NEON_RPC = os.environ.get("NEON_TRACING_URL", "")
 
+# topic of ERC20 transfers made by the preparation stage
+TRANSFER_TOPIC = web3.Web3.keccak(text="Transfer(address,address,uint256)").hex()
+
+LOGS_FILTERS = ["address", "address+topic", "topic", "none"]
+"""eth_getLogs filters from the most to the least selective"""
+
 
 class RPCType(enum.Enum):
     logs = ["eth_getLogs"]
@@ -36,6 +54,7 @@ class RPCType(enum.Enum):
     transfer = ["eth_getBalance", "eth_getTransactionCount"]
 
     @classmethod
+    @functools.lru_cache()
     def get(cls, key: str) -> str:
         return list(
             filter(lambda i: i if key in i.value else None,
@@ -46,7 +65,7 @@ class RPCType(enum.Enum):
 @dataclass
 class GlobalEnv:
     rpc_url: str = ""
-    transaction_history: tp.Dict = None
+    transaction_history: tp.Optional[TransactionHistory] = None
 
 
 @events.test_start.add_listener
@@ -55,60 +74,93 @@ def make_env_preparation(environment, **kwargs):
     environment.shared = global_env
 
 
+@events.init_command_line_parser.add_listener
+def parse_history_arguments(parser):
+    parser.add_argument(
+        "--history-follow",
+        type=float,
+        env_var="NEON_HISTORY_FOLLOW",
+        default=0,
+        include_in_web_ui=False,
+        help=f"Read records appended to `{DUMPED_DATA}` every N seconds, so the test can run while "
+        "the preparation stage keeps going (0 disables)",
+    )
+    parser.add_argument(
+        "--history-age",
+        type=str,
+        env_var="NEON_HISTORY_AGE",
+        default="uniform",
+        include_in_web_ui=False,
+        help="How old blocks of requested transactions are: uniform, recent:BLOCKS (not older than BLOCKS), "
+        "zipf:S (newer ones more often) or buckets (every --history-age-buckets bucket equally)",
+    )
+    parser.add_argument(
+        "--history-age-buckets",
+        type=str,
+        default="1000,100000,1000000",
+        include_in_web_ui=False,
+        help="Boundaries of block age buckets (in blocks from the head) which requests are reported by",
+    )
+
+
+@events.init_command_line_parser.add_listener
+def parse_logs_arguments(parser):
+    parser.add_argument(
+        "--logs-range-widths",
+        type=str,
+        default="1,10,100,1000",
+        include_in_web_ui=False,
+        help="Widths of eth_getLogs block ranges, every range query takes one of them, ranges end at "
+        "the block of a logs history record",
+    )
+    parser.add_argument(
+        "--logs-filters",
+        type=str,
+        default=",".join(LOGS_FILTERS),
+        include_in_web_ui=False,
+        help=f"Filters of eth_getLogs range queries, every query takes one of them: {', '.join(LOGS_FILTERS)}",
+    )
+
+
+def follow_transaction_history(history: TransactionHistory, path: pathlib.Path, offset: int, interval: float) -> None:
+    while True:
+        gevent.sleep(interval)
+        offset = history.read_jsonl(path, offset)
+
+
 @events.test_start.add_listener
 def load_transaction_history(environment, **kwargs):
     # load transaction history
-    path = pathlib.Path(__file__).parent / DUMPED_DATA
-    if path.exists():
-        with open(path, "r") as fp:
-            environment.shared.transaction_history = json.load(fp)
-
-
-class LocustEventHandler(object):
-    """Implements custom Locust events handler"""
-
-    def __init__(self, request_event: "EventHook") -> None:
-        self.buffer: tp.Dict[str, tp.Any] = dict()
-        self._request_event = request_event
-
-    def init_event(
-        self,
-        task_id: str,
-        request_type: str,
-        task_name: tp.Optional[str] = "",
-        start_time: tp.Optional[float] = None,
-    ) -> None:
-        """Added data to buffer"""
-        params = dict(
-            name=task_name,
-            start_time=start_time or time.time(),
-            request_type=request_type,
-            start_perf_counter=time.perf_counter(),
-        )
-        self.buffer[task_id] = params
-        LOG.debug("- buffer - %s" % self.buffer)
-
-    def fire_event(self, task_id: str, **kwargs) -> None:
-        """Sends event to locust ."""
-        event = self.buffer.pop(task_id)
-        total_time = (time.perf_counter() - event["start_perf_counter"]) * 1000
-        request_meta = dict(
-            name=event["name"],
-            request_type=event["request_type"],
-            response=event.get("response"),
-            response_time=total_time,
-            response_length=event.get("response_length", 0),
-            exception=event.get("exception"),
-            context={},
-        )
-        self._request_event.fire(**request_meta)
-        LOG.debug(
-            "- %s : %s - %sms"
-            % (event["request_type"], event["event_type"], total_time)
+    base_path = pathlib.Path(__file__).parent
+    path, history_path = base_path / DUMPED_DATA, base_path / HISTORY_DATA
+    follow_interval = environment.parsed_options.history_follow if environment.parsed_options else 0
+    if path.exists() and follow_interval:
+        # records are added in memory as they are written
+        history = TransactionHistory()
+        offset = history.read_jsonl(path)
+        environment.history_follower = gevent.spawn(
+            follow_transaction_history, history, path, offset, follow_interval
         )
+        environment.shared.transaction_history = history
+        return
+    if not path.exists():
+        path = base_path / LEGACY_DUMPED_DATA
+    if path.exists() and (not history_path.exists() or history_path.stat().st_mtime < path.stat().st_mtime):
+        LOG.info(f"Convert `{path.name}` to `{HISTORY_DATA}`")
+        if path.suffix == ".jsonl":
+            TransactionHistory.from_jsonl(path).save(history_path)
+        else:
+            TransactionHistory.from_json(path).save(history_path)
+    if history_path.exists():
+        environment.shared.transaction_history = TransactionHistory.open(history_path)
 
 
-locust_events_handler = LocustEventHandler(events.request)
+@events.test_stop.add_listener
+def stop_following_transaction_history(environment, **kwargs):
+    follower = getattr(environment, "history_follower", None)
+    if follower is not None:
+        follower.kill()
+        environment.history_follower = None
 
 
 def statistics_collector(func: tp.Callable) -> tp.Callable:
@@ -116,31 +168,21 @@ def statistics_collector(func: tp.Callable) -> tp.Callable:
 
     @functools.wraps(func)
     def wrap(*args, **kwargs) -> tp.Any:
-        task_id = str(uuid.uuid4())
         request_type = f"`{args[1].rsplit('_')[1]}`"
-        event: tp.Dict[str, tp.Any] = dict(
-            task_id=task_id,
-            request_type=request_type,
-            task_name=f"[{kwargs.pop('req_type')}]",
-        )
-        locust_events_handler.init_event(**event)
+        name = f"[{kwargs.pop('req_type')}]"
+        age = kwargs.pop("age", "")
+        if age:
+            name = f"{name} {age}"
         response = None
         try:
-            response = func(*args, **kwargs)
-            if "error" in response:
-                raise web3.exceptions.ValidationError(response["error"])
-            event = dict(
-                response=response,
-                response_length=sys.getsizeof(response),
-                event_type="success",
-            )
+            with stats.RequestTimer(request_type, name) as timer:
+                response = timer.response = func(*args, **kwargs)
+                if "error" in response:
+                    raise web3.exceptions.ValidationError(response["error"])
         except Exception as err:
-            event = dict(event_type="failure", exception=err)
             LOG.error(
                 f"Web3 RPC call {request_type} is failed: {err} passed args: `{args}`, passed kwargs: `{kwargs}`"
             )
-        locust_events_handler.buffer[task_id].update(event)
-        locust_events_handler.fire_event(task_id)
         return response
 
     return wrap
@@ -156,12 +198,17 @@ class ExtJsonRPCSession(apiclient.JsonRPCSession):
         )
         self.mount("http://", adapter)
         self.mount("https://", adapter)
+        stats.track_response_size(self)
 
     @statistics_collector
     def send_rpc(self, *args, **kwargs) -> tp.Dict:
         """Extended `send_rpc` for statistics collection"""
         return super(ExtJsonRPCSession, self).send_rpc(*args, **kwargs)
 
+    def send_rpc_unmeasured(self, *args, **kwargs) -> tp.Dict:
+        """`send_rpc` for callers which report statistics by themselves"""
+        return super(ExtJsonRPCSession, self).send_rpc(*args, **kwargs)
+
 
 class BaseEthRPCATasksSet(TaskSet):
 
@@ -180,7 +227,11 @@ class BaseEthRPCATasksSet(TaskSet):
     """
 
     _rpc_client: tp.Optional[ExtJsonRPCSession] = None
-    _transaction_history: tp.Optional[tp.Dict] = None
+    _transaction_history: tp.Optional[TransactionHistory] = None
+    _age_sampler: tp.Optional[AgeSampler] = None
+    _checker: tp.Optional[ResponseChecker] = None
+    _check_client: tp.Optional[NeonChainWeb3Client] = None
+    """Client of checks, they don't take connections of measured requests"""
     credentials: tp.Optional[tp.Dict] = None
 
     @staticmethod
@@ -198,6 +249,20 @@ class BaseEthRPCATasksSet(TaskSet):
             sys.exit(1)
         BaseEthRPCATasksSet._transaction_history = history_data
         environment.shared.rpc_endpoint = rpc_endpoint
+        try:
+            head_block = int(apiclient.JsonRPCSession(rpc_endpoint).send_rpc("eth_blockNumber")["result"], 16)
+        except Exception as err:
+            LOG.warning(f"Can't get the head block, ages are counted from the newest transaction: {err}")
+            head_block = None
+        BaseEthRPCATasksSet._age_sampler = AgeSampler(
+            environment.parsed_options.history_age,
+            parse_age_buckets(environment.parsed_options.history_age_buckets),
+            head_block,
+        )
+        BaseEthRPCATasksSet._checker = ResponseChecker(
+            environment.parsed_options.check_rate, environment.parsed_options.check_concurrency
+        )
+        BaseEthRPCATasksSet._check_client = NeonChainWeb3Client(environment.credentials["proxy_url"])
 
     def on_start(self) -> None:
         """on_start is called when a Locust start before any task is scheduled"""
@@ -221,13 +286,22 @@ class BaseEthRPCATasksSet(TaskSet):
         )
         self.log = logging.getLogger("rpc-consumer[%s]" % self.rpc_consumer_id)
 
-    def _get_random_transaction(self, key: str) -> tp.Dict:
-        """Return random transaction details from transaction history"""
-        transactions = self._transaction_history[RPCType.get(key)]
-        key = random.choice(list(transactions.keys()))
-        params = random.choice(transactions[key])
-        params["from"] = key
-        return params
+    def _group(self, key: str) -> HistoryGroup:
+        """History group of the method, the task is skipped until a followed history gets its records"""
+        name = RPCType.get(key)
+        group = self._transaction_history.groups.get(name)
+        if group:
+            return group
+        follow_interval = self.user.environment.parsed_options.history_follow
+        if not follow_interval:
+            self.log.warning(f"No `{name}` transactions in the history, {key} isn't requested")
+            self.interrupt(reschedule=False)
+        gevent.sleep(follow_interval)
+        raise RescheduleTask()
+
+    def _get_random_transaction(self, key: str) -> tp.Tuple[HistoryRecord, str]:
+        """Return random transaction details from transaction history and its block age bucket"""
+        return self._age_sampler.sample(self._group(key))
 
     def _do_call(
         self,
@@ -236,26 +310,24 @@ class BaseEthRPCATasksSet(TaskSet):
         args: tp.Optional[tp.List] = None,
         kwargs: tp.Optional[tp.Dict] = None,
     ) -> tp.Dict:
-        transaction = self._get_random_transaction(method)
+        transaction, age = self._get_random_transaction(method)
         if not args:
             args = []
         elif not isinstance(args, list):
             args = [args]
 
         kwargs = kwargs or {}
-        kwargs.update({req_type: transaction[req_type]})
+        kwargs.update({req_type: transaction.block(req_type)})
         args.append(kwargs)
 
         if method == 'eth_getTransactionCount':
-            args.insert(0, transaction["from"])
+            args.insert(0, transaction.sender)
         else:
-            args.insert(0, transaction["to"])
+            args.insert(0, transaction.to)
 
         response = self._rpc_client.send_rpc(
-            method, req_type=req_type, params=args)
-        self.log.info(
-            f"Call {method}, get data by `{req_type}`: {transaction[req_type]}. Response: {response}"
-        )
+            method, req_type=req_type, age=age, params=args)
+        self.log.debug("Call %s, get data by `%s`: %s. Response: %s", method, req_type, args, response)
         return response, transaction
 
 
@@ -263,23 +335,22 @@ class BaseEthRPCATasksSet(TaskSet):
 class EthGetBalanceTasksSet(BaseEthRPCATasksSet):
     """task set measures the maximum request rate for the eth_getBalance method"""
 
+    def check_balance(self, response: tp.Dict, tx: HistoryRecord) -> None:
+        response_balance = float.fromhex(response['result']) / 1e18
+        if tx.type == 'neon':
+            expected_balance = tx.recipient_balance_after
+        else:
+            expected_balance = float(self._check_client.get_balance(web3.Web3.to_checksum_address(tx.to)))
+        assert math.isclose(
+            abs(round(response_balance - expected_balance, 3)), 0.0, rel_tol=1e-3)
+
     @tag("getBalance_by_hash")
     @task
     def task_eth_get_balance_by_hash(self) -> tp.Dict:
         """the eth_getBalance method by blockHash"""
         response, tx = self._do_call(method="eth_getBalance",
                                      req_type="blockHash")
-        expected_balance = float(
-            tx['additional_info']['recipient_balance_after'])
-        response_balance = float.fromhex(response['result']) / 1e18
-
-        if tx['additional_info']['type'] == 'neon':
-            assert math.isclose(
-                abs(round(response_balance - expected_balance, 3)), 0.0, rel_tol=1e-3)
-        else:
-            current_balance = self.web3_client.get_balance(tx['to'])
-            assert math.isclose(
-                abs(round(response_balance - current_balance, 3)), 0.0, rel_tol=1e-3)
+        self._checker.submit("eth_getBalance", self.check_balance, response, tx)
 
     @tag("getBalance_by_num")
     @task
@@ -287,31 +358,24 @@ class EthGetBalanceTasksSet(BaseEthRPCATasksSet):
         """the eth_getBalance method by blockNumber"""
         response, tx = self._do_call(method="eth_getBalance",
                                      req_type="blockNumber")
-        expected_balance = float(
-            tx['additional_info']['recipient_balance_after'])
-        response_balance = float.fromhex(response['result']) / 1e18
-
-        if tx['additional_info']['type'] == 'neon':
-            assert math.isclose(
-                abs(round(response_balance - expected_balance, 3)), 0.0, rel_tol=1e-3)
-        else:
-            current_balance = self.web3_client.get_balance(tx['to'])
-            assert math.isclose(
-                abs(round(response_balance - current_balance, 3)), 0.0, rel_tol=1e-3)
+        self._checker.submit("eth_getBalance", self.check_balance, response, tx)
 
 
 @tag("getTransactionCount")
 class EthGetTransactionCountTasksSet(BaseEthRPCATasksSet):
     """task set measures the maximum request rate for the eth_getTransactionCount method"""
 
+    @staticmethod
+    def check_nonce(response: tp.Dict, tx: HistoryRecord) -> None:
+        assert int(response['result'], 16) == tx.sender_nonce
+
     @tag("getTransactionCount_by_hash")
     @task
     def task_eth_get_transaction_count_by_hash(self) -> tp.Dict:
         """the eth_getTransactionCount method by blockHash"""
         response, tx = self._do_call(method="eth_getTransactionCount",
                                      req_type="blockHash")
-        assert int(response['result'], 16) == int(
-            tx['additional_info']['sender_nonce'])
+        self._checker.submit("eth_getTransactionCount", self.check_nonce, response, tx)
 
     @tag("getTransactionCount_by_num")
     @task
@@ -319,14 +383,17 @@ class EthGetTransactionCountTasksSet(BaseEthRPCATasksSet):
         """the eth_getTransactionCount method by blockNumber"""
         response, tx = self._do_call(method="eth_getTransactionCount",
                                      req_type="blockNumber")
-        assert int(response['result'], 16) == int(
-            tx['additional_info']['sender_nonce'])
+        self._checker.submit("eth_getTransactionCount", self.check_nonce, response, tx)
 
 
 @tag("getStorageAt")
 class EthGetStorageAtTasksSet(BaseEthRPCATasksSet):
     """task set measures the maximum request rate for the eth_getStorageAt method"""
 
+    @staticmethod
+    def check_storage(response: tp.Dict) -> None:
+        assert response['result'] != '0x0'
+
     @tag("getStorageAt_by_hash")
     @task
     def task_eth_get_storage_at_by_hash(self) -> tp.Dict:
@@ -334,7 +401,7 @@ class EthGetStorageAtTasksSet(BaseEthRPCATasksSet):
         response, _ = self._do_call(method="eth_getStorageAt",
                                     req_type="blockHash",
                                     args="0x0")
-        assert response['result'] != '0x0'
+        self._checker.submit("eth_getStorageAt", self.check_storage, response)
 
     @tag("getStorageAt_by_num")
     @task
@@ -343,45 +410,57 @@ class EthGetStorageAtTasksSet(BaseEthRPCATasksSet):
         response, _ = self._do_call(method="eth_getStorageAt",
                                     req_type="blockNumber",
                                     args="0x0")
-        assert response['result'] != '0x0'
+        self._checker.submit("eth_getStorageAt", self.check_storage, response)
 
 
 @tag("getLogs")
 class EthGetLogs(BaseEthRPCATasksSet):
     """task set measures the maximum request rate for the eth_getLogs method"""
 
+    range_widths: tp.List[int] = []
+    logs_filters: tp.List[str] = []
+
+    def on_start(self) -> None:
+        """on_start is called when a Locust start before any task is scheduled"""
+        super(EthGetLogs, self).on_start()
+        options = self.user.environment.parsed_options
+        self.range_widths = [int(width) for width in options.logs_range_widths.split(",")]
+        self.logs_filters = options.logs_filters.split(",")
+        unknown = set(self.logs_filters) - set(LOGS_FILTERS)
+        if unknown:
+            raise ValueError(f"Unknown eth_getLogs filters {unknown}, use {LOGS_FILTERS}")
+
     @staticmethod
-    def assert_results(req_type: str, transaction: tp.Dict, response: tp.List) -> None:
+    def assert_results(response: tp.Dict, req_type: str, transaction: HistoryRecord) -> None:
         """Check response result"""
+        response = response["result"]
         if req_type == "blockNumber":
-            assert transaction[req_type].lower() == response[0][req_type]
+            assert transaction.block(req_type) == response[0][req_type]
         if req_type == "blockHash":
             any_result = [
-                transaction[req_type].lower() == r[req_type] for r in response
+                transaction.block(req_type) == r[req_type] for r in response
             ]
             assert any(
                 any_result
             ), f"Block hash problem {any_result}, response: {response}"
         assert all(
-            transaction["contract"]["address"].lower() == r["address"] for r in response
+            transaction.contract["address"].lower() == r["address"] for r in response
         )
 
     def _do_call(self, method: str, req_type: str) -> tp.Dict:
-        transaction = self._get_random_transaction(method)
-        filter_obj = {"address": transaction["contract"]["address"]}
+        transaction, age = self._get_random_transaction(method)
+        filter_obj = {"address": transaction.contract["address"]}
         if req_type == "blockNumber":
-            block = transaction[req_type]
+            block = transaction.block(req_type)
             kwargs = {"toBlock": block, "fromBlock": block}
         else:
-            kwargs = {"blockhash": transaction[req_type]}
+            kwargs = {"blockhash": transaction.block(req_type)}
         filter_obj.update(kwargs)
         response = self._rpc_client.send_rpc(
-            method, req_type=req_type, params=[filter_obj]
-        )
-        self.log.info(
-            f"Call {method}, get data by `{req_type}`: {transaction[req_type]}. Response: {response}"
+            method, req_type=req_type, age=age, params=[filter_obj]
         )
-        self.assert_results(req_type, transaction, response["result"])
+        self.log.debug("Call %s, get data by `%s`: %s. Response: %s", method, req_type, filter_obj, response)
+        self._checker.submit(method, self.assert_results, response, req_type, transaction)
         return response
 
     @tag("getLogs_by_hash")
@@ -396,6 +475,52 @@ class EthGetLogs(BaseEthRPCATasksSet):
         """the eth_getLogs method by blockNumber"""
         self._do_call(method="eth_getLogs", req_type="blockNumber")
 
+    @staticmethod
+    def matched_bucket(count: int) -> str:
+        """Decimal order of the number of matched logs: logs 0, logs 1-9, logs 10-99..."""
+        if count == 0:
+            return "logs 0"
+        low = 10 ** (len(str(count)) - 1)
+        return f"logs {low}-{low * 10 - 1}"
+
+    @staticmethod
+    def check_range(response: tp.Dict, filter_obj: tp.Dict) -> None:
+        for log in response["result"]:
+            assert int(filter_obj["fromBlock"], 16) <= int(log["blockNumber"], 16) <= int(filter_obj["toBlock"], 16)
+            if "address" in filter_obj:
+                assert log["address"] == filter_obj["address"].lower(), f"Wrong log address: {log}"
+            if "topics" in filter_obj:
+                assert log["topics"][0] == TRANSFER_TOPIC, f"Wrong log topic: {log}"
+
+    @tag("getLogs_range")
+    @task
+    def task_eth_get_logs_range(self) -> tp.Dict:
+        """the eth_getLogs method by block range, reported by range width, filter and number of matched logs"""
+        transaction, age = self._get_random_transaction("eth_getLogs")
+        width = random.choice(self.range_widths)
+        logs_filter = random.choice(self.logs_filters)
+        filter_obj = {
+            "fromBlock": hex(max(transaction.block_number - width + 1, 0)),
+            "toBlock": hex(transaction.block_number),
+        }
+        if "address" in logs_filter:
+            filter_obj["address"] = transaction.contract["address"]
+        if "topic" in logs_filter:
+            filter_obj["topics"] = [TRANSFER_TOPIC]
+        name = f"[range {width}] {logs_filter}"
+        response = None
+        try:
+            with stats.RequestTimer("`getLogs`", name) as timer:
+                response = timer.response = self._rpc_client.send_rpc_unmeasured("eth_getLogs", params=[filter_obj])
+                if "error" in response:
+                    raise web3.exceptions.ValidationError(response["error"])
+                # latency is reported against the number of matched logs, their size is the response length
+                timer.name = f"{name} {self.matched_bucket(len(response['result']))}"
+        except Exception as err:
+            LOG.error(f"Web3 RPC call eth_getLogs is failed: {err}, filter: {filter_obj}, block age: {age}")
+        self._checker.submit("eth_getLogs", self.check_range, response, filter_obj)
+        return response
+
 
 @tag("call")
 class EthCall(BaseEthRPCATasksSet):
@@ -404,15 +529,16 @@ class EthCall(BaseEthRPCATasksSet):
     _deploy_contract_locker = gevent.threading.Lock()
     _deploy_contract_done = False
     _contract: tp.Optional["web3._utils.datatypes.Contract"] = None
+    _call_data: tp.Optional[str] = None
     method = "eth_call"
 
     def deploy_contract(self):
         """Deploy once for all spawned users"""
         EthCall._deploy_contract_done = True
-        transaction = self._get_random_transaction(self.method)
+        transaction, _ = self._get_random_transaction(self.method)
         contract = self.web3_client.eth.contract(
-            address=transaction["contract"]["address"],
-            abi=transaction["contract"]["abi"],
+            address=transaction.contract["address"],
+            abi=transaction.contract["abi"],
         )
         self.log.info(f"Contract deployed {contract}.")
         if not contract:
@@ -420,61 +546,56 @@ class EthCall(BaseEthRPCATasksSet):
             EthCall._deploy_contract_done = False
             return
         EthCall._contract = contract
+        EthCall._call_data = contract.encodeABI(fn_name="retrieve")
 
     def on_start(self) -> None:
         """on_start is called when a Locust start before any task is scheduled"""
         super(EthCall, self).on_start()
-        # setup class once
+        if self._transaction_history.groups.get(RPCType.get(self.method)):
+            self._deploy_once()
+
+    def _deploy_once(self) -> None:
+        """setup class once, a followed history may get the contract after users are started"""
         with self._deploy_contract_locker:
             if not EthCall._deploy_contract_done:
                 self.deploy_contract()
 
     def _do_call(self, method: str, req_type: str) -> None:
-        """Store random int to contract"""
-        self.log.info(
-            f"Call `retrieve` method from {self._contract.address} contract by `{method}`."
-        )
-        transaction = self._get_random_transaction(self.method)
-        tx = self._contract.functions.retrieve().build_transaction(
-            {
-                "nonce": self.web3_client.eth.get_transaction_count(
-                    transaction["from"]
-                ),
-                "gasPrice": self.web3_client.gas_price(),
-            }
-        )
-
+        """Call `retrieve` of the contract, the call data is encoded once for all calls"""
+        transaction, age = self._get_random_transaction(self.method)
+        if not EthCall._deploy_contract_done:
+            self._deploy_once()
         tx_call_obj = {
-            "from": transaction["from"],
-            "to": transaction["to"],
-            "value": hex(tx["value"]),
-            "gas": hex(tx["gas"]),
-            "gasPrice": hex(tx["gasPrice"]),
-            "data": tx["data"],
+            "from": transaction.sender,
+            "to": transaction.to,
+            "data": self._call_data,
         }
         response = self._rpc_client.send_rpc(
             method,
             req_type=req_type,
-            params=[tx_call_obj, {req_type: transaction[req_type]}],
-        )
-        self.log.info(
-            f"Call {method}, get data by `{req_type}`: {transaction[req_type]}. Response: {response}"
+            age=age,
+            params=[tx_call_obj, {req_type: transaction.block(req_type)}],
         )
+        self.log.debug("Call %s, get data by `%s`: %s. Response: %s", method, req_type, tx_call_obj, response)
         return response
 
+    @staticmethod
+    def check_call(response: tp.Dict) -> None:
+        assert response['result'] != '0x0'
+
     @tag("call_by_hash")
     @task
     def task_eth_call_by_hash(self) -> tp.Dict:
         """the eth_call method by blockHash"""
         response = self._do_call(method="eth_call", req_type="blockHash")
-        assert response['result'] != '0x0'
+        self._checker.submit("eth_call", self.check_call, response)
 
     @tag("call_by_num")
     @task
     def task_eth_call_by_num(self) -> tp.Dict:
         """the eth_call method by blockNumber"""
         response = self._do_call(method="eth_call", req_type="blockNumber")
-        assert response['result'] != '0x0'
+        self._checker.submit("eth_call", self.check_call, response)
 
 
 class EthRPCAPICallUsers(User):
@@ -484,6 +605,12 @@ class EthRPCAPICallUsers(User):
         EthGetBalanceTasksSet: 1,
         EthGetTransactionCountTasksSet: 1,
         EthGetStorageAtTasksSet: 1,
-        # EthGetLogs: 1,
+        EthGetLogs: 1,
         EthCall: 1,
     }
+
+
+@events.test_stop.add_listener
+def stop_response_checker(environment, **kwargs):
+    if BaseEthRPCATasksSet._checker is not None:
+        BaseEthRPCATasksSet._checker.stop()
@@ -1,6 +1,4 @@
-import collections
 import functools
-import json
 import logging
 import pathlib
 import random
@@ -10,19 +8,23 @@ import gevent
 import web3
 from locust import User, between, events, tag, task
 from loadtesting.proxy import locustfile as head
+from loadtesting.tracerapi.history import HistoryWriter
 
 RETRIEVE_STORE_VERSION = "0.8.10"
 """RetrieveStore contract version
 """
 
-DEFAULT_DUMP_FILE = "dumped_data/transaction.json"
+BIG_DEPLOY_VERSION = "0.8.16"
+"""BigDeploy contract version, its constructor deploys nested contracts
+"""
+
+DEFAULT_DUMP_FILE = "dumped_data/transaction.jsonl"
 """Default file name for transaction history
 """
 
-transaction_history = collections.defaultdict(
-    functools.partial(collections.defaultdict, list)
-)
-"""Transactions storage {account: [{blockNumber, blockHash, contractAddress},]}
+history_writer: tp.Optional[HistoryWriter] = None
+"""Appends {group, from, transactionHash, blockNumber, blockHash, contract, to, input, value, additional_info}
+records as transactions complete
 """
 
 LOG = logging.getLogger("neon_client")
@@ -36,13 +38,20 @@ def dump_history(attr) -> tp.Callable:
         @functools.wraps(func)
         def wrapper(self, *args, **kwargs) -> tp.Any:
             tx, info = func(self, *args, **kwargs)
-            if tx:
-                transaction_history[attr][str(tx["from"])].append(
+            if tx and history_writer is not None:
+                # receipt has no input and value, debug_traceCall repeats the transaction by them
+                transaction = self.web3_client.get_transaction_by_hash(tx["transactionHash"]) or {}
+                history_writer.write(
+                    attr,
+                    str(tx["from"]),
                     {
+                        "transactionHash": tx["transactionHash"].hex(),
                         "blockHash": tx["blockHash"].hex(),
                         "blockNumber": hex(tx["blockNumber"]),
                         "contract": tx.get("contract", ""),
                         "to": str(tx["to"]),
+                        "input": web3.Web3.to_hex(transaction.get("input", b"")),
+                        "value": hex(transaction.get("value", 0)),
                         "additional_info": info,
                     }
                 )
@@ -53,16 +62,23 @@ def dump_history(attr) -> tp.Callable:
     return ext_runner
 
 
+@events.test_start.add_listener
+def open_history(*args, **kwargs) -> None:
+    """Test start event handler"""
+    global history_writer
+    dumped_path = pathlib.Path(__file__).parent.parent / DEFAULT_DUMP_FILE
+    dumped_path.parents[0].mkdir(parents=True, exist_ok=True)
+    LOG.info(f"Dump transaction history to `{dumped_path.as_posix()}`")
+    history_writer = HistoryWriter(dumped_path)
+
+
 @events.test_stop.add_listener
 def teardown(*args, **kwargs) -> None:
     """Test stop event handler"""
-    if transaction_history:
-        dumped_path = pathlib.Path(__file__).parent.parent / DEFAULT_DUMP_FILE
-        dumped_path.parents[0].mkdir(parents=True, exist_ok=True)
-        with open(dumped_path, "w") as fp:
-            LOG.info(
-                f"Dumped transaction history to `{dumped_path.as_posix()}`")
-            json.dump(transaction_history, fp=fp, indent=4, sort_keys=True)
+    global history_writer
+    if history_writer is not None:
+        history_writer.close()
+        history_writer = None
 
 
 @tag("store")
@@ -115,9 +131,6 @@ class EthGetStorageAtPreparationStage(head.NeonTasksSet):
             )
             tx = contract.functions.store(data).build_transaction(
                 {
-                    "nonce": self.web3_client.eth.get_transaction_count(
-                        self.account.address
-                    ),
                     "gasPrice": self.web3_client.gas_price(),
                 }
             )
@@ -228,6 +241,33 @@ class ERC20WrappedPreparationStage(head.ERC20SPLTasksSet):
         return self.send_erc20spl()
 
 
+@tag("deploy")
+class BigDeployPreparationStage(head.NeonTasksSet):
+    """Deploy big nested contracts, the heaviest transactions for debug_trace* methods"""
+
+    wait_time = between(0.5, 2)
+
+    def get_account(self):
+        return super(BigDeployPreparationStage, self).create_account()
+
+    @task
+    @dump_history("deploy")
+    def prepare_data_by_big_deploy(
+        self,
+    ) -> tp.Union[None, web3.datastructures.AttributeDict]:
+        """Deploy BigDeploy.sol, its constructor deploys 10 contracts with big storage"""
+        self.check_balance()
+        contract, receipt = self.deploy_contract(
+            "common/BigDeploy.sol", BIG_DEPLOY_VERSION, self.account, contract_name="Contract1"
+        )
+        if not contract:
+            self.log.error("`BigDeploy` contract deployment failed.")
+            return None, {}
+        self.log.info(f"`BigDeploy` contract deployed: {receipt['contractAddress']}")
+        # deployment has no recipient, the new contract is recorded instead
+        return dict(receipt, to=receipt["contractAddress"]), {"type": "deploy"}
+
+
 @tag("prepare")
 class TracerAPIPreparationUser(User):
     """Preparation stage for TracerAPI"""
@@ -237,4 +277,5 @@ class TracerAPIPreparationUser(User):
         EthGetStorageAtPreparationStage: 1,
         NeonTransferPreparationStage: 1,
         ERC20TransferPreparationStage: 1,
+        BigDeployPreparationStage: 1,
     }
@@ -1,3 +1,4 @@
+import asyncio
 import itertools
 import json
 import pathlib
@@ -6,6 +7,7 @@ from concurrent.futures import ThreadPoolExecutor
 
 from solana.transaction import Signature
 
+from utils.async_web3client import AsyncNeonChainWeb3Client
 from utils.web3client import NeonChainWeb3Client
 from utils.solana_client import SolanaClient
 
@@ -34,13 +36,18 @@ def load_transactions_list():
     return txs
 
 
-def check_neon_tx(tx, web3_client: NeonChainWeb3Client):
-    try:
-        web3_client._web3.eth.get_transaction_receipt(tx)
-        return True
-    except Exception as e:
-        print(f"TX: {tx} is not found")
-        return False
+async def check_neon_txs(txs, proxy_url):
+    async with AsyncNeonChainWeb3Client(proxy_url) as web3_client:
+
+        async def check(tx):
+            try:
+                await web3_client.eth.get_transaction_receipt(tx)
+                return True
+            except Exception as e:
+                print(f"TX: {tx} is not found: {e}")
+                return False
+
+        return await asyncio.gather(*[check(tx) for tx in txs])
 
 
 def check_sol_tx(tx, solana_client: SolanaClient):
@@ -58,10 +65,9 @@ def run():
     success_sol = 0
 
     print("Start check NEON txs")
-    with ThreadPoolExecutor(10) as executor:
-        for res in executor.map(check_neon_tx, txs.keys(), [w3]*len(txs)):
-            if res is True:
-                success_neon += 1
+    for res in asyncio.run(check_neon_txs(list(txs.keys()), load_creds(NETWORK_NAME)["proxy_url"])):
+        if res is True:
+            success_neon += 1
 
     sol_txs = list(itertools.chain(*txs.values()))
     print("Start check Solana txs")
@@ -0,0 +1,194 @@
+import base64
+import fcntl
+import hashlib
+import json
+import logging
+import math
+import os
+import pathlib
+import threading
+import time
+import typing as tp
+from contextlib import contextmanager
+from decimal import Decimal
+
+import eth_account
+import eth_account.signers.local
+from cryptography.fernet import Fernet, InvalidToken
+
+from utils.provisioning import AccountProvisioner
+
+LOG = logging.getLogger(__name__)
+
+STORE_DIR = pathlib.Path(
+    os.environ.get("ACCOUNT_POOL_DIR", pathlib.Path.home() / ".cache" / "neon-tests" / "accounts")
+)
+
+PASSWORD_ENV = "ACCOUNT_POOL_PASSWORD"
+"""The pool is used only when the store password is set"""
+
+
+def is_enabled() -> bool:
+    return bool(os.environ.get(PASSWORD_ENV))
+
+
+class AccountStore:
+    """Funded keys of one network in a file encrypted by the password
+
+    All changes are made under an exclusive file lock, so pytest-xdist workers and
+    Locust processes can share one store.
+    """
+
+    def __init__(self, network: str, password: str, store_dir: pathlib.Path = STORE_DIR):
+        self.path = store_dir / f"{network}.store"
+        salt = hashlib.sha256(f"neon-tests:{network}".encode()).digest()
+        key = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, 200_000)
+        self._fernet = Fernet(base64.urlsafe_b64encode(key))
+
+    def _read(self) -> tp.Dict[str, tp.Dict]:
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            return {}
+        try:
+            return json.loads(self._fernet.decrypt(self.path.read_bytes()))
+        except InvalidToken:
+            raise ValueError(f"Can't decrypt account store {self.path}, check {PASSWORD_ENV}")
+
+    def _write(self, accounts: tp.Dict[str, tp.Dict]) -> None:
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_bytes(self._fernet.encrypt(json.dumps(accounts).encode()))
+        os.replace(tmp_path, self.path)
+
+    @contextmanager
+    def edit(self) -> tp.Iterator[tp.Dict[str, tp.Dict]]:
+        """Locked {address: {"key", "leased_by", "leased_at"}}, changes are saved on exit"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_suffix(".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                accounts = self._read()
+                yield accounts
+                self._write(accounts)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+class AccountPool:
+    """Leases funded accounts which are kept between runs
+
+    Leased accounts are checked by a background thread (a greenlet under Locust) and topped up
+    when their balance falls below min_balance. Leases of dead processes or older than
+    lease_ttl are reclaimed, so accounts of killed runs aren't lost.
+    """
+
+    def __init__(
+        self,
+        network: str,
+        provisioner: AccountProvisioner,
+        web3_client: "utils.web3client.NeonChainWeb3Client",
+        password: tp.Optional[str] = None,
+        min_balance: tp.Union[int, Decimal] = 100,
+        top_up_amount: int = 1000,
+        top_up_interval: float = 30,
+        lease_ttl: float = 6 * 3600,
+    ):
+        self._store = AccountStore(network, password or os.environ[PASSWORD_ENV])
+        self._provisioner = provisioner
+        self._web3_client = web3_client
+        self._min_balance = Decimal(min_balance)
+        self._top_up_amount = top_up_amount
+        self._top_up_interval = top_up_interval
+        self._lease_ttl = lease_ttl
+        self._leased: tp.Dict[str, eth_account.signers.local.LocalAccount] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: tp.Optional[threading.Thread] = None
+
+    def _funding_amount(self, min_balance: Decimal) -> int:
+        # faucet accepts only integer amounts
+        return max(self._top_up_amount, math.ceil(min_balance))
+
+    def _is_free(self, record: tp.Dict) -> bool:
+        if record.get("leased_by") is None:
+            return True
+        if time.time() - record["leased_at"] > self._lease_ttl:
+            return True
+        try:
+            os.kill(record["leased_by"], 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            pass
+        return False
+
+    def lease(
+        self, count: int = 1, min_balance: tp.Optional[tp.Union[int, Decimal]] = None
+    ) -> tp.List[eth_account.signers.local.LocalAccount]:
+        """Take free accounts with at least min_balance NEON, missed ones are created and funded"""
+        min_balance = Decimal(min_balance or self._min_balance)
+        pid, now = os.getpid(), time.time()
+        with self._store.edit() as records:
+            free = [address for address, record in records.items() if self._is_free(record)][:count]
+            for address in free:
+                records[address].update({"leased_by": pid, "leased_at": now})
+        accounts = [eth_account.Account.from_key(records[address]["key"]) for address in free]
+
+        if len(accounts) < count:
+            created = self._provisioner.create_accounts(count - len(accounts), self._funding_amount(min_balance))
+            with self._store.edit() as records:
+                for account in created:
+                    records[account.address] = {"key": account.key.hex(), "leased_by": pid, "leased_at": now}
+            LOG.info(f"{len(created)} accounts added to the pool")
+            accounts.extend(created)
+
+        with self._lock:
+            self._leased.update({account.address: account for account in accounts})
+        self.top_up(accounts, min_balance)
+        self._start()
+        return accounts
+
+    def release(self, accounts: tp.Iterable[eth_account.signers.local.LocalAccount]) -> None:
+        addresses = [account.address for account in accounts]
+        with self._lock:
+            for address in addresses:
+                self._leased.pop(address, None)
+        with self._store.edit() as records:
+            for address in addresses:
+                if address in records:
+                    records[address].update({"leased_by": None, "leased_at": None})
+
+    def close(self) -> None:
+        """Stop top up thread and return all leased accounts"""
+        self._stop.set()
+        with self._lock:
+            leased = list(self._leased.values())
+        self.release(leased)
+
+    def top_up(
+        self,
+        accounts: tp.Sequence[eth_account.signers.local.LocalAccount],
+        min_balance: tp.Optional[Decimal] = None,
+    ) -> None:
+        """Fund accounts with balance below min_balance"""
+        if not accounts:
+            return
+        min_balance = min_balance or self._min_balance
+        balances = self._web3_client.get_balances([account.address for account in accounts])
+        low = [account.address for account, balance in zip(accounts, balances) if balance < min_balance]
+        if low:
+            LOG.info(f"Top up {len(low)} pool accounts")
+            self._provisioner.fund(low, self._funding_amount(min_balance))
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._top_up_interval):
+            with self._lock:
+                leased = list(self._leased.values())
+            try:
+                self.top_up(leased)
+            except Exception as e:
+                LOG.warning(f"Failed to top up pool accounts: {e}")
@@ -4,6 +4,105 @@ import random
 from requests import Session
 
 
+def make_rpc_body(method: str, params: tp.Optional[tp.Any] = None, req_id: int = 0) -> tp.Dict:
+    body = {
+        "jsonrpc": "2.0",
+        "method": method,
+        "id": req_id
+    }
+    if params:
+        if not isinstance(params, (list, tuple)):
+            params = [params]
+        body["params"] = params
+    return body
+
+
+def send_batch_rpc(
+    session: Session,
+    url: str,
+    calls: tp.Sequence[tp.Tuple[str, tp.Optional[tp.Any]]],
+    timeout: int = 60,
+) -> tp.List[tp.Dict]:
+    """Send many (method, params) calls as one JSON-RPC batch request.
+
+    Responses are matched back by id and returned in the same order as calls.
+    """
+    if not calls:
+        return []
+    body = [make_rpc_body(method, params, req_id) for req_id, (method, params) in enumerate(calls)]
+    resp = session.post(url, json=body, timeout=timeout)
+    resp.raise_for_status()
+    return match_batch_responses(resp.json(), len(calls))
+
+
+def match_batch_responses(response_body: tp.Any, count: int) -> tp.List[tp.Dict]:
+    """Responses of a batch of count calls with ids 0..count-1 in the order of calls"""
+    if not isinstance(response_body, list):
+        # proxy can answer with one error object for the whole batch
+        raise AssertionError(f"Batch request must return a list of responses: {response_body}")
+
+    responses = {item.get("id"): item for item in response_body}
+    missed = [req_id for req_id in range(count) if req_id not in responses]
+    if missed:
+        raise AssertionError(f"Batch response doesn't contain responses for ids {missed}: {response_body}")
+    return [responses[req_id] for req_id in range(count)]
+
+
+class BatchResponse:
+    """Placeholder for a call result which is filled after the batch is sent"""
+
+    def __init__(self, method: str, params: tp.Optional[tp.Any] = None):
+        self.method = method
+        self.params = params
+        self._body: tp.Optional[tp.Dict] = None
+
+    @property
+    def body(self) -> tp.Dict:
+        if self._body is None:
+            raise RuntimeError(f"Batch with `{self.method}` call wasn't sent yet")
+        return self._body
+
+    @property
+    def result(self) -> tp.Any:
+        if "error" in self.body:
+            raise ValueError(f"Call `{self.method}` failed: {self.body['error']}")
+        return self.body["result"]
+
+
+class RPCBatch:
+    """Collects JSON-RPC calls to send them as one batch request"""
+
+    def __init__(self, session: Session, url: str, timeout: int = 60):
+        self._session = session
+        self._url = url
+        self._timeout = timeout
+        self._calls: tp.List[BatchResponse] = []
+
+    def __len__(self):
+        return len(self._calls)
+
+    def __enter__(self) -> "RPCBatch":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is None and self._calls:
+            self.send()
+
+    def add(self, method: str, params: tp.Optional[tp.Any] = None) -> BatchResponse:
+        call = BatchResponse(method, params)
+        self._calls.append(call)
+        return call
+
+    def send(self) -> tp.List[tp.Dict]:
+        calls, self._calls = self._calls, []
+        bodies = send_batch_rpc(
+            self._session, self._url, [(c.method, c.params) for c in calls], timeout=self._timeout
+        )
+        for call, body in zip(calls, bodies):
+            call._body = body
+        return bodies
+
+
 class JsonRPCSession(Session):
     def __init__(self, url):
         super(JsonRPCSession, self).__init__()
@@ -11,20 +110,11 @@ class JsonRPCSession(Session):
 
     def send_rpc(self, method: str, params: tp.Optional[tp.Any] = None, req_type: tp.Optional[str] = None,) -> tp.Dict:
         req_id = random.randint(0, 100)
-        body = {
-            "jsonrpc": "2.0",
-            "method": method,
-            "id": req_id
-        }
+        body = make_rpc_body(method, params, req_id)
 
         if req_type is not None:
             body["req_type"] = req_type
 
-        if params:
-            if not isinstance(params, (list, tuple)):
-                params = [params]
-            body["params"] = params
-
         resp = self.post(self.url, json=body, timeout=60)
         response_body = resp.json()
         if "result" not in response_body and "error" not in response_body:
@@ -37,3 +127,14 @@ class JsonRPCSession(Session):
             assert response_body["id"] == req_id
 
         return response_body
+
+    def send_batch(self, calls: tp.Sequence[tp.Tuple[str, tp.Optional[tp.Any]]]) -> tp.List[tp.Dict]:
+        """Send many (method, params) calls in one HTTP request"""
+        responses = send_batch_rpc(self, self.url, calls)
+        for response_body in responses:
+            if "result" not in response_body and "error" not in response_body:
+                raise AssertionError("Request must contains 'result' or 'error' field")
+        return responses
+
+    def batch(self) -> RPCBatch:
+        return RPCBatch(self, self.url)
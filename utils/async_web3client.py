@@ -0,0 +1,207 @@
+import asyncio
+import typing as tp
+from decimal import Decimal
+
+import aiohttp
+import eth_account.signers.local
+import web3
+import web3.types
+
+from utils import helpers
+from utils.apiclient import make_rpc_body, match_batch_responses
+
+
+class AsyncNeonChainWeb3Client:
+    """Asyncio version of NeonChainWeb3Client
+
+    All requests go through one aiohttp session with a shared connection pool,
+    so one process can keep thousands of requests in flight:
+
+        async with AsyncNeonChainWeb3Client(proxy_url) as client:
+            await asyncio.gather(*[client.send_neon(acc, to, 1) for acc in accounts])
+    """
+
+    def __init__(self, proxy_url: str, pool_size: int = 1000, timeout: int = 30):
+        self._proxy_url = proxy_url
+        self._pool_size = pool_size
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._chain_id = None
+        self._session: tp.Optional[aiohttp.ClientSession] = None
+        self._provider = web3.AsyncHTTPProvider(proxy_url, request_kwargs={"timeout": self._timeout})
+        self._web3 = web3.AsyncWeb3(self._provider)
+
+    def __getattr__(self, item):
+        return getattr(self._web3, item)
+
+    async def __aenter__(self) -> "AsyncNeonChainWeb3Client":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def connect(self) -> None:
+        """Create shared connection pool, web3 provider uses it too"""
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self._pool_size), timeout=self._timeout
+            )
+            await self._provider.cache_async_session(self._session)
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _send_rpc(self, method: str, params: tp.Optional[tp.Any] = None, req_id: int = 0) -> tp.Dict:
+        await self.connect()
+        async with self._session.post(self._proxy_url, json=make_rpc_body(method, params, req_id)) as resp:
+            resp.raise_for_status()
+            return await resp.json(content_type=None)
+
+    async def send_batch(self, calls: tp.Sequence[tp.Tuple[str, tp.Optional[tp.Any]]]) -> tp.List[tp.Dict]:
+        """Send many (method, params) calls in one JSON-RPC batch request"""
+        if not calls:
+            return []
+        await self.connect()
+        body = [make_rpc_body(method, params, req_id) for req_id, (method, params) in enumerate(calls)]
+        async with self._session.post(self._proxy_url, json=body) as resp:
+            resp.raise_for_status()
+            response_body = await resp.json(content_type=None)
+        return match_batch_responses(response_body, len(calls))
+
+    async def get_chain_id(self) -> int:
+        if self._chain_id is None:
+            await self.connect()
+            self._chain_id = await self._web3.eth.chain_id
+        return self._chain_id
+
+    async def gas_price(self) -> int:
+        await self.connect()
+        return await self._web3.eth.gas_price
+
+    def create_account(self) -> eth_account.signers.local.LocalAccount:
+        return self._web3.eth.account.create()
+
+    async def get_nonce(
+        self,
+        address: tp.Union[eth_account.signers.local.LocalAccount, str],
+        block: str = "pending",
+    ) -> int:
+        await self.connect()
+        address = address if isinstance(address, str) else address.address
+        return await self._web3.eth.get_transaction_count(address, block)
+
+    async def get_balance(self, address: tp.Union[str, eth_account.signers.local.LocalAccount]) -> Decimal:
+        await self.connect()
+        if not isinstance(address, str):
+            address = address.address
+        return web3.Web3.from_wei(await self._web3.eth.get_balance(address, "pending"), "ether")
+
+    async def get_solana_trx_by_neon(self, tr_id: str) -> tp.Dict:
+        return await self._send_rpc("neon_getSolanaTransactionByNeonTransaction", [tr_id])
+
+    async def _sign_send_and_wait(
+        self, account: eth_account.signers.local.LocalAccount, transaction: tp.Dict
+    ) -> web3.types.TxReceipt:
+        signed_tx = self._web3.eth.account.sign_transaction(transaction, account.key)
+        tx = await self._web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        return await self._web3.eth.wait_for_transaction_receipt(tx)
+
+    async def deploy_contract(
+        self,
+        from_: eth_account.signers.local.LocalAccount,
+        abi,
+        bytecode: str,
+        gas: tp.Optional[int] = 0,
+        gas_price: tp.Optional[int] = None,
+        constructor_args: tp.Optional[tp.List] = None,
+    ) -> web3.types.TxReceipt:
+        """Proxy doesn't support send_transaction"""
+        await self.connect()
+        gas_price = gas_price or await self.gas_price()
+        constructor_args = constructor_args or []
+
+        contract = self._web3.eth.contract(abi=abi, bytecode=bytecode)
+        transaction = await contract.constructor(*constructor_args).build_transaction(
+            {
+                "from": from_.address,
+                "gas": gas,
+                "gasPrice": gas_price,
+                "nonce": await self.get_nonce(from_),
+                "chainId": await self.get_chain_id(),
+            }
+        )
+        if transaction["gas"] == 0:
+            transaction["gas"] = await self._web3.eth.estimate_gas(transaction)
+        return await self._sign_send_and_wait(from_, transaction)
+
+    async def deploy_and_get_contract(
+        self,
+        contract: str,
+        version: str,
+        account: eth_account.signers.local.LocalAccount,
+        contract_name: tp.Optional[str] = None,
+        constructor_args: tp.Optional[tp.Any] = None,
+        import_remapping: tp.Optional[dict] = None,
+        gas: tp.Optional[int] = 0,
+    ) -> tp.Tuple[tp.Any, web3.types.TxReceipt]:
+        # solc is a blocking subprocess call, keep it out of the event loop
+        contract_interface = await asyncio.get_running_loop().run_in_executor(
+            None,
+            lambda: helpers.get_contract_interface(
+                contract, version, contract_name=contract_name, import_remapping=import_remapping
+            ),
+        )
+        contract_deploy_tx = await self.deploy_contract(
+            account,
+            abi=contract_interface["abi"],
+            bytecode=contract_interface["bin"],
+            constructor_args=constructor_args,
+            gas=gas,
+        )
+        contract = self._web3.eth.contract(
+            address=contract_deploy_tx["contractAddress"], abi=contract_interface["abi"]
+        )
+        return contract, contract_deploy_tx
+
+    async def send_transaction(
+        self,
+        account: eth_account.signers.local.LocalAccount,
+        transaction: tp.Dict,
+        gas_multiplier: tp.Optional[float] = None,
+    ) -> web3.types.TxReceipt:
+        await self.connect()
+        if "gasPrice" not in transaction:
+            transaction["gasPrice"] = await self.gas_price()
+        if "gas" not in transaction:
+            transaction["gas"] = await self._web3.eth.estimate_gas(transaction)
+        if gas_multiplier is not None:
+            transaction["gas"] = int(transaction["gas"] * gas_multiplier)
+        return await self._sign_send_and_wait(account, transaction)
+
+    async def send_neon(
+        self,
+        from_: eth_account.signers.local.LocalAccount,
+        to: tp.Union[str, eth_account.signers.local.LocalAccount],
+        amount: tp.Union[int, float, Decimal],
+        gas: tp.Optional[int] = 0,
+        gas_price: tp.Optional[int] = None,
+        nonce: int = None,
+    ) -> web3.types.TxReceipt:
+        await self.connect()
+        to_addr = to if isinstance(to, str) else to.address
+        if nonce is None:
+            nonce = await self.get_nonce(from_)
+        transaction = {
+            "from": from_.address,
+            "to": to_addr,
+            "chainId": await self.get_chain_id(),
+            "value": web3.Web3.to_wei(amount, "ether"),
+            "gasPrice": gas_price or await self.gas_price(),
+            "gas": gas,
+            "nonce": nonce,
+        }
+        if transaction["gas"] == 0:
+            transaction["gas"] = await self._web3.eth.estimate_gas(transaction)
+        return await self._sign_send_and_wait(from_, transaction)
@@ -24,7 +24,6 @@ class ERC20:
     def _make_tx_object(self, from_address):
         tx = {
             "from": from_address,
-            "nonce": self.web3_client.eth.get_transaction_count(from_address),
             "gasPrice": self.web3_client.gas_price(),
         }
         return tx
@@ -43,10 +42,10 @@ class ERC20:
             address = address.address
         return self.contract.functions.balanceOf(address).call()
 
-    def transfer(self, signer, address_to, amount):
+    def transfer(self, signer, address_to, amount, wait=True):
         tx = self._make_tx_object(signer.address)
         if isinstance(address_to, LocalAccount):
             address_to = address_to.address
         instruction_tx = self.contract.functions.transfer(address_to, amount).build_transaction(tx)
-        resp = self.web3_client.send_transaction(signer, instruction_tx)
+        resp = self.web3_client.send_transaction(signer, instruction_tx, wait=wait)
         return resp
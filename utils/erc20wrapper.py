@@ -1,12 +1,9 @@
-import pathlib
-
-import solcx
 from eth_account.signers.local import LocalAccount
 from solana.rpc.commitment import Confirmed
 from solana.rpc.types import TxOpts
 from solana.transaction import Transaction
 
-from . import web3client
+from . import helpers, web3client
 from .metaplex import create_metadata_instruction_data, create_metadata_instruction
 
 INIT_TOKEN_AMOUNT = 1000000000000000
@@ -45,7 +42,6 @@ class ERC20Wrapper:
     def make_tx_object(self, from_address, gas_price=None, gas=None):
         tx = {
             "from": from_address,
-            "nonce": self.web3_client.eth.get_transaction_count(from_address),
             "gasPrice": gas_price if gas_price is not None else self.web3_client.gas_price(),
         }
         if gas is not None:
@@ -91,13 +87,7 @@ class ERC20Wrapper:
         return instruction_receipt
 
     def get_wrapper_contract(self):
-        contract_path = (pathlib.Path.cwd() / "contracts" / "EIPs" / "ERC20" / "IERC20ForSpl.sol").absolute()
-
-        with open(contract_path, "r") as s:
-            source = s.read()
-
-        compiled = solcx.compile_source(source, output_values=["abi", "bin"], solc_version="0.8.10")
-        contract_interface = compiled[list(compiled.keys())[0]]
+        contract_interface = helpers.get_contract_interface("EIPs/ERC20/IERC20ForSpl", "0.8.10")
 
         contract = self.web3_client.eth.contract(address=self.contract_address, abi=contract_interface["abi"])
         return contract
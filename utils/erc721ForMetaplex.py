@@ -14,7 +14,7 @@ class ERC721ForMetaplex:
         self.contract = self.deploy(contract, contract_name)
 
     def make_tx_object(self, from_address, gasPrice=None, gas=None):
-        tx = {"from": from_address, "nonce": self.web3_client.eth.get_transaction_count(from_address),
+        tx = {"from": from_address,
               "gasPrice": gasPrice if gasPrice is not None else self.web3_client.gas_price()}
         if gas is not None:
             tx["gas"] = gas
@@ -2,7 +2,6 @@ import requests
 import typing as tp
 import urllib.parse
 
-from utils.helpers import wait_condition
 from utils.web3client import NeonChainWeb3Client
 
 
@@ -12,13 +11,16 @@ class Faucet:
         self._session = session or requests.Session()
         self.web3_client = web3_client
 
-    def request_neon(self, address: str, amount: int = 100) -> requests.Response:
+    def request_neon(self, address: str, amount: int = 100, wait: bool = True) -> requests.Response:
+        """With wait=False the balance isn't checked, AccountProvisioner checks many balances at once"""
         assert address.startswith("0x")
         url = urllib.parse.urljoin(self._url, "request_neon")
-        balance_before = self.web3_client.get_balance(address)
+        if wait:
+            balance_before = self.web3_client.get_balance(address)
         response = self._session.post(url, json={"amount": amount, "wallet": address})
         assert response.ok, "Faucet returned error: {}, status code: {}, url: {}".format(response.text,
                                                                                          response.status_code,
                                                                                          response.url)
-        wait_condition(lambda: self.web3_client.get_balance(address) > balance_before)
+        if wait:
+            self.web3_client.wait_balance(address, lambda balance: balance > balance_before, timeout=15)
         return response
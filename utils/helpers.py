@@ -5,10 +5,11 @@ import string
 import time
 import typing as tp
 
-import solcx
 from eth_abi import abi
 from eth_utils import keccak
 
+from utils import solc_cache
+
 
 def get_contract_abi(name, compiled):
     for key in compiled.keys():
@@ -16,12 +17,7 @@ def get_contract_abi(name, compiled):
             return compiled[key]
 
 
-def get_contract_interface(
-    contract: str,
-    version: str,
-    contract_name: tp.Optional[str] = None,
-    import_remapping: tp.Optional[dict] = None,
-):
+def _contract_path(contract: str, contract_name: tp.Optional[str] = None) -> tp.Tuple[pathlib.Path, str]:
     if not contract.endswith(".sol"):
         contract += ".sol"
     if contract_name is None:
@@ -30,8 +26,6 @@ def get_contract_interface(
         else:
             contract_name = contract.rsplit(".", 1)[0]
 
-    if version not in [str(v) for v in solcx.get_installed_solc_versions()]:
-        solcx.install_solc(version)
     if contract.startswith("/"):
         contract_path = pathlib.Path(contract)
     else:
@@ -42,20 +36,32 @@ def get_contract_interface(
             ).absolute()
 
     assert contract_path.exists(), f"Can't found contract: {contract_path}"
+    return contract_path, contract_name
 
-    compiled = solcx.compile_files(
-        [contract_path],
-        output_values=["abi", "bin"],
-        solc_version=version,
-        import_remappings=import_remapping,
-        allow_paths=["."],
-        optimize=True,
-    )  # this allow_paths isn't very good...
+
+def get_contract_interface(
+    contract: str,
+    version: str,
+    contract_name: tp.Optional[str] = None,
+    import_remapping: tp.Optional[dict] = None,
+):
+    contract_path, contract_name = _contract_path(contract, contract_name)
+    compiled = solc_cache.compile_files(contract_path, version, import_remapping=import_remapping)
     contract_interface = get_contract_abi(contract_name, compiled)
 
     return contract_interface
 
 
+def get_contract_interfaces(
+    contracts: tp.Sequence[tp.Tuple[str, str, tp.Optional[str]]],
+    import_remapping: tp.Optional[dict] = None,
+) -> tp.List[tp.Dict]:
+    """Interfaces of (contract, version, contract_name) items, contracts are compiled by one solc run per version"""
+    paths = [(*_contract_path(contract, contract_name), version) for contract, version, contract_name in contracts]
+    compiled = solc_cache.compile_batch([(path, version, import_remapping) for path, _, version in paths])
+    return [get_contract_abi(contract_name, files) for (_, contract_name, _), files in zip(paths, compiled)]
+
+
 def gen_hash_of_block(size: int) -> str:
     """Generates a block hash of the given size"""
     try:
@@ -0,0 +1,41 @@
+import re
+import threading
+import typing as tp
+
+NONCE_ERROR_PATTERN = re.compile(r"nonce too (low|high)", re.IGNORECASE)
+
+
+class NonceManager:
+    """Hands out local nonces per account without asking the network every time
+
+    The network is requested only once per account (and again after resync), so many
+    transactions from one account can be in flight at the same time. threading.Lock is
+    patched by gevent under Locust, so the manager is safe for threads and greenlets.
+    """
+
+    def __init__(self, fetch_nonce: tp.Callable[[str], int]):
+        self._fetch_nonce = fetch_nonce
+        self._nonces: tp.Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def next(self, address: str) -> int:
+        """Reserve next nonce for the address"""
+        with self._lock:
+            if address not in self._nonces:
+                self._nonces[address] = self._fetch_nonce(address)
+            nonce = self._nonces[address]
+            self._nonces[address] = nonce + 1
+        return nonce
+
+    def resync(self, address: str) -> None:
+        """Forget local nonce, the next one will be requested from the network"""
+        with self._lock:
+            self._nonces.pop(address, None)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._nonces.clear()
+
+    @staticmethod
+    def is_nonce_error(error: Exception) -> bool:
+        return NONCE_ERROR_PATTERN.search(str(error)) is not None
@@ -1,13 +1,25 @@
-import time
 import typing as tp
+from decimal import Decimal
 
 import solana.rpc.api
 from solana.publickey import PublicKey
 from solana.rpc.commitment import Confirmed
 from solana.rpc.types import TokenAccountOpts
 
+from utils.waiter import Backoff, Notifier, wait_for
 from utils.web3client import NeonChainWeb3Client
 
+TOKEN_AMOUNT_OFFSET = 64
+"""SPL token account layout: mint (32 bytes), owner (32 bytes), amount (u64 LE), ..."""
+
+MAX_MULTIPLE_ACCOUNTS = 100
+
+
+class OperatorBalances(tp.NamedTuple):
+    sol: int
+    neon: tp.Union[int, Decimal]
+    slot: int
+
 
 class Operator:
     def __init__(
@@ -17,7 +29,8 @@ class Operator:
             operator_neon_rewards_address: tp.List[str],
             neon_token_mint: str,
             operator_keys: tp.List[str],
-            web3_client: tp.Optional[NeonChainWeb3Client] = None
+            web3_client: tp.Optional[NeonChainWeb3Client] = None,
+            solana_ws_url: tp.Optional[str] = None,
     ):
         self._proxy_url = proxy_url
         self._solana_url = solana_url
@@ -28,57 +41,80 @@ class Operator:
         if self.web3 is None:
             self.web3 = NeonChainWeb3Client(self._proxy_url)
         self.sol = solana.rpc.api.Client(self._solana_url)
+        self._notifier = None
+        if solana_ws_url:
+            # operator balances change only by transactions signed by operator keys
+            self._notifier = Notifier(
+                solana_ws_url,
+                [("accountSubscribe", [key, {"commitment": "confirmed", "encoding": "base64"}]) for key in operator_keys],
+            )
+
+    def _get_token_accounts(self) -> tp.List[PublicKey]:
+        """NEON token accounts of operator keys, they are looked up once"""
+        for key, token_account in self._operator_keys.items():
+            if token_account is None:
+                accounts = self.sol.get_token_accounts_by_owner_json_parsed(
+                    PublicKey(key), TokenAccountOpts(mint=PublicKey(self._neon_token_mint))
+                )
+                self._operator_keys[key] = str(accounts.value[0].pubkey)
+        return [PublicKey(token_account) for token_account in self._operator_keys.values()]
+
+    def _get_multiple_accounts(self, pubkeys: tp.List[PublicKey]) -> tp.Tuple[tp.List, int]:
+        accounts, slot = [], 0
+        for i in range(0, len(pubkeys), MAX_MULTIPLE_ACCOUNTS):
+            response = self.sol.get_multiple_accounts(pubkeys[i : i + MAX_MULTIPLE_ACCOUNTS], commitment=Confirmed)
+            accounts.extend(response.value)
+            slot = max(slot, response.context.slot)
+        return accounts, slot
+
+    def get_balances(self) -> OperatorBalances:
+        """SOL and NEON balances of all operator keys
+
+        Keys and their token accounts are read by one getMultipleAccounts request (per 100 accounts),
+        so both balances belong to the same slot. NEON rewards addresses are read by a batch request to the proxy.
+        """
+        keys = [PublicKey(key) for key in self._operator_keys]
+        use_rewards_addresses = len(self._operator_neon_rewards_address) > 0
+        token_accounts = [] if use_rewards_addresses else self._get_token_accounts()
+        accounts, slot = self._get_multiple_accounts(keys + token_accounts)
+
+        sol = sum(account.lamports for account in accounts[: len(keys)] if account is not None)
+        if use_rewards_addresses:
+            addresses = [self.web3.to_checksum_address(addr.lower()) for addr in self._operator_neon_rewards_address]
+            neon = sum(self.web3.get_balances(addresses))
+        else:
+            neon = sum(
+                int.from_bytes(account.data[TOKEN_AMOUNT_OFFSET : TOKEN_AMOUNT_OFFSET + 8], "little")
+                for account in accounts[len(keys) :]
+                if account is not None
+            )
+        return OperatorBalances(sol=sol, neon=neon, slot=slot)
 
     def get_solana_balance(self):
-        balances = []
-        for key in self._operator_keys:
-            balance = self.sol.get_balance(PublicKey(key), commitment=Confirmed)
-            if isinstance(balance, dict):
-                balance = balance["result"]["value"]
-            else:
-                balance = balance.value
-            balances.append(balance)
-        return sum(balances)
+        accounts, _ = self._get_multiple_accounts([PublicKey(key) for key in self._operator_keys])
+        return sum(account.lamports for account in accounts if account is not None)
 
     def get_neon_balance(self):
-        balances = []
-        if len(self._operator_neon_rewards_address) > 0:
-            for addr in self._operator_neon_rewards_address:
-                balances.append(self.web3.get_balance(self.web3.to_checksum_address(addr.lower())))
-        else:
-            for key in self._operator_keys:
-                if self._operator_keys[key] is None:
-                    accounts = self.sol.get_token_accounts_by_owner_json_parsed(
-                        PublicKey(key), TokenAccountOpts(mint=PublicKey(self._neon_token_mint))
-                    )
-                    self._operator_keys[key] = accounts.value[0]["pubkey"]
-                balances.append(
-                    int(
-                        self.sol.get_token_account_balance(PublicKey(self._operator_keys[key]), commitment=Confirmed).to_json()[
-                            "result"
-                        ]["value"]["amount"]
-                    )
-                )
-        return sum(balances)
+        return self.get_balances().neon
 
     def wait_solana_balance_changed(self, current_balance, timeout=90):
         """solana change balance only when blocks confirmed"""
-        started = time.time()
-
-        while (time.time() - started) < timeout:
-            balance = self.get_solana_balance()
-            if balance != current_balance:
-                return balance
-            time.sleep(5)
-        raise TimeoutError(f"Operator solana balance didn't change for {timeout} seconds")
+        return wait_for(
+            self.get_solana_balance,
+            lambda balance: balance != current_balance,
+            timeout,
+            backoff=Backoff(min_interval=1, max_interval=5),
+            notifier=self._notifier,
+            error_message=f"Operator solana balance didn't change for {timeout} seconds",
+        )
 
     def wait_neon_balance_changed(self, current_balance, timeout=90):
         """solana change balance only when blocks confirmed"""
-        started = time.time()
-
-        while (time.time() - started) < timeout:
-            balance = self.get_neon_balance()
-            if balance != current_balance:
-                return balance
-            time.sleep(5)
-        raise TimeoutError(f"Operator neon balance didn't change for {timeout} seconds")
+        return wait_for(
+            self.get_neon_balance,
+            lambda balance: balance != current_balance,
+            timeout,
+            backoff=Backoff(min_interval=1, max_interval=5),
+            notifier=self._notifier,
+            error_message=f"Operator neon balance didn't change for {timeout} seconds",
+        )
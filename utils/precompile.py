@@ -0,0 +1,161 @@
+import ast
+import logging
+import math
+import multiprocessing
+import os
+import pathlib
+import typing as tp
+
+import solcx
+
+from utils import helpers, solc_cache
+
+LOG = logging.getLogger(__name__)
+
+COMPILE_CALLS = ["deploy_and_get_contract", "get_contract_interface"]
+"""Functions which get (contract, version, contract_name) as their first arguments"""
+
+VERSION_LISTS = ["SOLCX_VERSIONS"]
+"""Module level lists of solc versions which tests install for themselves"""
+
+DEFAULT_PATHS = ["integration", "loadtesting", "scripts", "utils"]
+
+
+class ContractUsage(tp.NamedTuple):
+    contract: str
+    version: str
+    contract_name: tp.Optional[str] = None
+
+
+def _module_constants(tree: ast.Module) -> tp.Dict[str, tp.Any]:
+    constants = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            try:
+                constants[node.targets[0].id] = ast.literal_eval(node.value)
+            except (ValueError, TypeError, SyntaxError):
+                continue
+    return constants
+
+
+def _literal(node: tp.Optional[ast.AST], constants: tp.Dict[str, tp.Any]) -> tp.Optional[str]:
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, ast.Name) and isinstance(constants.get(node.id), str):
+        return constants[node.id]
+    return None
+
+
+def scan_file(path: pathlib.Path) -> tp.Tuple[tp.Set[ContractUsage], tp.Set[str]]:
+    """Find contract compilations with literal arguments and solc version lists in a python file"""
+    try:
+        tree = ast.parse(path.read_text(), filename=str(path))
+    except (SyntaxError, UnicodeDecodeError) as e:
+        LOG.warning(f"Can't parse {path}: {e}")
+        return set(), set()
+    constants = _module_constants(tree)
+
+    versions = set()
+    for name in VERSION_LISTS:
+        if isinstance(constants.get(name), (list, tuple)):
+            versions.update(str(v) for v in constants[name])
+
+    usages = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call):
+            continue
+        func_name = node.func.attr if isinstance(node.func, ast.Attribute) else getattr(node.func, "id", None)
+        if func_name not in COMPILE_CALLS:
+            continue
+        args = dict(zip(["contract", "version", "contract_name"], node.args))
+        args.update({kw.arg: kw.value for kw in node.keywords if kw.arg})
+        if "import_remapping" in args:
+            # remapped imports are resolved at runtime, such contracts are compiled on first use
+            continue
+        contract = _literal(args.get("contract"), constants)
+        version = _literal(args.get("version"), constants)
+        if contract is None or version is None:
+            continue
+        usages.add(ContractUsage(contract, version, _literal(args.get("contract_name"), constants)))
+    return usages, versions
+
+
+def find_contracts(
+    paths: tp.Iterable[tp.Union[str, pathlib.Path]] = DEFAULT_PATHS
+) -> tp.Tuple[tp.Set[ContractUsage], tp.Set[str]]:
+    """Collect all contracts and solc versions the python files in paths use"""
+    usages, versions = set(), set()
+    for path in paths:
+        path = pathlib.Path(path)
+        files = [path] if path.is_file() else path.rglob("*.py")
+        for file in files:
+            if file.suffix != ".py" or "node_modules" in file.parts:
+                continue
+            file_usages, file_versions = scan_file(file)
+            usages |= file_usages
+            versions |= file_versions
+    return usages, versions
+
+
+def _compile(usages: tp.List[ContractUsage]) -> tp.Dict[tp.Tuple[str, str], str]:
+    """Compile a chunk of contracts with one solc version by one solc run, return errors"""
+    try:
+        helpers.get_contract_interfaces(usages)
+        return {}
+    except Exception:
+        pass
+    # find broken contracts, the rest are cached already
+    errors = {}
+    for usage in usages:
+        try:
+            helpers.get_contract_interface(usage.contract, usage.version, contract_name=usage.contract_name)
+        except Exception as e:
+            errors[(usage.contract, usage.version)] = str(e)
+    return errors
+
+
+def precompile(
+    usages: tp.Iterable[ContractUsage],
+    versions: tp.Iterable[str] = (),
+    processes: tp.Optional[int] = None,
+) -> tp.Dict[tp.Tuple[str, str], str]:
+    """Compile contracts in a process pool to fill the solc cache, return compilation errors
+
+    solc is installed before the pool starts, so workers never download the same version in parallel.
+    """
+    if not solc_cache.is_enabled():
+        LOG.warning("Solc cache is disabled, nothing to precompile")
+        return {}
+
+    usages = set(usages)
+    errors = {}
+    installed = {str(v) for v in solcx.get_installed_solc_versions()}
+    for version in sorted({usage.version for usage in usages} | set(versions)):
+        if version in installed:
+            continue
+        try:
+            solcx.install_solc(version)
+        except Exception as e:
+            LOG.warning(f"Can't install solc {version}: {e}")
+            for usage in [usage for usage in usages if usage.version == version]:
+                errors[(usage.contract, usage.version)] = str(e)
+                usages.remove(usage)
+
+    # every worker compiles a chunk of one version contracts, there are a few chunks per worker for balancing
+    processes = processes or os.cpu_count()
+    chunk_size = max(1, math.ceil(len(usages) / (processes * 4)))
+    by_version: tp.Dict[str, tp.List[ContractUsage]] = {}
+    for usage in sorted(usages, key=lambda u: (u.contract, u.version, u.contract_name or "")):
+        by_version.setdefault(usage.version, []).append(usage)
+    chunks = [
+        version_usages[i : i + chunk_size]
+        for version_usages in by_version.values()
+        for i in range(0, len(version_usages), chunk_size)
+    ]
+
+    with multiprocessing.Pool(processes) as pool:
+        for chunk_errors in pool.imap_unordered(_compile, chunks):
+            for (contract, version), error in chunk_errors.items():
+                LOG.warning(f"Can't precompile {contract} with solc {version}: {error}")
+            errors.update(chunk_errors)
+    return errors
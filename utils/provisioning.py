@@ -0,0 +1,86 @@
+import logging
+import typing as tp
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+import eth_account.signers.local
+
+LOG = logging.getLogger(__name__)
+
+
+class AccountProvisioner:
+    """Creates and funds many accounts at once
+
+    Accounts are funded from the bank account by a nonce-pipelined burst of transfers or by
+    concurrent faucet requests, then all balances are confirmed by the client's balance waiter.
+    Threads are greenlets under Locust, so the provisioner works there too.
+    """
+
+    def __init__(
+        self,
+        web3_client: "utils.web3client.NeonChainWeb3Client",
+        faucet: tp.Optional["utils.faucet.Faucet"] = None,
+        bank_account: tp.Optional[eth_account.signers.local.LocalAccount] = None,
+        concurrency: int = 20,
+        timeout: float = 60,
+    ):
+        assert faucet is not None or bank_account is not None, "Faucet or bank account is required"
+        self._web3_client = web3_client
+        self._faucet = faucet
+        self._bank_account = bank_account
+        self._concurrency = concurrency
+        self._timeout = timeout
+
+    def create_accounts(
+        self, count: int, amount: tp.Union[int, float, Decimal]
+    ) -> tp.List[eth_account.signers.local.LocalAccount]:
+        accounts = [self._web3_client.create_account() for _ in range(count)]
+        self.fund([account.address for account in accounts], amount)
+        return accounts
+
+    def fund(self, addresses: tp.Sequence[str], amount: tp.Union[int, float, Decimal]) -> None:
+        """Send amount to every address, an address can be repeated to fund it several times"""
+        if not addresses:
+            return
+        expected: tp.Dict[str, Decimal] = {}
+        for address in addresses:
+            expected[address] = expected.get(address, Decimal(0)) + Decimal(str(amount))
+        targets = list(expected)
+        balances_before = self._web3_client.get_balances(targets)
+        for address, balance in zip(targets, balances_before):
+            expected[address] += balance
+
+        if self._bank_account is not None:
+            self._send_from_bank(addresses, amount)
+        else:
+            self._request_faucet(addresses, amount)
+        self.wait_balances(expected)
+
+    def _send_from_bank(self, addresses: tp.Sequence[str], amount: tp.Union[int, float, Decimal]) -> None:
+        # nonces are given by the client's nonce manager, so all transfers are sent without waiting
+        pending = [
+            self._web3_client.send_neon(self._bank_account, address, amount, wait=False) for address in addresses
+        ]
+        for tx in pending:
+            receipt = tx.receipt(self._timeout)
+            if receipt["status"] != 1:
+                raise AssertionError(f"Transfer {tx.tx_hash.hex()} from bank account failed: {receipt}")
+
+    def _request_faucet(self, addresses: tp.Sequence[str], amount: tp.Union[int, float, Decimal]) -> None:
+        with ThreadPoolExecutor(max_workers=min(self._concurrency, len(addresses))) as executor:
+            list(executor.map(lambda address: self._faucet.request_neon(address, amount, wait=False), addresses))
+
+    def wait_balances(self, expected: tp.Dict[str, Decimal]) -> None:
+        """Wait until balances of all addresses reach expected values"""
+        futures = {
+            address: self._web3_client.balance_waiter.submit(address, lambda balance, v=value: balance >= v, self._timeout)
+            for address, value in expected.items()
+        }
+        failed = []
+        for address, future in futures.items():
+            try:
+                future.result()
+            except TimeoutError:
+                failed.append(address)
+        if failed:
+            raise AssertionError(f"Balance didn't changed after {self._timeout} seconds ({', '.join(failed)})")
@@ -0,0 +1,135 @@
+import logging
+import threading
+import time
+import typing as tp
+from concurrent.futures import Future
+
+import web3.types
+from hexbytes import HexBytes
+from web3._utils.method_formatters import receipt_formatter
+from web3.datastructures import AttributeDict
+from web3.exceptions import TimeExhausted
+
+LOG = logging.getLogger(__name__)
+
+
+class PendingTransaction:
+    """Handle of a sent transaction, the receipt is resolved by ReceiptCollector"""
+
+    def __init__(self, tx_hash: tp.Union[HexBytes, str]):
+        self.tx_hash = HexBytes(tx_hash)
+        self.sent_at = time.time()
+        self.future: Future = Future()
+
+    def __repr__(self):
+        return f"PendingTransaction({self.tx_hash.hex()})"
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def receipt(self, timeout: tp.Optional[float] = None) -> web3.types.TxReceipt:
+        """Block until the receipt is collected"""
+        return self.future.result(timeout)
+
+
+class ReceiptCollector:
+    """Polls receipts of many transactions with one batched eth_getTransactionReceipt per tick
+
+    Polling runs in a background thread (a greenlet under Locust), which exits when
+    there are no pending transactions and starts again on the next add().
+    """
+
+    def __init__(
+        self,
+        web3_client: "utils.web3client.Web3Client",
+        poll_interval: float = 0.5,
+        timeout: float = 120,
+        batch_size: int = 500,
+    ):
+        self._web3_client = web3_client
+        self._poll_interval = poll_interval
+        self._timeout = timeout
+        self._batch_size = batch_size
+        self._pending: tp.Dict[str, PendingTransaction] = {}
+        self._lock = threading.Lock()
+        self._thread: tp.Optional[threading.Thread] = None
+
+    def __len__(self):
+        return len(self._pending)
+
+    def add(self, tx_hash: tp.Union[HexBytes, str]) -> PendingTransaction:
+        pending = PendingTransaction(tx_hash)
+        with self._lock:
+            # the same transaction can be sent twice, keep one handle for it
+            pending = self._pending.setdefault(pending.tx_hash.hex(), pending)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        return pending
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self._poll_interval)
+            try:
+                self.poll()
+            except Exception as e:
+                LOG.warning(f"Failed to poll transaction receipts: {e}")
+            with self._lock:
+                if not self._pending:
+                    self._thread = None
+                    return
+
+    def _resolve(self, pending: PendingTransaction) -> None:
+        with self._lock:
+            self._pending.pop(pending.tx_hash.hex(), None)
+
+    def _expire(self, pending: PendingTransaction) -> None:
+        self._resolve(pending)
+        pending.future.set_exception(
+            TimeExhausted(f"Transaction {pending.tx_hash.hex()} is not in the chain after {self._timeout} seconds")
+        )
+
+    def expire_overdue(self) -> int:
+        """Fail transactions pending longer than the timeout, return their number"""
+        now = time.time()
+        with self._lock:
+            overdue = [pending for pending in self._pending.values() if now - pending.sent_at > self._timeout]
+        for pending in overdue:
+            self._expire(pending)
+        return len(overdue)
+
+    def poll(self) -> int:
+        """Request receipts of the oldest pending transactions, return number of resolved"""
+        with self._lock:
+            batch = list(self._pending.values())[: self._batch_size]
+        if not batch:
+            return 0
+
+        try:
+            responses = self._web3_client.send_batch(
+                [("eth_getTransactionReceipt", [pending.tx_hash.hex()]) for pending in batch]
+            )
+        except Exception:
+            # receipts can't be polled (proxy is down), pending transactions still expire
+            self.expire_overdue()
+            raise
+        resolved = 0
+        now = time.time()
+        for pending, response in zip(batch, responses):
+            if response.get("result"):
+                self._resolve(pending)
+                pending.future.set_result(AttributeDict.recursive(receipt_formatter(response["result"])))
+            elif "error" in response:
+                self._resolve(pending)
+                pending.future.set_exception(ValueError(response["error"]))
+            elif now - pending.sent_at > self._timeout:
+                self._expire(pending)
+            else:
+                continue
+            resolved += 1
+        return resolved
+
+    def wait_all(
+        self, pending: tp.Iterable[PendingTransaction], timeout: tp.Optional[float] = None
+    ) -> tp.List[web3.types.TxReceipt]:
+        return [p.receipt(timeout) for p in pending]
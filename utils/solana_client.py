@@ -5,25 +5,51 @@ import solana.rpc.api
 import spl.token.client
 from solana.keypair import Keypair
 from solana.publickey import PublicKey
-from solana.rpc.commitment import Commitment, Finalized
+from solana.rpc.commitment import Commitment, Confirmed, Finalized
 from solana.rpc.types import TxOpts
 from solana.system_program import TransferParams, transfer
 from solana.transaction import Transaction
 from solders.rpc.errors import InternalErrorMessage
 from solders.rpc.responses import RequestAirdropResp
 
-from utils.helpers import wait_condition
 from spl.token.constants import TOKEN_PROGRAM_ID
 
+from utils.waiter import BatchWaiter, Notifier
+
 
 class SolanaClient(solana.rpc.api.Client):
-    def __init__(self, endpoint, account_seed_version="\3"):
+    def __init__(self, endpoint, account_seed_version="\3", ws_endpoint: tp.Optional[str] = None):
         super().__init__(endpoint=endpoint, timeout=60)
         self.account_seed_version = (
             bytes(account_seed_version, encoding="utf-8")
             .decode("unicode-escape")
             .encode("utf-8")
         )
+        self._ws_endpoint = ws_endpoint
+        self._balance_waiter = None
+
+    @property
+    def balance_waiter(self) -> BatchWaiter:
+        """Waits for lamports of many accounts, accountSubscribe notifications wake it up if ws_endpoint is set"""
+        if self._balance_waiter is None:
+            notifier = Notifier(self._ws_endpoint) if self._ws_endpoint else None
+
+            def subscribe_account(pubkey: PublicKey) -> None:
+                notifier.subscribe("accountSubscribe", [str(pubkey), {"commitment": "confirmed", "encoding": "base64"}])
+
+            self._balance_waiter = BatchWaiter(
+                self.get_balances, notifier=notifier, on_new_key=subscribe_account if notifier is not None else None
+            )
+        return self._balance_waiter
+
+    def get_balances(self, pubkeys: tp.Sequence[PublicKey]) -> tp.List[int]:
+        """Lamports of many accounts by getMultipleAccounts, missed accounts have 0"""
+        balances = []
+        # getMultipleAccounts accepts up to 100 keys
+        for i in range(0, len(pubkeys), 100):
+            accounts = self.get_multiple_accounts(list(pubkeys[i : i + 100]), commitment=Confirmed).value
+            balances.extend(0 if account is None else account.lamports for account in accounts)
+        return balances
 
     def request_airdrop(
         self,
@@ -43,9 +69,7 @@ class SolanaClient(solana.rpc.api.Client):
                 break
         else:
             raise AssertionError(f"Can't get airdrop from solana: {airdrop_resp}")
-        wait_condition(
-            lambda: self.get_balance(pubkey).value >= lamports, timeout_sec=30
-        )
+        self.balance_waiter.wait(pubkey, lambda balance: balance >= lamports, timeout=30)
         return airdrop_resp
 
     def send_sol(self, from_: Keypair, to: PublicKey, amount_lamports: int):
@@ -58,11 +82,9 @@ class SolanaClient(solana.rpc.api.Client):
         )
         balance_before = self.get_balance(to).value
         self.send_transaction(tx, from_)
-        for _ in range(20):
-            if int(self.get_balance(to).value) > int(balance_before):
-                break
-            time.sleep(6)
-        else:
+        try:
+            self.balance_waiter.wait(to, lambda balance: balance > balance_before, timeout=120)
+        except TimeoutError:
             raise AssertionError(f"Balance not changed in account {to}")
 
     def get_neon_account_address(
@@ -0,0 +1,210 @@
+import hashlib
+import json
+import os
+import pathlib
+import re
+import tempfile
+import typing as tp
+
+import solcx
+
+CACHE_DIR = pathlib.Path(
+    os.environ.get("SOLC_CACHE_DIR", pathlib.Path.home() / ".cache" / "neon-tests" / "solc")
+)
+"""Where compiled contracts are stored, set SOLC_CACHE_DIR="" to disable the cache"""
+
+OUTPUT_VALUES = ["abi", "bin"]
+
+IMPORT_PATTERN = re.compile(r"""import\s+(?:[^"';]*?\s+from\s+)?["']([^"']+)["']""")
+
+_memory_cache: tp.Dict[str, tp.Dict] = {}
+
+
+def is_enabled() -> bool:
+    return str(CACHE_DIR) not in ("", ".")
+
+
+def _resolve_import(
+    source_path: pathlib.Path, import_path: str, import_remapping: tp.Optional[dict]
+) -> pathlib.Path:
+    for prefix, target in (import_remapping or {}).items():
+        if import_path.startswith(prefix):
+            return pathlib.Path(target + import_path[len(prefix):]).absolute()
+    if import_path.startswith("."):
+        return (source_path.parent / import_path).absolute()
+    # solc resolves other paths from the base path, which is the working directory
+    return (pathlib.Path.cwd() / import_path).absolute()
+
+
+def _walk_sources(
+    contract_path: pathlib.Path, import_remapping: tp.Optional[dict] = None
+) -> tp.Iterator[tp.Tuple[pathlib.Path, tp.Optional[bytes]]]:
+    """Contract source and all its transitive imports, source is None for missed files"""
+    visited = set()
+    queue = [pathlib.Path(contract_path).absolute()]
+    while queue:
+        path = queue.pop()
+        if path in visited:
+            continue
+        visited.add(path)
+        if not path.exists():
+            yield path, None
+            continue
+        source = path.read_bytes()
+        yield path, source
+        for import_path in IMPORT_PATTERN.findall(source.decode(errors="ignore")):
+            queue.append(_resolve_import(path, import_path, import_remapping))
+
+
+def hash_sources(contract_path: pathlib.Path, import_remapping: tp.Optional[dict] = None) -> str:
+    """Hash of the contract source and all its transitive imports"""
+    digest = hashlib.sha256()
+    for path, source in _walk_sources(contract_path, import_remapping):
+        digest.update(str(path).encode())
+        if source is not None:
+            digest.update(hashlib.sha256(source).digest())
+    return digest.hexdigest()
+
+
+def make_key(
+    contract_path: pathlib.Path,
+    version: str,
+    import_remapping: tp.Optional[dict] = None,
+    optimize: bool = True,
+) -> str:
+    params = {
+        "sources": hash_sources(contract_path, import_remapping),
+        "version": str(version),
+        "remappings": sorted((import_remapping or {}).items()),
+        "optimize": optimize,
+        "output_values": OUTPUT_VALUES,
+    }
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()
+
+
+def get(key: str) -> tp.Optional[tp.Dict]:
+    if key in _memory_cache:
+        return _memory_cache[key]
+    if not is_enabled():
+        return None
+    path = CACHE_DIR / f"{key}.json"
+    try:
+        with open(path, "r") as f:
+            compiled = json.load(f)
+    except (OSError, ValueError):
+        return None
+    _memory_cache[key] = compiled
+    return compiled
+
+
+def put(key: str, compiled: tp.Dict) -> None:
+    _memory_cache[key] = compiled
+    if not is_enabled():
+        return
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    # write to a temp file and rename it, so other processes never read a half-written entry
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(compiled, f)
+        os.replace(tmp_path, CACHE_DIR / f"{key}.json")
+    except Exception:
+        pathlib.Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def _normalize(path: tp.Union[str, pathlib.Path]) -> pathlib.Path:
+    """Absolute path without `..` parts, as solc names sources"""
+    return pathlib.Path(os.path.normpath(pathlib.Path(path).absolute()))
+
+
+def _install(version: str) -> None:
+    if version not in [str(v) for v in solcx.get_installed_solc_versions()]:
+        solcx.install_solc(version)
+
+
+def _compile_standard(
+    contract_paths: tp.List[pathlib.Path],
+    version: str,
+    import_remapping: tp.Optional[dict] = None,
+    optimize: bool = True,
+) -> tp.List[tp.Dict]:
+    """Compile many files with one solc run, the result of each file has solcx.compile_files format"""
+    # sources are read by solc itself, so their directories must be allowed like for command line files
+    allow_paths = {"."} | {str(path.parent) for path in contract_paths} | set((import_remapping or {}).values())
+    input_data = {
+        "language": "Solidity",
+        "sources": {str(path): {"urls": [str(path)]} for path in contract_paths},
+        "settings": {
+            "optimizer": {"enabled": optimize, "runs": 200},
+            "remappings": [f"{prefix}={target}" for prefix, target in (import_remapping or {}).items()],
+            "outputSelection": {"*": {"*": ["abi", "evm.bytecode.object"]}},
+        },
+    }
+    output = solcx.compile_standard(input_data, allow_paths=sorted(allow_paths), solc_version=version)
+    contracts = {
+        _normalize(source): {
+            f"{source}:{name}": {"abi": data["abi"], "bin": data["evm"]["bytecode"]["object"]}
+            for name, data in source_contracts.items()
+        }
+        for source, source_contracts in output.get("contracts", {}).items()
+    }
+    # like compile_files, the result of a file contains contracts of its imports too
+    results = []
+    for path in contract_paths:
+        compiled = {}
+        for source_path, _ in _walk_sources(path, import_remapping):
+            compiled.update(contracts.get(_normalize(source_path), {}))
+        results.append(compiled)
+    return results
+
+
+def compile_batch(
+    contracts: tp.Sequence[tp.Tuple[pathlib.Path, str, tp.Optional[dict]]],
+    optimize: bool = True,
+) -> tp.List[tp.Dict]:
+    """Compile (contract_path, version, import_remapping) items, return compiled files in the same order
+
+    Cached files are taken from the cache, the rest are grouped by solc version and remappings
+    and every group is compiled by one solc standard JSON run.
+    """
+    results: tp.List[tp.Optional[tp.Dict]] = [None] * len(contracts)
+    groups: tp.Dict[tp.Tuple[str, str], tp.List[tp.Tuple[int, str]]] = {}
+    for i, (contract_path, version, import_remapping) in enumerate(contracts):
+        key = make_key(contract_path, version, import_remapping, optimize)
+        results[i] = get(key)
+        if results[i] is None:
+            group = (str(version), json.dumps(import_remapping or {}, sort_keys=True))
+            groups.setdefault(group, []).append((i, key))
+
+    for (version, import_remapping), items in groups.items():
+        _install(version)
+        import_remapping = json.loads(import_remapping)
+        paths = list(dict.fromkeys(_normalize(contracts[i][0]) for i, _ in items))
+        try:
+            compiled_files = dict(zip(paths, _compile_standard(paths, version, import_remapping, optimize)))
+        except solcx.exceptions.SolcError:
+            if len(paths) == 1:
+                raise
+            # one broken file fails the whole group, compile files one by one to find it
+            compiled_files = {
+                path: _compile_standard([path], version, import_remapping, optimize)[0] for path in paths
+            }
+        for i, key in items:
+            results[i] = compiled_files[_normalize(contracts[i][0])]
+            put(key, results[i])
+    return results
+
+
+def compile_files(
+    contract_path: pathlib.Path,
+    version: str,
+    import_remapping: tp.Optional[dict] = None,
+    optimize: bool = True,
+) -> tp.Dict:
+    """Compile one contract file with on-disk cache
+
+    The key covers the source with all its imports, solc version, remappings and options,
+    entries are written atomically, so pytest-xdist workers and Locust processes can share them.
+    """
+    return compile_batch([(contract_path, version, import_remapping)], optimize)[0]
@@ -1,10 +1,45 @@
+import atexit
+import hashlib
+import importlib.metadata
+import json
+import os
+import pathlib
 import subprocess
 import sys
+import tempfile
+import threading
 import time
+import typing as tp
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 from pkg_resources import parse_version
 
+CACHE_DIR = pathlib.Path(
+    os.environ.get("VYPER_CACHE_DIR", pathlib.Path.home() / ".cache" / "neon-tests" / "vyper")
+)
+"""Compiled contracts are stored in CACHE_DIR/artifacts and vyper versions are installed to CACHE_DIR/versions"""
+
+OUTPUT_FORMATS = ["abi", "bytecode"]
+
+# vyper changes the global decimal context on import, so it is imported only in worker processes
+WORKER_CODE = """
+import json
+import sys
+
+import vyper
+
+out, sys.stdout = sys.stdout, sys.stderr
+for line in sys.stdin:
+    request = json.loads(line)
+    try:
+        response = {"result": vyper.compile_code(request["source"], output_formats=request["output_formats"])}
+    except Exception as e:
+        response = {"error": f"{type(e).__name__}: {e}"}
+    out.write(json.dumps(response) + "\\n")
+    out.flush()
+"""
+
 
 def get_installable_vyper_versions():
     url = f"https://pypi.org/pypi/vyper/json"
@@ -21,8 +56,18 @@ def get_installable_vyper_versions():
     raise RuntimeError(f"Failed to request available vyper versions")
 
 
+def get_version_dir(version: str) -> pathlib.Path:
+    return CACHE_DIR / "versions" / version
+
+
 def install(version):
-    code = subprocess.check_call([sys.executable, "-m", "pip", "install", f'vyper=={version}'])
+    """Install vyper to its own directory, so different versions can be used at the same time"""
+    target = get_version_dir(version)
+    if (target / "vyper").exists():
+        return
+    code = subprocess.check_call(
+        [sys.executable, "-m", "pip", "install", "--target", str(target), f'vyper=={version}']
+    )
     if code != 0:
         raise RuntimeError(f"Failed to install vyper {version}")
 
@@ -31,3 +76,118 @@ def get_three_last_versions():
     versions = get_installable_vyper_versions()[:3]
     versions.sort()
     return versions
+
+
+def get_environment_version() -> str:
+    """Version of vyper installed to the current environment"""
+    return importlib.metadata.version("vyper")
+
+
+class VyperWorker:
+    """Long living process with imported vyper which compiles sources sent to its stdin"""
+
+    def __init__(self, version: tp.Optional[str] = None):
+        self.version = version or get_environment_version()
+        env = dict(os.environ)
+        if version is not None:
+            env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(get_version_dir(version)), env.get("PYTHONPATH")]))
+        self._process = subprocess.Popen(
+            [sys.executable, "-c", WORKER_CODE],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            env=env,
+        )
+        self._lock = threading.Lock()
+
+    def compile(self, source: str, output_formats: tp.List[str] = OUTPUT_FORMATS) -> tp.Dict:
+        with self._lock:
+            self._process.stdin.write(json.dumps({"source": source, "output_formats": output_formats}) + "\n")
+            self._process.stdin.flush()
+            line = self._process.stdout.readline()
+        if not line:
+            raise RuntimeError(f"Vyper {self.version} worker exited with code {self._process.poll()}")
+        response = json.loads(line)
+        if "error" in response:
+            raise RuntimeError(f"Vyper {self.version} compilation failed: {response['error']}")
+        return response["result"]
+
+    def close(self) -> None:
+        if self._process.poll() is None:
+            self._process.stdin.close()
+            self._process.wait(timeout=10)
+
+
+_workers: tp.Dict[tp.Optional[str], VyperWorker] = {}
+_workers_lock = threading.Lock()
+
+
+def get_worker(version: tp.Optional[str] = None) -> VyperWorker:
+    with _workers_lock:
+        if version not in _workers:
+            _workers[version] = VyperWorker(version)
+        return _workers[version]
+
+
+@atexit.register
+def close_workers() -> None:
+    with _workers_lock:
+        for worker in _workers.values():
+            worker.close()
+        _workers.clear()
+
+
+def _read_artifact(key: str) -> tp.Optional[tp.Dict]:
+    try:
+        with open(CACHE_DIR / "artifacts" / f"{key}.json", "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_artifact(key: str, compiled: tp.Dict) -> None:
+    artifacts_dir = CACHE_DIR / "artifacts"
+    artifacts_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=artifacts_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(compiled, f)
+        os.replace(tmp_path, artifacts_dir / f"{key}.json")
+    except Exception:
+        pathlib.Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def compile_code(source: str, version: tp.Optional[str] = None) -> tp.Dict:
+    """Compile vyper source, version=None means vyper from the current environment
+
+    Artifacts are cached on disk by source hash and compiler version.
+    """
+    params = {
+        "source": hashlib.sha256(source.encode()).hexdigest(),
+        "version": version or get_environment_version(),
+        "output_formats": OUTPUT_FORMATS,
+    }
+    key = hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()
+    compiled = _read_artifact(key)
+    if compiled is None:
+        compiled = get_worker(version).compile(source)
+        _write_artifact(key, compiled)
+    return compiled
+
+
+def compile_file(contract: tp.Union[str, pathlib.Path], version: tp.Optional[str] = None) -> tp.Dict:
+    """Compile contracts/vyper/<contract>.vy or a file by its path"""
+    contract_path = pathlib.Path(contract)
+    if contract_path.suffix != ".vy":
+        contract_path = pathlib.Path.cwd() / "contracts" / "vyper" / f"{contract}.vy"
+    return compile_code(contract_path.read_text(), version)
+
+
+def compile_files(
+    contracts: tp.Iterable[tp.Tuple[tp.Union[str, pathlib.Path], tp.Optional[str]]]
+) -> tp.List[tp.Dict]:
+    """Compile (contract, version) items, every vyper version compiles in its own process in parallel"""
+    contracts = list(contracts)
+    with ThreadPoolExecutor(max_workers=max(1, len({version for _, version in contracts}))) as executor:
+        return list(executor.map(lambda item: compile_file(*item), contracts))
@@ -0,0 +1,254 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+import typing as tp
+from concurrent.futures import Future
+
+import websockets
+
+LOG = logging.getLogger(__name__)
+
+K = tp.TypeVar("K")
+V = tp.TypeVar("V")
+
+
+class Backoff:
+    """Poll interval which grows exponentially while nothing changes and resets on progress"""
+
+    def __init__(self, min_interval: float = 0.2, max_interval: float = 5.0, factor: float = 1.5):
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._factor = factor
+        self._interval = min_interval
+
+    def reset(self) -> None:
+        self._interval = self._min_interval
+
+    def next(self) -> float:
+        interval = self._interval
+        self._interval = min(self._interval * self._factor, self._max_interval)
+        return interval
+
+
+class Notifier:
+    """Websocket subscriptions which wake waiters up on every notification
+
+    Works with proxy `eth_subscribe` and Solana `*Subscribe` methods. If the connection fails,
+    waiters don't notice it and keep polling by backoff.
+    """
+
+    def __init__(self, ws_url: str, subscriptions: tp.Sequence[tp.Tuple[str, tp.List]] = (), open_timeout: float = 5):
+        self._ws_url = ws_url
+        self._subscriptions = list(subscriptions)
+        self._open_timeout = open_timeout
+        self._listeners: tp.List[threading.Event] = []
+        self._lock = threading.Lock()
+        self._loop: tp.Optional[asyncio.AbstractEventLoop] = None
+        self._ws = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None
+
+    def add_listener(self, event: threading.Event) -> None:
+        with self._lock:
+            self._listeners.append(event)
+
+    def remove_listener(self, event: threading.Event) -> None:
+        with self._lock:
+            if event in self._listeners:
+                self._listeners.remove(event)
+
+    def subscribe(self, method: str, params: tp.List) -> None:
+        with self._lock:
+            self._subscriptions.append((method, params))
+            req_id = len(self._subscriptions)
+        if self._loop is not None and self._ws is not None:
+            asyncio.run_coroutine_threadsafe(self._send(method, params, req_id), self._loop)
+
+    def close(self) -> None:
+        self._closed = True
+        if self._loop is not None and self._ws is not None:
+            asyncio.run_coroutine_threadsafe(self._ws.close(), self._loop)
+
+    def _notify(self) -> None:
+        with self._lock:
+            for event in self._listeners:
+                event.set()
+
+    async def _send(self, method: str, params: tp.List, req_id: int) -> None:
+        await self._ws.send(json.dumps({"jsonrpc": "2.0", "id": req_id, "method": method, "params": params}))
+
+    async def _listen(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        async with websockets.connect(self._ws_url, open_timeout=self._open_timeout) as ws:
+            self._ws = ws
+            with self._lock:
+                subscriptions = list(self._subscriptions)
+            for req_id, (method, params) in enumerate(subscriptions, start=1):
+                await self._send(method, params, req_id)
+            async for message in ws:
+                # responses to subscribe requests have id, notifications don't
+                if "id" not in json.loads(message):
+                    self._notify()
+
+    def _run(self) -> None:
+        try:
+            asyncio.run(self._listen())
+        except Exception as e:
+            if not self._closed:
+                LOG.info(f"Websocket {self._ws_url} isn't available, waiters use polling: {e}")
+        finally:
+            self._ws = None
+
+
+def wait_for(
+    func: tp.Callable[[], V],
+    predicate: tp.Callable[[V], bool],
+    timeout: float,
+    backoff: tp.Optional[Backoff] = None,
+    notifier: tp.Optional[Notifier] = None,
+    error_message: tp.Optional[str] = None,
+) -> V:
+    """Call func until its result satisfies predicate, sleeps are cut short by notifier events
+
+    For one value which isn't read per key, e.g. the total balance of all operator keys.
+    Values of separate accounts are waited by BatchWaiter, so concurrent waits share a batch request.
+    """
+    backoff = backoff or Backoff()
+    wakeup = threading.Event()
+    if notifier is not None:
+        notifier.add_listener(wakeup)
+    deadline = time.monotonic() + timeout
+    try:
+        while True:
+            value = func()
+            if predicate(value):
+                return value
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(error_message or f"The condition not reached within {timeout} sec")
+            wakeup.wait(min(backoff.next(), remaining))
+            wakeup.clear()
+    finally:
+        if notifier is not None:
+            notifier.remove_listener(wakeup)
+
+
+class _Waiting(tp.NamedTuple):
+    key: tp.Any
+    predicate: tp.Callable[[tp.Any], bool]
+    deadline: float
+    future: Future
+
+
+class BatchWaiter(tp.Generic[K, V]):
+    """Waits for conditions on values of many keys (balances of accounts for example)
+
+    Values of all waited keys are read by one fetch call (a batch request) per tick in a background
+    thread, a greenlet under Locust. Ticks follow adaptive backoff or notifier events, the thread
+    exits when nothing is waited. Clients keep one waiter (balance_waiter) for all waits on their accounts,
+    a single value which isn't read per key is waited by wait_for.
+    """
+
+    def __init__(
+        self,
+        fetch: tp.Callable[[tp.List[K]], tp.Sequence[V]],
+        notifier: tp.Optional[Notifier] = None,
+        on_new_key: tp.Optional[tp.Callable[[K], None]] = None,
+        min_interval: float = 0.2,
+        max_interval: float = 5.0,
+    ):
+        self._fetch = fetch
+        self._notifier = notifier
+        self._on_new_key = on_new_key
+        self._backoff = Backoff(min_interval, max_interval)
+        self._waiting: tp.List[_Waiting] = []
+        self._known_keys: tp.Set[K] = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: tp.Optional[threading.Thread] = None
+        if notifier is not None:
+            notifier.add_listener(self._wakeup)
+
+    def submit(self, key: K, predicate: tp.Callable[[V], bool], timeout: float) -> Future:
+        """Future is resolved with the first value satisfying predicate or TimeoutError"""
+        waiting = _Waiting(key, predicate, time.monotonic() + timeout, Future())
+        with self._lock:
+            self._waiting.append(waiting)
+            new_key = key not in self._known_keys
+            self._known_keys.add(key)
+            self._backoff.reset()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        if new_key and self._on_new_key is not None:
+            self._on_new_key(key)
+        self._wakeup.set()
+        return waiting.future
+
+    def wait(self, key: K, predicate: tp.Callable[[V], bool], timeout: float) -> V:
+        return self.submit(key, predicate, timeout).result()
+
+    def wait_all(self, conditions: tp.Sequence[tp.Tuple[K, tp.Callable[[V], bool]]], timeout: float) -> tp.List[V]:
+        futures = [self.submit(key, predicate, timeout) for key, predicate in conditions]
+        return [future.result() for future in futures]
+
+    def poll(self) -> int:
+        """Check all waited conditions with one fetch, return number of resolved"""
+        with self._lock:
+            waiting = list(self._waiting)
+        if not waiting:
+            return 0
+        keys = list(dict.fromkeys(w.key for w in waiting))
+        values = dict(zip(keys, self._fetch(keys)))
+        now = time.monotonic()
+        resolved = set()
+        for w in waiting:
+            if w.predicate(values[w.key]):
+                w.future.set_result(values[w.key])
+            elif now > w.deadline:
+                w.future.set_exception(TimeoutError(f"The condition for {w.key} not reached, last value: {values[w.key]}"))
+            else:
+                continue
+            resolved.add(id(w))
+        self._remove(resolved)
+        return len(resolved)
+
+    def _remove(self, resolved: tp.Set[int]) -> None:
+        with self._lock:
+            self._waiting = [w for w in self._waiting if id(w) not in resolved]
+
+    def _expire(self, error: Exception) -> None:
+        """Fail overdue waits when values can't be read at all"""
+        with self._lock:
+            waiting = list(self._waiting)
+        now = time.monotonic()
+        expired = {id(w) for w in waiting if now > w.deadline}
+        for w in waiting:
+            if id(w) in expired:
+                w.future.set_exception(TimeoutError(f"The condition for {w.key} not reached: {error}"))
+        self._remove(expired)
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                if self.poll():
+                    self._backoff.reset()
+            except Exception as e:
+                LOG.warning(f"Failed to poll waited values: {e}")
+                self._expire(e)
+            with self._lock:
+                if not self._waiting:
+                    self._thread = None
+                    return
+                # don't sleep past the nearest deadline, so timeouts are reported in time
+                nearest = min(w.deadline for w in self._waiting) - time.monotonic()
+                interval = min(self._backoff.next(), max(nearest, 0) + 0.01)
+            self._wakeup.wait(interval)
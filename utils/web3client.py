@@ -1,5 +1,4 @@
 import json
-import pathlib
 import time
 import typing as tp
 from decimal import Decimal
@@ -9,49 +8,105 @@ import web3.types
 import requests
 import eth_account.signers.local
 from eth_abi import abi
+from hexbytes import HexBytes
 from web3.exceptions import TransactionNotFound
 
-from utils import helpers
-from utils.consts import InputTestConstants, Unit
+from utils import helpers, vyperx
+from utils.apiclient import RPCBatch, make_rpc_body, send_batch_rpc
+from utils.consts import InputTestConstants
 from utils.helpers import decode_function_signature
+from utils.nonce_manager import NonceManager
+from utils.provisioning import AccountProvisioner
+from utils.receipt_collector import PendingTransaction, ReceiptCollector
+from utils.waiter import BatchWaiter, Notifier
+
+_nonce_managers: tp.Dict[str, NonceManager] = {}
+"""Nonce managers shared by all clients of the same proxy"""
 
 
 class Web3Client:
+    provider_class: tp.Type[web3.HTTPProvider] = web3.HTTPProvider
+    """Subclasses can replace the provider, for example to measure every RPC request"""
+
     def __init__(
         self,
         proxy_url: str,
         tracer_url: tp.Optional[tp.Any] = None,
         session: tp.Optional[tp.Any] = None,
+        nonce_manager: tp.Optional[NonceManager] = None,
+        gas_price_ttl: float = 0,
+        ws_url: tp.Optional[str] = None,
     ):
         self._proxy_url = proxy_url
+        self._ws_url = ws_url
         self._tracer_url = tracer_url
         self._chain_id = None
+        self._gas_price = None
+        self._gas_price_expires_at = 0.0
+        self._gas_price_ttl = gas_price_ttl
+        self._evm_info: tp.Dict[str, tp.Dict] = {}
+        self._session = session or requests.Session()
         self._web3 = web3.Web3(
-            web3.HTTPProvider(
-                proxy_url, session=session, request_kwargs={"timeout": 30}
+            self.provider_class(
+                proxy_url, session=self._session, request_kwargs={"timeout": 30}
             )
         )
+        if nonce_manager is None:
+            nonce_manager = _nonce_managers.setdefault(proxy_url, NonceManager(self.get_nonce))
+        self.nonce_manager = nonce_manager
+        self._receipt_collector = None
 
     def __getattr__(self, item):
         return getattr(self._web3, item)
 
+    @property
+    def receipt_collector(self) -> ReceiptCollector:
+        if self._receipt_collector is None:
+            self._receipt_collector = ReceiptCollector(self)
+        return self._receipt_collector
+
     @property
     def chain_id(self):
         if self._chain_id is None:
             self._chain_id = self._web3.eth.chain_id
         return self._chain_id
 
-    def _get_evm_info(self, method):
-        resp = requests.post(
-            self._proxy_url,
-            json={"jsonrpc": "2.0", "method": method, "params": [], "id": 1},
-        )
+    def _send_rpc(self, method: str, params: tp.Optional[tp.Any] = None, req_id: int = 0) -> tp.Dict:
+        resp = self._session.post(self._proxy_url, json=make_rpc_body(method, params, req_id), timeout=30)
         resp.raise_for_status()
         try:
-            body = resp.json()
-            return body
-        except json.JSONDecodeError as e:
-            raise RuntimeError(f"Failed to decode EVM info: {resp.text}")
+            return resp.json()
+        except json.JSONDecodeError:
+            raise RuntimeError(f"Failed to decode `{method}` response: {resp.text}")
+
+    def send_batch(self, calls: tp.Sequence[tp.Tuple[str, tp.Optional[tp.Any]]]) -> tp.List[tp.Dict]:
+        """Send many (method, params) calls in one JSON-RPC batch request"""
+        return send_batch_rpc(self._session, self._proxy_url, calls, timeout=30)
+
+    def batch(self) -> RPCBatch:
+        """Collect calls and send them in one request on exit from the context
+
+        with web3_client.batch() as batch:
+            balance = batch.add("eth_getBalance", [address, "pending"])
+        balance.result
+        """
+        return RPCBatch(self._session, self._proxy_url, timeout=30)
+
+    def invalidate_cache(self) -> None:
+        """Forget cached gas price, chain id and versions (e.g. after stand redeploy)"""
+        self._chain_id = None
+        self._gas_price = None
+        self._gas_price_expires_at = 0.0
+        self._evm_info = {}
+
+    def _get_evm_info(self, method):
+        if method in self._evm_info:
+            return self._evm_info[method]
+        response = self._send_rpc(method, req_id=1)
+        # errors aren't cached, the next call asks again
+        if "result" in response:
+            self._evm_info[method] = response
+        return response
 
     def get_proxy_version(self):
         return self._get_evm_info("neon_proxy_version")
@@ -62,27 +117,21 @@ class Web3Client:
     def get_evm_version(self):
         return self._get_evm_info("web3_clientVersion")
 
+    def get_evm_info(self) -> tp.Dict[str, tp.Dict]:
+        """Proxy, CLI and EVM versions in one round trip"""
+        methods = ["neon_proxy_version", "neon_cli_version", "web3_clientVersion"]
+        missed = [method for method in methods if method not in self._evm_info]
+        responses = dict(zip(missed, self.send_batch([(method, None) for method in missed]))) if missed else {}
+        self._evm_info.update((method, response) for method, response in responses.items() if "result" in response)
+        return dict(
+            zip(["proxy", "cli", "evm"], [self._evm_info.get(method) or responses[method] for method in methods])
+        )
+
     def get_neon_emulate(self, params):
-        return requests.post(
-            self._proxy_url,
-            json={
-                "jsonrpc": "2.0",
-                "method": "neon_emulate",
-                "params": [params],
-                "id": 0,
-            },
-        ).json()
+        return self._send_rpc("neon_emulate", [params])
 
     def get_solana_trx_by_neon(self, tr_id: str):
-        return requests.post(
-            self._proxy_url,
-            json={
-                "jsonrpc": "2.0",
-                "method": "neon_getSolanaTransactionByNeonTransaction",
-                "params": [tr_id],
-                "id": 0,
-            },
-        ).json()
+        return self._send_rpc("neon_getSolanaTransactionByNeonTransaction", [tr_id])
 
     def get_transaction_by_hash(self, transaction_hash):
         try:
@@ -91,8 +140,11 @@ class Web3Client:
             return None
 
     def gas_price(self):
-        gas = self._web3.eth.gas_price
-        return gas
+        """Gas price is cached for gas_price_ttl seconds, 0 (the default) requests it every time"""
+        if self._gas_price is None or time.monotonic() >= self._gas_price_expires_at:
+            self._gas_price = self._web3.eth.gas_price
+            self._gas_price_expires_at = time.monotonic() + self._gas_price_ttl
+        return self._gas_price
 
     def create_account(self):
         return self._web3.eth.account.create()
@@ -111,6 +163,37 @@ class Web3Client:
         address = address if isinstance(address, str) else address.address
         return self._web3.eth.get_transaction_count(address, block)
 
+    def _sign_and_send(
+        self,
+        account: eth_account.signers.local.LocalAccount,
+        transaction: tp.Dict,
+        retries: int = 3,
+    ) -> HexBytes:
+        """Sign and send transaction, if it has no nonce it is taken from the nonce manager
+
+        The local nonce is resynced after any rejected transaction, managed nonces are retried
+        on "nonce too low/high" errors.
+        """
+        managed = "nonce" not in transaction
+        for attempt in range(retries):
+            if managed:
+                transaction["nonce"] = self.nonce_manager.next(account.address)
+            signed_tx = self._web3.eth.account.sign_transaction(transaction, account.key)
+            try:
+                return self._web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+            except Exception as e:
+                self.nonce_manager.resync(account.address)
+                if not managed or not NonceManager.is_nonce_error(e) or attempt == retries - 1:
+                    raise
+
+    def _get_receipt(
+        self, tx_hash: HexBytes, wait: bool = True
+    ) -> tp.Union[web3.types.TxReceipt, PendingTransaction]:
+        """Wait for receipt or hand the transaction over to the receipt collector"""
+        if wait:
+            return self._web3.eth.wait_for_transaction_receipt(tx_hash)
+        return self.receipt_collector.add(tx_hash)
+
     def deploy_contract(
         self,
         from_: eth_account.signers.local.LocalAccount,
@@ -119,7 +202,8 @@ class Web3Client:
         gas: tp.Optional[int] = 0,
         gas_price: tp.Optional[int] = None,
         constructor_args: tp.Optional[tp.List] = None,
-    ) -> web3.types.TxReceipt:
+        wait: bool = True,
+    ) -> tp.Union[web3.types.TxReceipt, PendingTransaction]:
         """Proxy doesn't support send_transaction"""
         gas_price = gas_price or self.gas_price()
         constructor_args = constructor_args or []
@@ -130,7 +214,6 @@ class Web3Client:
                 "from": from_.address,
                 "gas": gas,
                 "gasPrice": gas_price,
-                "nonce": self.get_nonce(from_),
                 "chainId": self.chain_id,
             }
         )
@@ -138,9 +221,8 @@ class Web3Client:
         if transaction["gas"] == 0:
             transaction["gas"] = self._web3.eth.estimate_gas(transaction)
 
-        signed_tx = self._web3.eth.account.sign_transaction(transaction, from_.key)
-        tx = self._web3.eth.send_raw_transaction(signed_tx.rawTransaction)
-        return self._web3.eth.wait_for_transaction_receipt(tx)
+        tx = self._sign_and_send(from_, transaction)
+        return self._get_receipt(tx, wait)
 
     def send_transaction(
         self,
@@ -149,18 +231,23 @@ class Web3Client:
         gas_multiplier: tp.Optional[
             float
         ] = None,  # fix for some event depends transactions
-    ) -> web3.types.TxReceipt:
+        wait: bool = True,
+    ) -> tp.Union[web3.types.TxReceipt, PendingTransaction]:
         if "gasPrice" not in transaction:
             transaction["gasPrice"] = self.gas_price()
         if "gas" not in transaction:
             transaction["gas"] = self._web3.eth.estimate_gas(transaction)
         if gas_multiplier is not None:
             transaction["gas"] = int(transaction["gas"] * gas_multiplier)
-        instruction_tx = self._web3.eth.account.sign_transaction(
-            transaction, account.key
-        )
-        signature = self._web3.eth.send_raw_transaction(instruction_tx.rawTransaction)
-        return self._web3.eth.wait_for_transaction_receipt(signature)
+        signature = self._sign_and_send(account, transaction)
+        return self._get_receipt(signature, wait)
+
+    def send_raw_transaction(
+        self, raw_transaction: tp.Union[bytes, HexBytes], wait: bool = True
+    ) -> tp.Union[web3.types.TxReceipt, PendingTransaction]:
+        """Send a transaction signed beforehand"""
+        tx_hash = self._web3.eth.send_raw_transaction(raw_transaction)
+        return self._get_receipt(tx_hash, wait)
 
     def deploy_and_get_contract(
         self,
@@ -194,16 +281,10 @@ class Web3Client:
         return contract, contract_deploy_tx
 
     def compile_by_vyper_and_deploy(
-        self, account, contract_name, constructor_args=None
+        self, account, contract_name, constructor_args=None, version: tp.Optional[str] = None
     ):
-        import vyper  # Import here because vyper prevent override decimal precision (uses in economy tests)
-
-        contract_path = pathlib.Path.cwd() / "contracts" / "vyper"
-        with open(contract_path / f"{contract_name}.vy") as f:
-            contract_code = f.read()
-            contract_interface = vyper.compile_code(
-                contract_code, output_formats=["abi", "bytecode"]
-            )
+        """Version is a vyper installed by vyperx.install, by default vyper from the current environment is used"""
+        contract_interface = vyperx.compile_file(contract_name, version)
 
         contract_deploy_tx = self.deploy_contract(
             account,
@@ -235,8 +316,29 @@ class NeonChainWeb3Client(Web3Client):
         proxy_url: str,
         tracer_url: tp.Optional[tp.Any] = None,
         session: tp.Optional[tp.Any] = None,
+        ws_url: tp.Optional[str] = None,
+        gas_price_ttl: float = 0,
     ):
-        super().__init__(proxy_url, tracer_url, session)
+        super().__init__(proxy_url, tracer_url, session, gas_price_ttl=gas_price_ttl, ws_url=ws_url)
+        self._balance_waiter = None
+
+    @property
+    def balance_waiter(self) -> BatchWaiter:
+        """Waits for balances of many accounts by one batch request per tick, new blocks wake it up if ws_url is set"""
+        if self._balance_waiter is None:
+            notifier = Notifier(self._ws_url, [("eth_subscribe", ["newHeads"])]) if self._ws_url else None
+            self._balance_waiter = BatchWaiter(self.get_balances, notifier=notifier)
+        return self._balance_waiter
+
+    def wait_balance(
+        self,
+        address: tp.Union[str, eth_account.signers.local.LocalAccount],
+        predicate: tp.Callable[[Decimal], bool],
+        timeout: float = 30,
+    ) -> Decimal:
+        if not isinstance(address, str):
+            address = address.address
+        return self.balance_waiter.wait(address, predicate, timeout)
 
     def create_account_with_balance(
         self,
@@ -245,26 +347,18 @@ class NeonChainWeb3Client(Web3Client):
         bank_account=None,
     ):
         """Creates a new account with balance"""
-        account = self.create_account()
-        balance_before = float(
-            self.from_wei(self.eth.get_balance(account.address), Unit.ETHER)
-        )
+        return self.create_accounts_with_balance(1, faucet, amount, bank_account)[0]
 
-        if bank_account is not None:
-            self.send_neon(bank_account, account, amount)
-        else:
-            faucet.request_neon(account.address, amount=amount)
-        for _ in range(20):
-            if float(
-                self.from_wei(self.eth.get_balance(account.address), Unit.ETHER)
-            ) >= (balance_before + amount):
-                break
-            time.sleep(1)
-        else:
-            raise AssertionError(
-                f"Balance didn't changed after 20 seconds ({account.address})"
-            )
-        return account
+    def create_accounts_with_balance(
+        self,
+        count: int,
+        faucet,
+        amount: int = InputTestConstants.FAUCET_1ST_REQUEST_AMOUNT.value,
+        bank_account=None,
+    ) -> tp.List[eth_account.signers.local.LocalAccount]:
+        """Creates many accounts and funds them concurrently"""
+        provisioner = AccountProvisioner(self, faucet=faucet, bank_account=bank_account)
+        return provisioner.create_accounts(count, amount)
 
     def send_neon(
         self,
@@ -274,10 +368,9 @@ class NeonChainWeb3Client(Web3Client):
         gas: tp.Optional[int] = 0,
         gas_price: tp.Optional[int] = None,
         nonce: int = None,
-    ) -> web3.types.TxReceipt:
+        wait: bool = True,
+    ) -> tp.Union[web3.types.TxReceipt, PendingTransaction]:
         to_addr = to if isinstance(to, str) else to.address
-        if nonce is None:
-            nonce = self.get_nonce(from_)
         transaction = {
             "from": from_.address,
             "to": to_addr,
@@ -285,14 +378,14 @@ class NeonChainWeb3Client(Web3Client):
             "value": web3.Web3.to_wei(amount, "ether"),
             "gasPrice": gas_price or self.gas_price(),
             "gas": gas,
-            "nonce": nonce,
         }
+        if nonce is not None:
+            transaction["nonce"] = nonce
         if transaction["gas"] == 0:
             transaction["gas"] = self._web3.eth.estimate_gas(transaction)
 
-        signed_tx = self._web3.eth.account.sign_transaction(transaction, from_.key)
-        tx = self._web3.eth.send_raw_transaction(signed_tx.rawTransaction)
-        return self._web3.eth.wait_for_transaction_receipt(tx)
+        tx = self._sign_and_send(from_, transaction)
+        return self._get_receipt(tx, wait)
 
     def get_balance(
         self, address: tp.Union[str, eth_account.signers.local.LocalAccount]
@@ -303,6 +396,19 @@ class NeonChainWeb3Client(Web3Client):
             self._web3.eth.get_balance(address, "pending"), "ether"
         )
 
+    def get_balances(
+        self, addresses: tp.Sequence[tp.Union[str, eth_account.signers.local.LocalAccount]]
+    ) -> tp.List[Decimal]:
+        """Balances of many accounts in one batch request"""
+        addresses = [addr if isinstance(addr, str) else addr.address for addr in addresses]
+        responses = self.send_batch([("eth_getBalance", [addr, "pending"]) for addr in addresses])
+        balances = []
+        for addr, resp in zip(addresses, responses):
+            if "error" in resp:
+                raise ValueError(f"Can't get balance for {addr}: {resp['error']}")
+            balances.append(web3.Web3.from_wei(int(resp["result"], 16), "ether"))
+        return balances
+
 
 class SolChainWeb3Client(Web3Client):
     def __init__(self, proxy_url: str):